@@ -0,0 +1,44 @@
+"""Add media rating aggregates
+
+Revision ID: 5c1e9d7a3f42
+Revises: eab1b3f7db9b
+Create Date: 2026-10-18 14:02:17.604129
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e9d7a3f42'
+down_revision: Union[str, None] = 'eab1b3f7db9b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = ('rating_count', 'rating_sum', 'rating_count_1', 'rating_count_2', 'rating_count_3',
+           'rating_count_4', 'rating_count_5')
+
+
+def upgrade() -> None:
+    for column in COLUMNS:
+        op.add_column('media', sa.Column(column, sa.Integer(), server_default='0', nullable=False))
+    # Backfill from the existing ratings; the reconcile task keeps them in step afterwards.
+    op.execute("""
+        UPDATE media SET
+            rating_count = (SELECT COUNT(*) FROM ratings r
+                            WHERE r.media_id = media.media_id AND r.deleted_at IS NULL),
+            rating_sum = (SELECT COALESCE(SUM(r.rating), 0) FROM ratings r
+                          WHERE r.media_id = media.media_id AND r.deleted_at IS NULL)
+    """)
+    for value in range(1, 6):
+        op.execute(f"""
+            UPDATE media SET rating_count_{value} = (SELECT COUNT(*) FROM ratings r
+                WHERE r.media_id = media.media_id AND r.deleted_at IS NULL AND r.rating = {value})
+        """)
+
+
+def downgrade() -> None:
+    for column in reversed(COLUMNS):
+        op.drop_column('media', column)
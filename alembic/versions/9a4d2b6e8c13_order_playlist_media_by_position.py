@@ -0,0 +1,67 @@
+"""Order playlist media by position
+
+Revision ID: 9a4d2b6e8c13
+Revises: 5c1e9d7a3f42
+Create Date: 2026-10-18 15:26:48.913502
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4d2b6e8c13'
+down_revision: Union[str, None] = '5c1e9d7a3f42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+POSITION_GAP = 1 << 20  # helpers/playlist_order.py
+
+
+def upgrade() -> None:
+    op.create_table('playlist_media_ordered',
+    sa.Column('entry_id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('playlist_id', sa.Integer(), nullable=False),
+    sa.Column('media_id', sa.Integer(), nullable=False),
+    sa.Column('position', sa.BigInteger(), nullable=False),
+    sa.Column('added_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['media_id'], ['media.media_id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['playlist_id'], ['playlists.playlist_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('entry_id')
+    )
+    # Existing entries had no order; keep them by Media ID, spaced by the gap.
+    op.execute(f"""
+        INSERT INTO playlist_media_ordered (playlist_id, media_id, position)
+        SELECT playlist_id, media_id,
+               ROW_NUMBER() OVER (PARTITION BY playlist_id ORDER BY media_id) * {POSITION_GAP}
+        FROM playlist_media
+    """)
+    op.drop_index('idx_playlist_media_playlist_id', table_name='playlist_media')
+    op.drop_index('idx_playlist_media_media_id', table_name='playlist_media')
+    op.drop_table('playlist_media')
+    op.rename_table('playlist_media_ordered', 'playlist_media')
+    op.create_index('idx_playlist_media_playlist_position', 'playlist_media', ['playlist_id', 'position'],
+                    unique=True)
+    op.create_index('idx_playlist_media_media_id', 'playlist_media', ['media_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.create_table('playlist_media_unordered',
+    sa.Column('playlist_id', sa.Integer(), nullable=False),
+    sa.Column('media_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['media_id'], ['media.media_id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['playlist_id'], ['playlists.playlist_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('playlist_id', 'media_id')
+    )
+    op.execute("""
+        INSERT INTO playlist_media_unordered (playlist_id, media_id)
+        SELECT DISTINCT playlist_id, media_id FROM playlist_media
+    """)
+    op.drop_index('idx_playlist_media_media_id', table_name='playlist_media')
+    op.drop_index('idx_playlist_media_playlist_position', table_name='playlist_media')
+    op.drop_table('playlist_media')
+    op.rename_table('playlist_media_unordered', 'playlist_media')
+    op.create_index('idx_playlist_media_media_id', 'playlist_media', ['media_id'], unique=False)
+    op.create_index('idx_playlist_media_playlist_id', 'playlist_media', ['playlist_id'], unique=False)
@@ -5,7 +5,7 @@
 # 2.Related Library Imports
 # 3.Local application/library imports
 #--------------------------------------------#
-from typing import List
+from typing import Dict, List, Optional
 from pydantic import BaseSettings
 
 
@@ -14,6 +14,15 @@ class Settings(BaseSettings):
     Settings class.
     """
     SQLALCHEMY_DATABASE_URL: str
+    SQLALCHEMY_ASYNC_DATABASE_URL: Optional[str] = None
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 3600
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_USE_LIFO: bool = False
+    SQLALCHEMY_REPLICA_URLS: List[str] = []
+    DB_REPLICA_SELECTION: str = "round_robin"
     # MONGODB_URL: str
     # MONGODB_NAME: str
     CELERY_CONF_BROKER_URL: str
@@ -23,6 +32,71 @@ class Settings(BaseSettings):
     ALLOW_METHODS: List[str]
     ALLOW_HEADERS: List[str]
     APP_DEBUG: bool
+    REDIS_URL: str = "redis://localhost:6379/0"
+    MEDIA_STORAGE_BACKEND: str = "local"
+    MEDIA_STORAGE_ROOT: str = "./media"
+    PLAY_INGEST_JOURNAL_DIR: str = "./api/data/plays"
+    PLAY_INGEST_MAX_BUFFER: int = 50000
+    PLAY_INGEST_BATCH_SIZE: int = 1000
+    PLAY_INGEST_FLUSH_INTERVAL: float = 1.0
+    VIEW_COUNTER_BACKEND: str = "memory"
+    VIEW_COUNTER_SHARDS: int = 16
+    VIEW_COUNTER_FLUSH_INTERVAL: float = 5.0
+    RESPONSE_CACHE_REDIS: bool = True
+    RESPONSE_CACHE_LOCAL_MAX_ENTRIES: int = 10000
+    RESPONSE_CACHE_LOCAL_TTL: float = 10.0
+    RESPONSE_CACHE_REDIS_TTL: int = 300
+    RESPONSE_CACHE_FILL_DELAY: float = 1.0
+    SEARCH_INDEX_REFRESH_INTERVAL: float = 2.0
+    SEARCH_VIEW_COUNT_BOOST: float = 0.1
+    SUGGEST_TOP_K: int = 10
+    SUGGEST_REFRESH_INTERVAL: float = 2.0
+    EVENT_HUB_REDIS: bool = True
+    EVENT_HUB_QUEUE_SIZE: int = 64
+    EVENT_HUB_REPLAY_SIZE: int = 1024
+    PARTY_BROADCAST_INTERVAL: float = 0.25
+    PARTY_SEND_TIMEOUT: float = 1.0
+    SEGMENT_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    SEGMENT_CACHE_MAX_OBJECT_BYTES: int = 16 * 1024 * 1024
+    SEGMENT_CACHE_POLICY: str = "lru"
+    SEGMENT_CACHE_REVALIDATE_AFTER: float = 5.0
+    SEGMENT_CACHE_DISK_DIR: Optional[str] = None
+    SEGMENT_CACHE_DISK_MAX_BYTES: int = 2 * 1024 * 1024 * 1024
+    IMAGE_VARIANTS_BATCH_SIZE: int = 50
+    IMAGE_VARIANTS_SCHEDULE_INTERVAL: float = 3600.0
+    RECOMMENDATIONS_NEIGHBOURS: int = 50
+    RECOMMENDATIONS_TOP_K: int = 50
+    RECOMMENDATIONS_REBUILD_INTERVAL: float = 86400.0
+    RECOMMENDATIONS_REFRESH_INTERVAL: float = 60.0
+    RECOMMENDATIONS_REFRESH_BATCH_SIZE: int = 500
+    VECTOR_INDEX_DIR: str = "./api/data/vectors"
+    VECTOR_INDEX_DIM: int = 64
+    VECTOR_INDEX_NLIST: int = 0
+    VECTOR_INDEX_NPROBE: int = 8
+    VECTOR_INDEX_REBUILD_INTERVAL: float = 86400.0
+    CHARTS_FLUSH_INTERVAL: float = 5.0
+    CHARTS_MATERIALIZE_INTERVAL: float = 300.0
+    CHARTS_SIZE: int = 50
+    RATING_STATS_RECONCILE_INTERVAL: float = 3600.0
+    RATING_STATS_RECONCILE_BATCH_SIZE: int = 1000
+    EXPORT_BATCH_SIZE: int = 1000
+    IMPORT_BATCH_SIZE: int = 1000
+    IMPORT_MAX_BYTES: int = 1073741824
+    FEED_MAX_ITEMS: int = 500
+    FEED_TTL: int = 2592000
+    FEED_FANOUT_MAX_FOLLOWERS: int = 10000
+    FEED_FANOUT_BATCH_SIZE: int = 1000
+    RATE_LIMIT_USER_RATE: float = 20.0
+    RATE_LIMIT_USER_BURST: float = 60.0
+    RATE_LIMIT_IP_RATE: float = 50.0
+    RATE_LIMIT_IP_BURST: float = 150.0
+    RATE_LIMIT_ROUTES: Dict[str, List[float]] = {"/search": [5.0, 20.0], "/suggest": [10.0, 30.0],
+                                                 "/stream": [10.0, 40.0], "/exports": [0.5, 10.0]}
+    RATE_LIMIT_USER_HEADER: str = "X-User-Id"
+    RATE_LIMIT_SYNC_INTERVAL: float = 1.0
+    ADMISSION_MAX_CONCURRENCY: int = 256
+    ADMISSION_MAX_QUEUE: int = 512
+    ADMISSION_QUEUE_TARGET: float = 0.5
 
     class Config:
         """
@@ -6,12 +6,19 @@
 # 3.Local application/library imports
 #--------------------------------------------#
 from functools import lru_cache
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from pymongo import MongoClient
+from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
 
 from api import config
+from api.helpers import pool_metrics
+from api.helpers.replica_routing import ReplicaSelector, RoutingSession
 
 @lru_cache()
 def get_settings():
@@ -24,14 +31,85 @@ conf_settings = get_settings()
 
 SQLALCHEMY_DATABASE_URL = conf_settings.SQLALCHEMY_DATABASE_URL
 
+# Async drivers used in place of the sync driver of SQLALCHEMY_DATABASE_URL.
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def get_async_database_url(database_url: str) -> str:
+    """
+    Derive the async driver URL from a sync database URL.
+    :param database_url: The sync database URL.
+    """
+    url = make_url(database_url)
+    return str(url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername)))
+
+SQLALCHEMY_ASYNC_DATABASE_URL = (conf_settings.SQLALCHEMY_ASYNC_DATABASE_URL
+                                 or get_async_database_url(SQLALCHEMY_DATABASE_URL))
+
 # MONGODB_URL = conf_settings.MONGODB_URL
 # MONGODB_NAME = conf_settings.MONGODB_NAME
 
 # mongodb_client = MongoClient(MONGODB_URL)
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+def get_pool_options(database_url: str, async_engine: bool = False) -> dict:
+    """
+    Pool keyword arguments for an engine of the given URL.
+    SQLite engines keep the pool SQLAlchemy picks for them.
+    :param database_url: The database URL.
+    :param async_engine: Whether the options are for an async engine.
+    """
+    if make_url(database_url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "poolclass": (pool_metrics.TimedAsyncAdaptedQueuePool if async_engine
+                      else pool_metrics.TimedQueuePool),
+        "pool_size": conf_settings.DB_POOL_SIZE,
+        "max_overflow": conf_settings.DB_MAX_OVERFLOW,
+        "pool_recycle": conf_settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": conf_settings.DB_POOL_PRE_PING,
+        "pool_timeout": conf_settings.DB_POOL_TIMEOUT,
+        "pool_use_lifo": conf_settings.DB_POOL_USE_LIFO,
+    }
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, pool_logging_name="primary",
+                       **get_pool_options(SQLALCHEMY_DATABASE_URL))
+pool_metrics.instrument_engine(engine, "primary")
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_engine(SQLALCHEMY_ASYNC_DATABASE_URL, pool_logging_name="primary_async",
+                                   **get_pool_options(SQLALCHEMY_ASYNC_DATABASE_URL, async_engine=True))
+pool_metrics.instrument_engine(async_engine.sync_engine, "primary_async")
+AsyncSessionLocal = sessionmaker(autoflush=False, expire_on_commit=False,
+                                 bind=async_engine, class_=AsyncSession)
+
+# Read replicas, used by the read-only session dependencies.
+replica_engines = []
+async_replica_engines = []
+for index, replica_url in enumerate(conf_settings.SQLALCHEMY_REPLICA_URLS):
+    async_replica_url = get_async_database_url(replica_url)
+    replica_engines.append(create_engine(replica_url, pool_logging_name=f"replica_{index}",
+                                         **get_pool_options(replica_url)))
+    async_replica_engines.append(create_async_engine(
+        async_replica_url, pool_logging_name=f"replica_{index}_async",
+        **get_pool_options(async_replica_url, async_engine=True)))
+    pool_metrics.instrument_engine(replica_engines[-1], f"replica_{index}")
+    pool_metrics.instrument_engine(async_replica_engines[-1].sync_engine, f"replica_{index}_async")
+
+replica_selector = async_replica_selector = None
+if replica_engines:
+    replica_selector = ReplicaSelector(replica_engines, conf_settings.DB_REPLICA_SELECTION)
+    async_replica_selector = ReplicaSelector([replica.sync_engine for replica in async_replica_engines],
+                                             conf_settings.DB_REPLICA_SELECTION)
+
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, class_=RoutingSession,
+                                primary_engine=engine, selector=replica_selector)
+AsyncReadSessionLocal = sessionmaker(autoflush=False, expire_on_commit=False, class_=AsyncSession,
+                                     sync_session_class=RoutingSession,
+                                     primary_engine=async_engine.sync_engine,
+                                     selector=async_replica_selector)
+
 Base = declarative_base()
 
 # Dependency
@@ -45,6 +123,50 @@ def get_db():
     finally:
         db_session.close()
 
+async def get_async_db():
+    """
+    Gets async database session.
+    """
+    async with AsyncSessionLocal() as db_session:
+        yield db_session
+
+def get_read_db(request: Request):
+    """
+    Gets database session reading from a replica.
+    Requests sending `X-Read-Primary` read from the primary instead.
+    """
+    db_session = ReadSessionLocal()
+    if request.headers.get("x-read-primary"):
+        db_session.use_primary()
+    try:
+        yield db_session
+    finally:
+        db_session.close()
+
+async def get_async_read_db(request: Request):
+    """
+    Gets async database session reading from a replica.
+    Requests sending `X-Read-Primary` read from the primary instead.
+    """
+    async with AsyncReadSessionLocal() as db_session:
+        if request.headers.get("x-read-primary"):
+            db_session.sync_session.use_primary()
+        yield db_session
+
+@lru_cache()
+def get_redis() -> Redis:
+    """
+    Gets the shared Redis client.
+    """
+    return Redis.from_url(conf_settings.REDIS_URL)
+
+@lru_cache()
+def get_async_redis() -> AsyncRedis:
+    """
+    Gets the shared async Redis client.
+    """
+    return AsyncRedis.from_url(conf_settings.REDIS_URL)
+
 # def get_mongodb():
 #     """
 #     Init MongoDB Database.
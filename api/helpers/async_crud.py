@@ -0,0 +1,454 @@
+"""This module is the helper for async crud operations."""
+# --------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+# --------------------------------------------#
+from typing import List, Optional, Set, Tuple
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from api.helpers import playlist_order, rating_stats
+from api.helpers.load_profiles import MEDIA_PROFILES
+from api.helpers.images import ImageSource
+from api.helpers.pagination import async_keyset_page
+from api.models import (album_model, artist_model, comment_model, genre_model, media_model,
+                        play_history_model, playlist_media_model, playlist_model, rating_model, user_artist_model,
+                        user_model)
+# Relationship targets of the models above, imported so the mappers can configure.
+from api.models import favorite_model, role_model  # noqa: F401
+from api.schemas import rating_schema
+
+
+async def get_user(db_session: AsyncSession, user_id: int):
+    """
+    Get user by User ID helper.
+    :param db_session: The async database session.
+    :param user_id: The User ID.
+    """
+    return await db_session.get(user_model.User, user_id)
+
+
+async def get_users(db_session: AsyncSession, cursor: Optional[str] = None,
+                    limit: int = 100) -> Tuple[List, Optional[str]]:
+    """
+    Get a page of users helper.
+    :param db_session: The async database session.
+    :param cursor: The cursor returned with the previous page.
+    :param limit: The number of users to retrieve per query.
+    """
+    return await async_keyset_page(db_session, select(user_model.User),
+                                   [user_model.User.user_id], cursor=cursor, limit=limit)
+
+
+async def get_media(db_session: AsyncSession, media_id: int):
+    """
+    Get media by Media ID helper.
+    :param db_session: The async database session.
+    :param media_id: The Media ID.
+    """
+    result = await db_session.execute(select(media_model.Media).where(
+        media_model.Media.media_id == media_id,
+        media_model.Media.deleted_at.is_(None),
+    ))
+    return result.scalars().first()
+
+
+async def get_media_list(db_session: AsyncSession, cursor: Optional[str] = None,
+                         limit: int = 100, profile: Optional[str] = None) -> Tuple[List, Optional[str]]:
+    """
+    Get a page of media helper.
+    :param db_session: The async database session.
+    :param cursor: The cursor returned with the previous page.
+    :param limit: The number of media to retrieve per query.
+    :param profile: The loading profile, one of `MEDIA_PROFILES`; default the media row only.
+    """
+    statement = select(media_model.Media).where(media_model.Media.deleted_at.is_(None))
+    if profile is not None:
+        statement = statement.options(*MEDIA_PROFILES[profile])
+    return await async_keyset_page(db_session, statement, [media_model.Media.media_id],
+                                   cursor=cursor, limit=limit)
+
+
+async def get_media_by_ids(db_session: AsyncSession, media_ids: List[int], profile: Optional[str] = None) -> List:
+    """
+    Get media by Media IDs in the given order helper, skipping missing ones.
+    :param db_session: The async database session.
+    :param media_ids: The Media IDs.
+    :param profile: The loading profile, one of `MEDIA_PROFILES`; default the media row only.
+    """
+    if not media_ids:
+        return []
+    statement = select(media_model.Media).where(
+        media_model.Media.media_id.in_(media_ids),
+        media_model.Media.deleted_at.is_(None),
+    )
+    if profile is not None:
+        statement = statement.options(*MEDIA_PROFILES[profile])
+    found = {db_media.media_id: db_media for db_media in (await db_session.execute(statement)).scalars()}
+    return [found[media_id] for media_id in media_ids if media_id in found]
+
+
+async def get_followed_artist_ids(db_session: AsyncSession, user_id: int, artist_ids: List[int]) -> List[int]:
+    """
+    Get which of some artists a user follows helper.
+    :param db_session: The async database session.
+    :param user_id: The follower's User ID.
+    :param artist_ids: The Artist IDs.
+    """
+    if not artist_ids:
+        return []
+    result = await db_session.execute(select(user_artist_model.UserArtist.artist_id).where(
+        user_artist_model.UserArtist.follower_id == user_id,
+        user_artist_model.UserArtist.artist_id.in_(artist_ids),
+    ))
+    return list(result.scalars().all())
+
+
+async def follow_artist(db_session: AsyncSession, user_id: int, artist_id: int):
+    """
+    Follow an artist helper; following again keeps the existing follow.
+    :param db_session: The async database session.
+    :param user_id: The follower's User ID.
+    :param artist_id: The Artist ID.
+    """
+    db_follow = await db_session.get(user_artist_model.UserArtist, (user_id, artist_id))
+    if db_follow is None:
+        db_follow = user_artist_model.UserArtist(follower_id=user_id, artist_id=artist_id)
+        db_session.add(db_follow)
+        await db_session.commit()
+    return db_follow
+
+
+async def unfollow_artist(db_session: AsyncSession, user_id: int, artist_id: int):
+    """
+    Unfollow an artist helper.
+    :param db_session: The async database session.
+    :param user_id: The follower's User ID.
+    :param artist_id: The Artist ID.
+    """
+    db_follow = await db_session.get(user_artist_model.UserArtist, (user_id, artist_id))
+    if db_follow is None:
+        return None
+    await db_session.delete(db_follow)
+    await db_session.commit()
+    return db_follow
+
+
+async def get_playlists(db_session: AsyncSession, user_id: Optional[int] = None,
+                        cursor: Optional[str] = None, limit: int = 100) -> Tuple[List, Optional[str]]:
+    """
+    Get a page of playlists helper.
+    :param db_session: The async database session.
+    :param user_id: Only return playlists of this User ID.
+    :param cursor: The cursor returned with the previous page.
+    :param limit: The number of playlists to retrieve per query.
+    """
+    statement = select(playlist_model.Playlist).where(playlist_model.Playlist.deleted_at.is_(None))
+    if user_id is not None:
+        statement = statement.where(playlist_model.Playlist.user_id == user_id)
+    return await async_keyset_page(db_session, statement, [playlist_model.Playlist.playlist_id],
+                                   cursor=cursor, limit=limit)
+
+
+async def get_existing_media_ids(db_session: AsyncSession, media_ids: List[int]) -> Set[int]:
+    """
+    Get which of some Media IDs exist helper.
+    :param db_session: The async database session.
+    :param media_ids: The Media IDs.
+    """
+    result = await db_session.execute(select(media_model.Media.media_id).where(
+        media_model.Media.media_id.in_(set(media_ids)),
+        media_model.Media.deleted_at.is_(None),
+    ))
+    return set(result.scalars().all())
+
+
+async def get_playlist_entries(db_session: AsyncSession, playlist_id: int, cursor: Optional[str] = None,
+                               limit: int = 100) -> Tuple[List, Optional[str]]:
+    """
+    Get a page of the entries of a playlist in order helper.
+    :param db_session: The async database session.
+    :param playlist_id: The Playlist ID.
+    :param cursor: The cursor returned with the previous page.
+    :param limit: The number of entries to retrieve per query.
+    """
+    entry = playlist_media_model.PlaylistMedia
+    statement = select(entry).where(entry.playlist_id == playlist_id)
+    return await async_keyset_page(db_session, statement, [entry.position], cursor=cursor, limit=limit)
+
+
+async def _lock_playlist(db_session: AsyncSession, playlist_id: int):
+    # Edits of one playlist are serialized on its row.
+    result = await db_session.execute(select(playlist_model.Playlist).where(
+        playlist_model.Playlist.playlist_id == playlist_id,
+        playlist_model.Playlist.deleted_at.is_(None),
+    ).with_for_update())
+    return result.scalars().first()
+
+
+async def _free_positions(db_session: AsyncSession, playlist_id: int, before_entry_id: Optional[int],
+                          count: int, moving_entry_id: Optional[int] = None) -> Optional[Tuple[List[int], bool]]:
+    # Positions for `count` entries ahead of an entry, or at the end, and
+    # whether they left the playlist crowded. Renumbers when out of room.
+    entry = playlist_media_model.PlaylistMedia
+    others = [entry.playlist_id == playlist_id]
+    if moving_entry_id is not None:
+        others.append(entry.entry_id != moving_entry_id)
+    for _ in range(2):
+        if before_entry_id is None:
+            last = (await db_session.execute(select(func.max(entry.position)).where(*others))).scalar()
+            return playlist_order.append_positions(last, count), False
+        after = (await db_session.execute(select(entry.position).where(
+            entry.playlist_id == playlist_id, entry.entry_id == before_entry_id))).scalar()
+        if after is None:
+            return None
+        before = (await db_session.execute(select(func.max(entry.position)).where(
+            *others, entry.position < after))).scalar()
+        positions, step = playlist_order.positions_between(before, after, count)
+        if positions:
+            return positions, step < playlist_order.CROWDED_GAP
+        await db_session.run_sync(playlist_order.renumber, playlist_id)
+    raise RuntimeError(f"No free positions in playlist {playlist_id} after renumbering")
+
+
+async def add_playlist_entries(db_session: AsyncSession, playlist_id: int, media_ids: List[int],
+                               before_entry_id: Optional[int] = None) -> Optional[Tuple[List, bool]]:
+    """
+    Add media to a playlist helper, at the end or ahead of an entry, with
+    one INSERT for all of them. Returns the new entries and whether the
+    playlist needs renumbering, or None when the playlist or entry is missing.
+    :param db_session: The async database session.
+    :param playlist_id: The Playlist ID.
+    :param media_ids: The Media IDs, in order.
+    :param before_entry_id: The entry to insert ahead of, default at the end.
+    """
+    if await _lock_playlist(db_session, playlist_id) is None:
+        return None
+    free = await _free_positions(db_session, playlist_id, before_entry_id, len(media_ids))
+    if free is None:
+        return None
+    positions, crowded = free
+    entry = playlist_media_model.PlaylistMedia
+    await db_session.execute(insert(entry).values([
+        {"playlist_id": playlist_id, "media_id": media_id, "position": position}
+        for media_id, position in zip(media_ids, positions)]))
+    await db_session.commit()
+    result = await db_session.execute(select(entry).where(
+        entry.playlist_id == playlist_id, entry.position.between(positions[0], positions[-1]),
+    ).order_by(entry.position))
+    return result.scalars().all(), crowded
+
+
+async def move_playlist_entry(db_session: AsyncSession, playlist_id: int, entry_id: int,
+                              before_entry_id: Optional[int] = None) -> Optional[Tuple[object, bool]]:
+    """
+    Move a playlist entry ahead of another, or to the end, helper. Only the
+    moved row is written. Returns the entry and whether the playlist needs
+    renumbering, or None when the playlist or an entry is missing.
+    :param db_session: The async database session.
+    :param playlist_id: The Playlist ID.
+    :param entry_id: The entry to move.
+    :param before_entry_id: The entry to move ahead of, default to the end.
+    """
+    if await _lock_playlist(db_session, playlist_id) is None:
+        return None
+    entry = playlist_media_model.PlaylistMedia
+    result = await db_session.execute(select(entry).where(
+        entry.playlist_id == playlist_id, entry.entry_id == entry_id))
+    db_entry = result.scalars().first()
+    if db_entry is None:
+        return None
+    crowded = False
+    if before_entry_id != entry_id:
+        free = await _free_positions(db_session, playlist_id, before_entry_id, 1, moving_entry_id=entry_id)
+        if free is None:
+            return None
+        (db_entry.position,), crowded = free
+    await db_session.commit()
+    await db_session.refresh(db_entry)
+    return db_entry, crowded
+
+
+async def delete_playlist_entry(db_session: AsyncSession, playlist_id: int, entry_id: int):
+    """
+    Remove an entry from a playlist helper.
+    :param db_session: The async database session.
+    :param playlist_id: The Playlist ID.
+    :param entry_id: The entry to remove.
+    """
+    entry = playlist_media_model.PlaylistMedia
+    result = await db_session.execute(select(entry).where(
+        entry.playlist_id == playlist_id, entry.entry_id == entry_id))
+    db_entry = result.scalars().first()
+    if db_entry is not None:
+        await db_session.delete(db_entry)
+        await db_session.commit()
+    return db_entry
+
+
+async def get_media_comments(db_session: AsyncSession, media_id: int, cursor: Optional[str] = None,
+                             limit: int = 100) -> Tuple[List, Optional[str]]:
+    """
+    Get a page of comments on a media helper.
+    :param db_session: The async database session.
+    :param media_id: The Media ID.
+    :param cursor: The cursor returned with the previous page.
+    :param limit: The number of comments to retrieve per query.
+    """
+    statement = select(comment_model.Comment).where(
+        comment_model.Comment.media_id == media_id,
+        comment_model.Comment.deleted_at.is_(None),
+    )
+    return await async_keyset_page(db_session, statement, [comment_model.Comment.comment_id],
+                                   cursor=cursor, limit=limit)
+
+
+async def get_play_history(db_session: AsyncSession, user_id: int, cursor: Optional[str] = None,
+                           limit: int = 100) -> Tuple[List, Optional[str]]:
+    """
+    Get a page of a user's play history helper, newest first.
+    :param db_session: The async database session.
+    :param user_id: The User ID.
+    :param cursor: The cursor returned with the previous page.
+    :param limit: The number of plays to retrieve per query.
+    """
+    play_history = play_history_model.PlayHistory
+    statement = select(play_history).where(play_history.user_id == user_id)
+    return await async_keyset_page(db_session, statement,
+                                   [play_history.played_at, play_history.history_id],
+                                   cursor=cursor, limit=limit, descending=True)
+
+
+async def get_album(db_session: AsyncSession, album_id: int):
+    """
+    Get album by Album ID helper.
+    :param db_session: The async database session.
+    :param album_id: The Album ID.
+    """
+    result = await db_session.execute(select(album_model.Album).where(
+        album_model.Album.album_id == album_id,
+        album_model.Album.deleted_at.is_(None),
+    ))
+    return result.scalars().first()
+
+
+async def get_artist(db_session: AsyncSession, artist_id: int):
+    """
+    Get artist by Artist ID helper.
+    :param db_session: The async database session.
+    :param artist_id: The Artist ID.
+    """
+    result = await db_session.execute(select(artist_model.Artist).where(
+        artist_model.Artist.artist_id == artist_id,
+        artist_model.Artist.deleted_at.is_(None),
+    ))
+    return result.scalars().first()
+
+
+async def get_genre(db_session: AsyncSession, genre_id: int):
+    """
+    Get genre by Genre ID helper.
+    :param db_session: The async database session.
+    :param genre_id: The Genre ID.
+    """
+    result = await db_session.execute(select(genre_model.Genre).where(
+        genre_model.Genre.genre_id == genre_id,
+        genre_model.Genre.deleted_at.is_(None),
+    ))
+    return result.scalars().first()
+
+
+async def get_image_path(db_session: AsyncSession, source: ImageSource, entity_id: int) -> Optional[str]:
+    """
+    Get the storage key of an uploaded image helper.
+    :param db_session: The async database session.
+    :param source: The model column holding the image.
+    :param entity_id: The ID of the row.
+    """
+    result = await db_session.execute(select(getattr(source.model, source.path_column)).where(
+        getattr(source.model, source.id_column) == entity_id,
+        source.model.deleted_at.is_(None),
+    ))
+    return result.scalars().first()
+
+
+async def get_rating(db_session: AsyncSession, rating_id: int):
+    """
+    Get an active rating by Rating ID helper.
+    :param db_session: The async database session.
+    :param rating_id: The Rating ID.
+    """
+    result = await db_session.execute(select(rating_model.Rating).where(
+        rating_model.Rating.rating_id == rating_id,
+        rating_model.Rating.deleted_at.is_(None),
+    ))
+    return result.scalars().first()
+
+
+async def _save_rating(db_session: AsyncSession, db_rating, media_id: int, old: Optional[int],
+                       new: Optional[int]):
+    # The row and the media aggregates change in one transaction.
+    statement = rating_stats.change_statement(media_id, old, new)
+    if statement is not None:
+        await db_session.execute(statement)
+    await db_session.commit()
+    await db_session.refresh(db_rating)
+    return db_rating
+
+
+async def rate_media(db_session: AsyncSession, rating: rating_schema.RatingCreate):
+    """
+    Rate a media helper. A user's active rating of the media is updated
+    rather than duplicated.
+    :param db_session: The async database session.
+    :param rating: The rating schema.
+    """
+    result = await db_session.execute(select(rating_model.Rating).where(
+        rating_model.Rating.user_id == rating.user_id,
+        rating_model.Rating.media_id == rating.media_id,
+        rating_model.Rating.deleted_at.is_(None),
+    ).with_for_update())
+    db_rating = result.scalars().first()
+    if db_rating is not None:
+        old, db_rating.rating = db_rating.rating, rating.rating
+        return await _save_rating(db_session, db_rating, rating.media_id, old, rating.rating)
+    db_rating = rating_model.Rating(user_id=rating.user_id, media_id=rating.media_id, rating=rating.rating)
+    db_session.add(db_rating)
+    return await _save_rating(db_session, db_rating, rating.media_id, None, rating.rating)
+
+
+async def update_rating(db_session: AsyncSession, rating_id: int, rating: rating_schema.RatingUpdate):
+    """
+    Update a rating by Rating ID helper.
+    :param db_session: The async database session.
+    :param rating_id: The Rating ID.
+    :param rating: The rating update schema.
+    """
+    result = await db_session.execute(select(rating_model.Rating).where(
+        rating_model.Rating.rating_id == rating_id,
+        rating_model.Rating.deleted_at.is_(None),
+    ).with_for_update())
+    db_rating = result.scalars().first()
+    if db_rating is None:
+        return None
+    old, db_rating.rating = db_rating.rating, rating.rating
+    return await _save_rating(db_session, db_rating, db_rating.media_id, old, rating.rating)
+
+
+async def delete_rating(db_session: AsyncSession, rating_id: int):
+    """
+    Soft-delete a rating by Rating ID helper.
+    :param db_session: The async database session.
+    :param rating_id: The Rating ID.
+    """
+    result = await db_session.execute(select(rating_model.Rating).where(
+        rating_model.Rating.rating_id == rating_id,
+        rating_model.Rating.deleted_at.is_(None),
+    ).with_for_update())
+    db_rating = result.scalars().first()
+    if db_rating is None:
+        return None
+    db_rating.deleted_at = func.now()
+    return await _save_rating(db_session, db_rating, db_rating.media_id, db_rating.rating, None)
@@ -0,0 +1,374 @@
+"""This module is the helper for typeahead suggestions of catalog names."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import asyncio
+import bisect
+import heapq
+import threading
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from loguru import logger
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from api import database
+from api.helpers import response_cache
+from api.helpers.search_index import tokenize
+from api.models.album_model import Album
+from api.models.artist_model import Artist
+from api.models.media_album_model import MediaAlbum
+from api.models.media_artist_model import MediaArtist
+from api.models.media_model import Media
+
+
+SCAN_LIMIT = 256  # prefixes matching more keys than this answer from a kept top-k
+MAX_CACHED_DEPTH = 6  # prefix lengths whose top-k lists are computed at build time
+MAX_WORD_STARTS = 8  # words of a name that suggestions can start from
+KEY_END = "\U0010ffff"
+LOAD_CHUNK_SIZE = 1000
+
+# kind -> (id column, name column, join table column, soft delete column)
+NAME_SOURCES = {
+    "artist": (Artist.artist_id, Artist.artist_name, MediaArtist.artist_id, Artist.deleted_at),
+    "album": (Album.album_id, Album.album_title, MediaAlbum.album_id, Album.deleted_at),
+}
+
+
+def word_starts(text: str) -> Tuple[str, ...]:
+    """
+    Get the normalized keys of a name, one starting at each word.
+    :param text: The name.
+    """
+    tokens = tokenize(text)
+    return tuple(dict.fromkeys(" ".join(tokens[index:])
+                               for index in range(min(len(tokens), MAX_WORD_STARTS))))
+
+
+class PrefixIndex:
+    """
+    Sorted array of normalized name keys searched by binary search, so
+    `rhap` finds "Bohemian Rhapsody". Prefixes matching more than
+    `SCAN_LIMIT` keys keep their most popular entries in a list twice the
+    size of `top_k`, updated in place when popularity changes; the extra
+    depth absorbs removals without rescanning the prefix.
+    """
+
+    def __init__(self, top_k: int = 10):
+        self.top_k = top_k
+        self.depth = top_k * 2
+        self.keys: List[str] = []
+        self.refs: List[tuple] = []  # entry of the key at the same position
+        self.entries: Dict[tuple, list] = {}  # ref -> [text, popularity, keys]
+        self.top: Dict[str, List[tuple]] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _popularity(self, ref: tuple) -> int:
+        return self.entries[ref][1]
+
+    def _range(self, prefix: str) -> Tuple[int, int]:
+        low = bisect.bisect_left(self.keys, prefix)
+        return low, bisect.bisect_left(self.keys, prefix + KEY_END, low)
+
+    def _top_of_range(self, low: int, high: int, count: int) -> List[tuple]:
+        return heapq.nlargest(count, dict.fromkeys(self.refs[low:high]), key=self._popularity)
+
+    def _cached_prefixes(self, keys: Iterable[str]) -> Set[str]:
+        return {key[:length] for key in keys for length in range(1, len(key) + 1)
+                if key[:length] in self.top}
+
+    def _reposition(self, ref: tuple, keys: Iterable[str]):
+        popularity = self._popularity(ref)
+        for prefix in self._cached_prefixes(keys):
+            top = self.top[prefix]
+            if ref in top:
+                top.remove(ref)
+            # Entries outside the list rank at or below its last entry.
+            if not top or popularity >= self._popularity(top[-1]):
+                top.append(ref)
+                top.sort(key=self._popularity, reverse=True)
+                del top[self.depth:]
+            self._refill(prefix)
+
+    def _refill(self, prefix: str):
+        top = self.top[prefix]
+        if len(top) < self.top_k:
+            low, high = self._range(prefix)
+            if high - low > len(top):
+                self.top[prefix] = self._top_of_range(low, high, self.depth)
+
+    def _remove(self, ref: tuple):
+        _, _, keys = self.entries[ref]
+        for key in keys:
+            index = bisect.bisect_left(self.keys, key)
+            while self.refs[index] != ref:
+                index += 1
+            del self.keys[index]
+            del self.refs[index]
+        for prefix in self._cached_prefixes(keys):
+            if ref in self.top[prefix]:
+                self.top[prefix].remove(ref)
+                self._refill(prefix)
+        del self.entries[ref]
+
+    def upsert(self, ref: tuple, text: str, popularity: Optional[int]):
+        """
+        Add an entry, or update its name and popularity.
+        :param ref: The entry, e.g. `("media", 42)`.
+        :param text: The name suggested.
+        :param popularity: The rank of the entry among matches.
+        """
+        keys = word_starts(text)
+        with self._lock:
+            entry = self.entries.get(ref)
+            if entry is not None and entry[2] == keys:
+                entry[0], entry[1] = text, popularity or 0
+                self._reposition(ref, keys)
+                return
+            if entry is not None:
+                self._remove(ref)
+            self.entries[ref] = [text, popularity or 0, keys]
+            for key in keys:
+                index = bisect.bisect_right(self.keys, key)
+                self.keys.insert(index, key)
+                self.refs.insert(index, ref)
+            self._reposition(ref, keys)
+
+    def remove(self, ref: tuple):
+        """
+        Remove an entry.
+        :param ref: The entry.
+        """
+        with self._lock:
+            if ref in self.entries:
+                self._remove(ref)
+
+    def load(self, rows: Iterable[Tuple[tuple, str, Optional[int]]]):
+        """
+        Replace the entries with `(ref, text, popularity)` rows, sorting the
+        keys once instead of inserting them one by one.
+        :param rows: The entries.
+        """
+        with self._lock:
+            self.entries = {ref: [text, popularity or 0, word_starts(text)] for ref, text, popularity in rows}
+            pairs = sorted((key, ref) for ref, entry in self.entries.items() for key in entry[2])
+            self.keys = [key for key, _ in pairs]
+            self.refs = [ref for _, ref in pairs]
+            self.top = {}
+            self._precompute()
+
+    def _precompute(self):
+        # Keep the top-k of every short prefix matching more than `SCAN_LIMIT` keys.
+        with self._lock:
+            for depth in range(1, MAX_CACHED_DEPTH + 1):
+                index = 0
+                while index < len(self.keys):
+                    prefix = self.keys[index][:depth]
+                    if len(prefix) < depth:
+                        index += 1
+                        continue
+                    low, high = self._range(prefix)
+                    if high - low > SCAN_LIMIT:
+                        self.top[prefix] = self._top_of_range(low, high, self.depth)
+                    index = high
+
+    def suggest(self, prefix: str, limit: int) -> List[Tuple[tuple, str, int]]:
+        """
+        Get the most popular entries with a key starting with `prefix`.
+        :param prefix: The typed text.
+        :param limit: The number of suggestions, at most `top_k`.
+        """
+        prefix = " ".join(tokenize(prefix))
+        if not prefix:
+            return []
+        with self._lock:
+            low, high = self._range(prefix)
+            if high - low <= SCAN_LIMIT:
+                refs = self._top_of_range(low, high, limit)
+            else:
+                refs = self.top.get(prefix)
+                if refs is None:
+                    refs = self.top[prefix] = self._top_of_range(low, high, self.depth)
+            return [(ref, self.entries[ref][0], self.entries[ref][1]) for ref in refs[:limit]]
+
+    def snapshot(self) -> dict:
+        """
+        Get the index size.
+        """
+        with self._lock:
+            return {"entries": len(self.entries), "keys": len(self.keys),
+                    "cached_prefixes": len(self.top)}
+
+
+def _named_rows(db_session: Session, kind: str, condition: Callable) -> List:
+    if kind == "media":
+        statement = (select(Media.media_id, Media.media_title, Media.view_count)
+                     .where(condition(Media.media_id), Media.deleted_at.is_(None))
+                     .order_by(Media.media_id))
+    else:
+        id_column, name_column, link_column, deleted_column = NAME_SOURCES[kind]
+        link_table = link_column.class_
+        # Artists and albums rank by the views of their media.
+        statement = (select(id_column, name_column, func.coalesce(func.sum(Media.view_count), 0))
+                     .outerjoin(link_table, link_column == id_column)
+                     .outerjoin(Media, and_(Media.media_id == link_table.media_id,
+                                            Media.deleted_at.is_(None)))
+                     .where(condition(id_column), deleted_column.is_(None))
+                     .group_by(id_column, name_column)
+                     .order_by(id_column))
+    return db_session.execute(statement.limit(LOAD_CHUNK_SIZE)).all()
+
+
+class SuggestIndex:
+    """
+    Typeahead index of media titles, artist names and album titles of this
+    process. Like the search index, it is built in the background at startup
+    and then updated from the catalog tags invalidated in the response cache.
+    """
+
+    def __init__(self, top_k: int, refresh_interval: float, session_factory: Callable[[], Session]):
+        self.top_k = top_k
+        self.refresh_interval = refresh_interval
+        self.session_factory = session_factory
+        self.index = PrefixIndex(top_k)
+        self.ready = False
+        self._pending: Set[str] = set()
+        self._pending_lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Tuple[tuple, str, int]]:
+        """
+        Get the most popular names starting with the typed text.
+        :param prefix: The typed text.
+        :param limit: The number of suggestions.
+        """
+        return self.index.suggest(prefix, min(limit, self.top_k))
+
+    def notify(self, tags: List[str]):
+        """
+        Queue the entries behind invalidated catalog tags for reloading.
+        :param tags: The invalidated cache tags.
+        """
+        tags = [tag for tag in tags
+                if tag.split(":")[0] in ("media", *NAME_SOURCES) and not tag.endswith(":list")]
+        if tags:
+            with self._pending_lock:
+                self._pending.update(tags)
+
+    def _build(self) -> PrefixIndex:
+        entries = []
+        db_session = self.session_factory()
+        try:
+            for kind in ("media", *NAME_SOURCES):
+                last_id = 0
+                while True:
+                    rows = _named_rows(db_session, kind, lambda column: column > last_id)
+                    if not rows:
+                        break
+                    entries.extend(((kind, entity_id), name, popularity)
+                                   for entity_id, name, popularity in rows)
+                    last_id = rows[-1][0]
+        finally:
+            db_session.close()
+        index = PrefixIndex(self.top_k)
+        index.load(entries)
+        return index
+
+    def _refresh(self, tags: Set[str]):
+        ids: Dict[str, Set[int]] = {"media": set(), **{kind: set() for kind in NAME_SOURCES}}
+        for tag in tags:
+            kind, entity_id = tag.split(":", 1)
+            ids[kind].add(int(entity_id))
+        db_session = self.session_factory()
+        try:
+            if ids["media"]:
+                # Views of a media item change the rank of its artists and albums.
+                for kind, (_, _, link_column, _) in NAME_SOURCES.items():
+                    ids[kind].update(db_session.execute(
+                        select(link_column).where(link_column.class_.media_id.in_(ids["media"]))
+                    ).scalars())
+            for kind, entity_ids in ids.items():
+                entity_ids = sorted(entity_ids)
+                for offset in range(0, len(entity_ids), LOAD_CHUNK_SIZE):
+                    chunk = entity_ids[offset:offset + LOAD_CHUNK_SIZE]
+                    rows = _named_rows(db_session, kind, lambda column: column.in_(chunk))
+                    for entity_id in set(chunk) - {row[0] for row in rows}:
+                        self.index.remove((kind, entity_id))
+                    for entity_id, name, popularity in rows:
+                        self.index.upsert((kind, entity_id), name, popularity)
+        finally:
+            db_session.close()
+
+    async def refresh(self):
+        """
+        Reload the entries queued by `notify`.
+        """
+        with self._pending_lock:
+            tags, self._pending = self._pending, set()
+        if not tags:
+            return
+        try:
+            await run_in_threadpool(self._refresh, tags)
+        except Exception:
+            logger.exception(f"Failed to refresh the suggest index for {len(tags)} tags")
+            with self._pending_lock:
+                self._pending.update(tags)
+
+    async def _run(self):
+        while not self.ready:
+            try:
+                self.index = await run_in_threadpool(self._build)
+                self.ready = True
+            except Exception:
+                logger.exception("Failed to build the suggest index")
+                await asyncio.sleep(self.refresh_interval)
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            await self.refresh()
+
+    async def start(self):
+        """
+        Build the index and start applying catalog changes, in the background.
+        """
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Stop the background refresh.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self) -> dict:
+        """
+        Get the index size and state.
+        """
+        with self._pending_lock:
+            pending = len(self._pending)
+        return {**self.index.snapshot(), "ready": self.ready, "pending": pending}
+
+
+@lru_cache()
+def get_suggest_index() -> SuggestIndex:
+    """
+    Process wide typeahead index.
+    """
+    settings = database.conf_settings
+    index = SuggestIndex(top_k=settings.SUGGEST_TOP_K,
+                         refresh_interval=settings.SUGGEST_REFRESH_INTERVAL,
+                         session_factory=database.SessionLocal)
+    response_cache.get_response_cache().add_listener(index.notify)
+    return index
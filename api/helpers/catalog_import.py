@@ -0,0 +1,399 @@
+"""This module is the helper for bulk catalog imports."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import codecs
+import csv
+import json
+import time
+import unicodedata
+from datetime import date, datetime, time as time_of_day
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from loguru import logger
+from sqlalchemy import func, select
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from api.models.album_artist_model import AlbumArtist
+from api.models.album_model import Album
+from api.models.artist_model import Artist
+from api.models.genre_model import Genre
+from api.models.media_album_model import MediaAlbum
+from api.models.media_artist_model import MediaArtist
+from api.models.media_genre_model import MediaGenre
+from api.models.media_model import Media, MediaTypeEnum
+
+
+IMPORT_FORMATS = ("csv", "ndjson")
+LIST_SEPARATOR = "|"  # between names in a CSV cell
+MAX_REPORTED_ERRORS = 100
+UPSERT_DIALECTS = {"mysql": mysql, "mariadb": mysql, "postgresql": postgresql, "sqlite": sqlite}
+MEDIA_UPDATE_COLUMNS = ("media_type", "duration", "s3_media_path", "thumbnail_image_path", "is_premium_only")
+LINK_COLUMNS = {
+    MediaArtist: ("media_id", "artist_id"),
+    MediaGenre: ("media_id", "genre_id"),
+    MediaAlbum: ("media_id", "album_id"),
+    AlbumArtist: ("album_id", "artist_id"),
+}
+
+
+class ImportRow(NamedTuple):
+    """
+    One media of an import with the names of its artists, album and genres.
+    """
+    line: int
+    media: dict
+    artists: Tuple[str, ...]
+    album: Optional[Tuple[str, date]]
+    genres: Tuple[str, ...]
+
+
+class WrittenBatch(NamedTuple):
+    """
+    A committed batch: the media written, those newly linked to an
+    artist, which are new releases for the home feeds, and the cache tags
+    of every row it touched.
+    """
+    count: int
+    released: List[int]
+    tags: List[str]
+
+
+def name_key(name: str) -> str:
+    """
+    Get the key two names share when the catalog's collation deems them
+    equal: MySQL's default one ignores case and accents.
+    :param name: The name or title.
+    """
+    name = unicodedata.normalize("NFKD", name.casefold())
+    return "".join(char for char in name if not unicodedata.combining(char))
+
+
+def iter_lines(chunks: Iterable[bytes]) -> Iterator[str]:
+    """
+    Decode UTF-8 byte chunks into lines, keeping line endings.
+    :param chunks: The input bytes.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    for chunk in chunks:
+        pending += decoder.decode(chunk)
+        lines = pending.splitlines(keepends=True)
+        pending = lines.pop() if lines and not lines[-1].endswith(("\n", "\r")) else ""
+        yield from lines
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def read_records(lines: Iterable[str], import_format: str) -> Iterator[Tuple[int, object]]:
+    """
+    Read the records of a CSV file with a header row, or of a JSON Lines
+    file with one object per line. Yields each with its line number.
+    :param lines: The input lines.
+    :param import_format: `csv` or `ndjson`.
+    """
+    if import_format == "csv":
+        reader = csv.DictReader(lines)
+        for record in reader:
+            yield reader.line_num, record
+        return
+    for line_number, line in enumerate(lines, start=1):
+        if line.strip():
+            try:
+                yield line_number, json.loads(line)
+            except ValueError as error:
+                yield line_number, error
+
+
+def _names(value) -> Tuple[str, ...]:
+    if value is None or value == "":
+        return ()
+    names = value if isinstance(value, list) else str(value).split(LIST_SEPARATOR)
+    return tuple(dict.fromkeys(str(name).strip() for name in names if str(name).strip()))
+
+
+def _flag(value) -> bool:
+    return value if isinstance(value, bool) else str(value or "").strip().lower() in ("1", "true", "yes")
+
+
+def parse_record(line: int, record) -> ImportRow:
+    """
+    Validate a record and split it into the media row and its links.
+    Raises ValueError naming the first problem.
+    :param line: The line number.
+    :param record: The parsed record.
+    """
+    if not isinstance(record, dict):
+        raise ValueError("expected an object")
+    title = str(record.get("media_title") or "").strip()
+    if not title or len(title) > 255:
+        raise ValueError("media_title must be 1 to 255 characters")
+    try:
+        media_type = MediaTypeEnum(str(record.get("media_type") or "").strip().lower())
+    except ValueError:
+        raise ValueError("media_type must be audio or video")
+    duration = record.get("duration") or None
+    if duration is not None:
+        duration = time_of_day.fromisoformat(str(duration).strip())
+    album = None
+    album_title = str(record.get("album") or "").strip()
+    if album_title:
+        if not record.get("album_release_date"):
+            raise ValueError("album_release_date is required with album")
+        album = (album_title, date.fromisoformat(str(record["album_release_date"]).strip()[:10]))
+    media = {"media_title": title, "media_type": media_type, "duration": duration,
+             "s3_media_path": record.get("s3_media_path") or None,
+             "thumbnail_image_path": record.get("thumbnail_image_path") or None,
+             "is_premium_only": _flag(record.get("is_premium_only"))}
+    return ImportRow(line, media, _names(record.get("artists")), album, _names(record.get("genres")))
+
+
+def upsert(db_session: Session, model, rows: List[dict], conflict_columns: Tuple[str, ...],
+           update_columns: Tuple[str, ...] = ()):
+    """
+    Insert rows with one statement, updating `update_columns` of rows whose
+    key exists: `INSERT ... ON DUPLICATE KEY UPDATE` on MySQL, `ON CONFLICT`
+    elsewhere. Without update columns existing rows are left alone.
+    :param db_session: The database session.
+    :param model: The model class.
+    :param rows: The rows.
+    :param conflict_columns: The unique key columns.
+    :param update_columns: The columns to overwrite on a duplicate key.
+    """
+    if not rows:
+        return
+    dialect = UPSERT_DIALECTS[db_session.get_bind().dialect.name]
+    statement = dialect.insert(model).values(rows)
+    if dialect is mysql:
+        values = {column: statement.inserted[column] for column in update_columns}
+        if update_columns and "updated_at" in model.__table__.c:
+            values["updated_at"] = func.now()
+        # Assigning a key column to itself makes the duplicate a no-op.
+        key_column = conflict_columns[0]
+        statement = statement.on_duplicate_key_update(values or {key_column: model.__table__.c[key_column]})
+    elif update_columns:
+        values = {column: statement.excluded[column] for column in update_columns}
+        if "updated_at" in model.__table__.c:
+            values["updated_at"] = func.now()
+        statement = statement.on_conflict_do_update(index_elements=list(conflict_columns), set_=values)
+    else:
+        statement = statement.on_conflict_do_nothing()
+    db_session.execute(statement)
+
+
+class NameCache:
+    """
+    Maps unique artist or genre names to ids, kept in memory for the whole
+    import and keyed by `name_key`. Unknown names are looked up with one
+    query per batch, and the missing ones created with one upsert.
+    """
+
+    def __init__(self, db_session: Session, model, id_column: str, name_column: str):
+        self.db_session = db_session
+        self.model = model
+        self.id_column = getattr(model, id_column)
+        self.name_column = getattr(model, name_column)
+        self.ids: Dict[str, int] = {}
+        self.created = 0
+
+    def _load(self, names: List[str]):
+        for start in range(0, len(names), 1000):
+            rows = self.db_session.execute(select(self.name_column, self.id_column).where(
+                self.name_column.in_(names[start:start + 1000]))).all()
+            self.ids.update((name_key(name), entity_id) for name, entity_id in rows)
+
+    def resolve(self, names: Set[str]) -> Dict[str, int]:
+        """
+        Get the ids of some names by `name_key`, creating the missing ones.
+        :param names: The names; the first spelling of a new name is stored.
+        """
+        spellings: Dict[str, str] = {}
+        for name in sorted(names):
+            spellings.setdefault(name_key(name), name)
+        missing = [spellings[key] for key in sorted(spellings.keys() - self.ids.keys())]
+        if missing:
+            self._load(missing)
+            created = [name for name in missing if name_key(name) not in self.ids]
+            if created:
+                upsert(self.db_session, self.model, [{self.name_column.key: name} for name in created],
+                       (self.name_column.key,))
+                self._load(created)
+                self.created += len(created)
+        return self.ids
+
+
+class AlbumCache:
+    """
+    Maps album titles to ids like NameCache. Titles are not unique in the
+    catalog, so an existing album of the same title is reused.
+    """
+
+    def __init__(self, db_session: Session):
+        self.db_session = db_session
+        self.ids: Dict[str, int] = {}
+        self.created = 0
+
+    def _load(self, titles: List[str]):
+        rows = self.db_session.execute(select(Album.album_title, func.min(Album.album_id)).where(
+            Album.album_title.in_(titles), Album.deleted_at.is_(None)).group_by(Album.album_title)).all()
+        for title, album_id in rows:
+            key = name_key(title)
+            self.ids[key] = min(album_id, self.ids.get(key, album_id))
+
+    def resolve(self, albums: Set[Tuple[str, date]]) -> Dict[str, int]:
+        """
+        Get the ids of some album titles by `name_key`, creating the missing ones.
+        :param albums: The (title, release date) pairs.
+        """
+        release_dates: Dict[str, Tuple[str, date]] = {}
+        for title, release_date in sorted(albums):
+            release_dates.setdefault(name_key(title), (title, release_date))
+        missing = [release_dates[key][0] for key in sorted(release_dates.keys() - self.ids.keys())]
+        if missing:
+            self._load(missing)
+            created = [title for title in missing if name_key(title) not in self.ids]
+            if created:
+                self.db_session.execute(Album.__table__.insert(), [
+                    {"album_title": title,
+                     "release_date": datetime.combine(release_dates[name_key(title)][1], time_of_day())}
+                    for title in created])
+                self._load(created)
+                self.created += len(created)
+        return self.ids
+
+
+class CatalogImporter:
+    """
+    Writes parsed rows in batches: names are resolved through the caches,
+    media are upserted by title with one statement, then every link table
+    gets one statement. Each batch commits on its own.
+    """
+
+    def __init__(self, db_session: Session):
+        self.db_session = db_session
+        self.artists = NameCache(db_session, Artist, "artist_id", "artist_name")
+        self.genres = NameCache(db_session, Genre, "genre_id", "genre_name")
+        self.albums = AlbumCache(db_session)
+
+    def forget(self):
+        """
+        Drop the cached ids after a rollback, which may have undone some.
+        """
+        for cache in (self.artists, self.genres, self.albums):
+            cache.ids.clear()
+
+    def write(self, rows: List[ImportRow]) -> WrittenBatch:
+        """
+        Import a batch of rows.
+        :param rows: The rows; the last of titles with the same `name_key` wins.
+        """
+        rows = list({name_key(row.media["media_title"]): row for row in rows}.values())
+        artist_ids = self.artists.resolve({name for row in rows for name in row.artists})
+        genre_ids = self.genres.resolve({name for row in rows for name in row.genres})
+        album_ids = self.albums.resolve({row.album for row in rows if row.album})
+        upsert(self.db_session, Media, [row.media for row in rows], ("media_title",), MEDIA_UPDATE_COLUMNS)
+        # The stored title of an existing media may differ from the imported one by case.
+        media_ids = {name_key(title): media_id for title, media_id in self.db_session.execute(
+            select(Media.media_title, Media.media_id).where(
+                Media.media_title.in_([row.media["media_title"] for row in rows]))).all()}
+        links = {model: set() for model in LINK_COLUMNS}
+        for row in rows:
+            media_id = media_ids[name_key(row.media["media_title"])]
+            links[MediaArtist].update((media_id, artist_ids[name_key(name)]) for name in row.artists)
+            links[MediaGenre].update((media_id, genre_ids[name_key(name)]) for name in row.genres)
+            if row.album:
+                album_id = album_ids[name_key(row.album[0])]
+                links[MediaAlbum].add((media_id, album_id))
+                links[AlbumArtist].update((album_id, artist_ids[name_key(name)]) for name in row.artists)
+        linked = {tuple(pair) for pair in self.db_session.execute(
+            select(MediaArtist.media_id, MediaArtist.artist_id).where(
+                MediaArtist.media_id.in_(list(media_ids.values()))))}
+        released = sorted({media_id for media_id, _ in links[MediaArtist] - linked})
+        for model, pairs in links.items():
+            columns = LINK_COLUMNS[model]
+            upsert(self.db_session, model, [dict(zip(columns, pair)) for pair in sorted(pairs)], columns)
+        self.db_session.commit()
+        tags = {"media:list"} | {f"media:{media_id}" for media_id in media_ids.values()}
+        for prefix, ids in (("artist", {artist_id for _, artist_id in links[MediaArtist] | links[AlbumArtist]}),
+                            ("genre", {genre_id for _, genre_id in links[MediaGenre]}),
+                            ("album", {album_id for _, album_id in links[MediaAlbum]})):
+            if ids:
+                tags.add(f"{prefix}:list")
+                tags.update(f"{prefix}:{entity_id}" for entity_id in ids)
+        return WrittenBatch(len(rows), released, sorted(tags))
+
+
+def run_import(db_session: Session, chunks: Iterable[bytes], import_format: str, total_bytes: int,
+               batch_size: int, report: Optional[Callable[[dict], None]] = None,
+               on_commit: Optional[Callable[[WrittenBatch], None]] = None) -> dict:
+    """
+    Stream an import file into the catalog, reporting progress after every
+    batch. Invalid records and batches that fail to write are counted and
+    skipped. Returns the final progress.
+    :param db_session: The database session.
+    :param chunks: The file bytes.
+    :param import_format: `csv` or `ndjson`.
+    :param total_bytes: The file size, for the progress percentage.
+    :param batch_size: The rows written per batch.
+    :param report: Called with the progress after every batch.
+    :param on_commit: Called with every committed batch.
+    """
+    importer = CatalogImporter(db_session)
+    progress = {"rows": 0, "imported": 0, "failed": 0, "bytes_read": 0, "total_bytes": total_bytes,
+                "seconds": 0.0, "rows_per_second": 0.0, "errors": []}
+    started = time.monotonic()
+
+    def counted():
+        for chunk in chunks:
+            progress["bytes_read"] += len(chunk)
+            yield chunk
+
+    def fail(line: int, error):
+        progress["failed"] += 1
+        if len(progress["errors"]) < MAX_REPORTED_ERRORS:
+            progress["errors"].append({"line": line, "error": str(error)})
+
+    def flush(batch: List[ImportRow]):
+        written = None
+        try:
+            written = importer.write(batch) if batch else None
+        except Exception as error:
+            # Database errors come from bad rows; anything else is logged, but
+            # neither stops the rest of the file.
+            if not isinstance(error, SQLAlchemyError):
+                logger.exception(f"Failed to import a batch of {len(batch)} rows")
+            db_session.rollback()
+            importer.forget()
+            for row in batch:
+                fail(row.line, error.__class__.__name__)
+        if written is not None:
+            progress["imported"] += written.count
+            if on_commit is not None:
+                on_commit(written)
+        progress["seconds"] = round(time.monotonic() - started, 3)
+        progress["rows_per_second"] = round(progress["rows"] / max(progress["seconds"], 1e-6), 1)
+        if report is not None:
+            report(progress)
+
+    batch: List[ImportRow] = []
+    for line, record in read_records(iter_lines(counted()), import_format):
+        progress["rows"] += 1
+        try:
+            if isinstance(record, Exception):
+                raise record
+            batch.append(parse_record(line, record))
+        except ValueError as error:
+            fail(line, error)
+        if len(batch) >= batch_size:
+            flush(batch)
+            batch = []
+    flush(batch)
+    progress.update(artists_created=importer.artists.created, genres_created=importer.genres.created,
+                    albums_created=importer.albums.created)
+    return progress
@@ -0,0 +1,285 @@
+"""This module is the helper for trending charts."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from loguru import logger
+from redis.exceptions import RedisError
+from sqlalchemy.orm import Session
+
+from api import database
+from api.models.media_artist_model import MediaArtist
+from api.models.media_genre_model import MediaGenre
+
+
+COUNTS_PREFIX = "charts:counts"
+MAPPING_CHUNK_SIZE = 1000  # media per genre/artist lookup
+
+
+class BucketSize(NamedTuple):
+    """
+    A granularity of play counters.
+    """
+    name: str
+    seconds: int
+    retention: int  # seconds a bucket is kept after it ends
+
+
+BUCKET_SIZES = {
+    "m5": BucketSize("m5", 300, 2 * 3600),
+    "h": BucketSize("h", 3600, 8 * 86400),
+}
+
+
+class ChartWindow(NamedTuple):
+    """
+    A chart period: the buckets of the last `span` seconds, each weighted
+    by half for every `half_life` seconds of age, so recent plays lead.
+    """
+    span: int
+    bucket: str
+    half_life: int
+
+
+CHART_WINDOWS = {
+    "hourly": ChartWindow(3600, "m5", 1800),
+    "daily": ChartWindow(86400, "h", 6 * 3600),
+    "weekly": ChartWindow(7 * 86400, "h", 2 * 86400),
+}
+
+CHART_SCOPES = ("media", "genres", "artists")
+
+
+def bucket_key(bucket: BucketSize, start: int) -> str:
+    """
+    Get the Redis sorted set of one bucket of play counts by Media ID.
+    :param bucket: The bucket size.
+    :param start: The bucket start in seconds since the epoch.
+    """
+    return f"{COUNTS_PREFIX}:{bucket.name}:{start}"
+
+
+def chart_key(window: str, scope: str, scope_id: Optional[int] = None) -> str:
+    """
+    Get the Redis key of a materialized chart, e.g. the daily chart of
+    media, of genres, or of the media of genre 3.
+    :param window: The window name.
+    :param scope: `media`, `genres` or `artists`.
+    :param scope_id: The Genre or Artist ID whose media are ranked.
+    """
+    return f"charts:{window}:{scope}" + ("" if scope_id is None else f":{scope_id}")
+
+
+def window_buckets(window: ChartWindow, now: float) -> List[Tuple[str, float]]:
+    """
+    Get the bucket keys of a window and their decay weights.
+    :param window: The chart window.
+    :param now: The time in seconds since the epoch.
+    """
+    bucket = BUCKET_SIZES[window.bucket]
+    current = int(now) // bucket.seconds * bucket.seconds
+    buckets = []
+    # Every bucket ending inside the window, the current one included.
+    for start in range(current, int(now) - window.span - bucket.seconds, -bucket.seconds):
+        age = max(0.0, now - (start + bucket.seconds / 2))
+        buckets.append((bucket_key(bucket, start), 0.5 ** (age / window.half_life)))
+    return buckets
+
+
+def rank(scores: Dict[int, float], size: int) -> List[List]:
+    """
+    Get the `size` highest scores as `[id, score]` pairs.
+    :param scores: The score of each ID.
+    :param size: The chart size.
+    """
+    best = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:size]
+    return [[item_id, round(score, 4)] for item_id, score in best]
+
+
+def build_charts(media_scores: Dict[int, float], media_genres: Iterable[Tuple[int, int]],
+                 media_artists: Iterable[Tuple[int, int]], size: int) -> Dict[Tuple[str, Optional[int]], List[List]]:
+    """
+    Rank media, genres and artists, and the media of every genre and artist.
+    A genre or artist scores the sum of its media.
+    :param media_scores: The window score of each Media ID.
+    :param media_genres: The (media_id, genre_id) pairs.
+    :param media_artists: The (media_id, artist_id) pairs.
+    :param size: The chart size.
+    """
+    charts = {("media", None): rank(media_scores, size)}
+    for scope, pairs in (("genres", media_genres), ("artists", media_artists)):
+        totals: Dict[int, float] = {}
+        members: Dict[int, Dict[int, float]] = {}
+        for media_id, group_id in pairs:
+            score = media_scores.get(media_id)
+            if score:
+                totals[group_id] = totals.get(group_id, 0.0) + score
+                members.setdefault(group_id, {})[media_id] = score
+        charts[(scope, None)] = rank(totals, size)
+        for group_id, scores in members.items():
+            charts[(scope, group_id)] = rank(scores, size)
+    return charts
+
+
+def load_groups(db_session: Session, media_ids: List[int]) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]:
+    """
+    Get the genres and artists of some media.
+    :param db_session: The database session.
+    :param media_ids: The Media IDs.
+    """
+    genres, artists = [], []
+    for start in range(0, len(media_ids), MAPPING_CHUNK_SIZE):
+        chunk = media_ids[start:start + MAPPING_CHUNK_SIZE]
+        genres += db_session.query(MediaGenre.media_id, MediaGenre.genre_id).filter(
+            MediaGenre.media_id.in_(chunk)).all()
+        artists += db_session.query(MediaArtist.media_id, MediaArtist.artist_id).filter(
+            MediaArtist.media_id.in_(chunk)).all()
+    return genres, artists
+
+
+def window_scores(redis_client, window: ChartWindow, now: float) -> Dict[int, float]:
+    """
+    Sum the decayed play counts of a window server side.
+    :param redis_client: The Redis client.
+    :param window: The chart window.
+    :param now: The time in seconds since the epoch.
+    """
+    buckets = dict(window_buckets(window, now))
+    temporary_key = f"charts:union:{window.bucket}:{window.span}:{time.time_ns()}"
+    pipe = redis_client.pipeline()
+    pipe.zunionstore(temporary_key, buckets)
+    pipe.zrange(temporary_key, 0, -1, withscores=True)
+    pipe.delete(temporary_key)
+    _, members, _ = pipe.execute()
+    return {int(media_id): score for media_id, score in members}
+
+
+def materialize(redis_client, db_session: Session, now: float, size: int, ttl: int) -> Dict[str, int]:
+    """
+    Compute every window's charts and store each as one JSON string, so
+    serving a chart is a single GET. Returns the chart count per window.
+    :param redis_client: The Redis client.
+    :param db_session: The database session.
+    :param now: The time in seconds since the epoch.
+    :param size: The chart size.
+    :param ttl: Seconds a chart is kept, so charts left empty expire.
+    """
+    summary = {}
+    for name, window in CHART_WINDOWS.items():
+        media_scores = window_scores(redis_client, window, now)
+        genres, artists = load_groups(db_session, sorted(media_scores))
+        charts = build_charts(media_scores, genres, artists, size)
+        pipe = redis_client.pipeline(transaction=False)
+        for (scope, scope_id), items in charts.items():
+            pipe.set(chart_key(name, scope, scope_id),
+                     json.dumps({"generated_at": now, "items": items}), ex=ttl)
+        pipe.execute()
+        summary[name] = len(charts)
+    return summary
+
+
+class ChartCounter:
+    """
+    Counts plays per media in time buckets. Plays are summed in this
+    process and added to the shared Redis sorted sets of their buckets
+    every `flush_interval`, with one pipeline for all of them.
+    """
+
+    def __init__(self, flush_interval: float, redis_client=None):
+        self.flush_interval = flush_interval
+        self.redis = redis_client
+        self.stats = {"recorded": 0, "flushes": 0, "flush_errors": 0}
+        self._pending: Dict[Tuple[str, int, int], int] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, media_id: int, played_at: Optional[datetime] = None):
+        """
+        Count a play.
+        :param media_id: The Media ID.
+        :param played_at: When the play happened, naive times are UTC; defaults to now.
+        """
+        if played_at is None:
+            timestamp = time.time()
+        else:
+            timestamp = (played_at if played_at.tzinfo else played_at.replace(tzinfo=timezone.utc)).timestamp()
+        for bucket in BUCKET_SIZES.values():
+            start = int(timestamp) // bucket.seconds * bucket.seconds
+            key = (bucket.name, start, media_id)
+            self._pending[key] = self._pending.get(key, 0) + 1
+        self.stats["recorded"] += 1
+
+    async def flush(self):
+        """
+        Add pending counts to Redis.
+        """
+        if not self._pending or self.redis is None:
+            return
+        pending, self._pending = self._pending, {}
+        now = time.time()
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            expiring = set()
+            for (bucket_name, start, media_id), count in pending.items():
+                bucket = BUCKET_SIZES[bucket_name]
+                if start + bucket.seconds + bucket.retention < now:
+                    continue  # Too old for any chart.
+                key = bucket_key(bucket, start)
+                pipe.zincrby(key, count, media_id)
+                if key not in expiring:
+                    expiring.add(key)
+                    pipe.expireat(key, start + bucket.seconds + bucket.retention)
+            await pipe.execute()
+            self.stats["flushes"] += 1
+        except RedisError as error:
+            logger.warning(f"Chart counter flush failed: {error}")
+            self.stats["flush_errors"] += 1
+            for key, count in pending.items():
+                self._pending[key] = self._pending.get(key, 0) + count
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def start(self):
+        """
+        Start the background flusher.
+        """
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Stop the background flusher and flush what is left.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def snapshot(self) -> dict:
+        """
+        Get the counter stats.
+        """
+        return {**self.stats, "pending": len(self._pending)}
+
+
+@lru_cache()
+def get_chart_counter() -> ChartCounter:
+    """
+    Process wide chart play counter.
+    """
+    settings = database.conf_settings
+    return ChartCounter(flush_interval=settings.CHARTS_FLUSH_INTERVAL, redis_client=database.get_async_redis())
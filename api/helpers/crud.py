@@ -5,11 +5,16 @@
 # 2.Related Library Imports
 # 3.Local application/library imports
 # --------------------------------------------#
-from typing import List
+from typing import List, Optional, Tuple
 
 from sqlalchemy.orm import Session
-from api.models import user_model
+from api.helpers.pagination import keyset_page
+from api.models import (comment_model, media_model, play_history_model, playlist_model,
+                        user_model)
+# Relationship targets of the models above, imported so the mappers can configure.
+from api.models import favorite_model, rating_model, role_model  # noqa: F401
 from api.schemas import users_schema
+from api.worker import celery
 
 
 def get_user(db_session: Session, user_id: int):
@@ -57,14 +62,16 @@ def get_user_by_email(db_session: Session, email: str):
     return db_session.query(user_model.User).filter(user_model.User.email == email).first()
 
 
-def get_users(db_session: Session, skip: int = 0, limit: int = 100) -> List:
+def get_users(db_session: Session, cursor: Optional[str] = None,
+              limit: int = 100) -> Tuple[List, Optional[str]]:
     """
-    Get all users helper.
+    Get a page of users helper.
     :param db_session: The database session.
-    :param skip: The offset used when paging.
+    :param cursor: The cursor returned with the previous page.
     :param limit: The number of users to retrieve per query.
     """
-    return db_session.query(user_model.User).offset(skip).limit(limit).all()
+    return keyset_page(db_session.query(user_model.User),
+                       [user_model.User.user_id], cursor=cursor, limit=limit)
 
 
 def create_user(db_session: Session, user: users_schema.UserCreate):
@@ -80,6 +87,76 @@ def create_user(db_session: Session, user: users_schema.UserCreate):
     db_session.refresh(db_user)
     return db_user
 
+
+def get_media(db_session: Session, media_id: int):
+    """
+    Get media by Media ID helper.
+    :param db_session: The database session.
+    :param media_id: The Media ID.
+    """
+    return db_session.query(media_model.Media).filter(
+        media_model.Media.media_id == media_id,
+        media_model.Media.deleted_at.is_(None),
+    ).first()
+
+
+def get_media_list(db_session: Session, cursor: Optional[str] = None,
+                   limit: int = 100) -> Tuple[List, Optional[str]]:
+    """
+    Get a page of media helper.
+    :param db_session: The database session.
+    :param cursor: The cursor returned with the previous page.
+    :param limit: The number of media to retrieve per query.
+    """
+    query = db_session.query(media_model.Media).filter(media_model.Media.deleted_at.is_(None))
+    return keyset_page(query, [media_model.Media.media_id], cursor=cursor, limit=limit)
+
+
+def get_playlists(db_session: Session, user_id: Optional[int] = None, cursor: Optional[str] = None,
+                  limit: int = 100) -> Tuple[List, Optional[str]]:
+    """
+    Get a page of playlists helper.
+    :param db_session: The database session.
+    :param user_id: Only return playlists of this User ID.
+    :param cursor: The cursor returned with the previous page.
+    :param limit: The number of playlists to retrieve per query.
+    """
+    query = db_session.query(playlist_model.Playlist).filter(playlist_model.Playlist.deleted_at.is_(None))
+    if user_id is not None:
+        query = query.filter(playlist_model.Playlist.user_id == user_id)
+    return keyset_page(query, [playlist_model.Playlist.playlist_id], cursor=cursor, limit=limit)
+
+
+def get_media_comments(db_session: Session, media_id: int, cursor: Optional[str] = None,
+                       limit: int = 100) -> Tuple[List, Optional[str]]:
+    """
+    Get a page of comments on a media helper.
+    :param db_session: The database session.
+    :param media_id: The Media ID.
+    :param cursor: The cursor returned with the previous page.
+    :param limit: The number of comments to retrieve per query.
+    """
+    query = db_session.query(comment_model.Comment).filter(
+        comment_model.Comment.media_id == media_id,
+        comment_model.Comment.deleted_at.is_(None),
+    )
+    return keyset_page(query, [comment_model.Comment.comment_id], cursor=cursor, limit=limit)
+
+
+def get_play_history(db_session: Session, user_id: int, cursor: Optional[str] = None,
+                     limit: int = 100) -> Tuple[List, Optional[str]]:
+    """
+    Get a page of a user's play history helper, newest first.
+    :param db_session: The database session.
+    :param user_id: The User ID.
+    :param cursor: The cursor returned with the previous page.
+    :param limit: The number of plays to retrieve per query.
+    """
+    play_history = play_history_model.PlayHistory
+    query = db_session.query(play_history).filter(play_history.user_id == user_id)
+    return keyset_page(query, [play_history.played_at, play_history.history_id],
+                       cursor=cursor, limit=limit, descending=True)
+
 #
 # def get_items(db_session: Session, skip: int = 0, limit: int = 100):
 #     """
@@ -141,18 +218,21 @@ def create_user(db_session: Session, user: users_schema.UserCreate):
 #     """
 #     return db_session.query(task_model.Task).offset(skip).limit(limit).all()
 #
-# def get_task(task_id: str):
-#     """
-#     Get task by ID helper.
-#     :param task_id: The of the task.
-#     """
-#     task_result = celery.AsyncResult(task_id)
-#     result = {
-#         "task_id": task_id,
-#         "task_status": task_result.status,
-#         "task_result": task_result.result
-#     }
-#     return result
+
+
+def get_task(task_id: str):
+    """
+    Get task by ID helper.
+    :param task_id: The of the task.
+    """
+    task_result = celery.AsyncResult(task_id)
+    result = {
+        "task_id": task_id,
+        "task_status": task_result.status,
+        "task_result": task_result.result
+    }
+    return result
+
 
 # def get_questions(skip: int = 0, limit: int = 10):
 #     """
@@ -0,0 +1,73 @@
+"""This module is the helper for building media embeddings."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+from typing import Tuple
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import svds
+from sqlalchemy.orm import Session
+
+from api.helpers import recommendations
+from api.models.media_artist_model import MediaArtist
+from api.models.media_genre_model import MediaGenre
+from api.models.media_model import Media
+
+
+# Weight of each feature block after its rows are scaled to unit length.
+PLAY_WEIGHT = 1.0
+GENRE_WEIGHT = 0.7
+ARTIST_WEIGHT = 0.7
+
+
+def _block(media_ids: np.ndarray, rows: np.ndarray, columns: np.ndarray, values: np.ndarray,
+           weight: float) -> sparse.csr_matrix:
+    positions = np.searchsorted(media_ids, rows)
+    known = (positions < len(media_ids)) & (media_ids[np.minimum(positions, len(media_ids) - 1)] == rows)
+    _, columns = np.unique(columns[known], return_inverse=True)
+    block = sparse.csr_matrix((values[known], (positions[known], columns)),
+                              shape=(len(media_ids), int(columns.max()) + 1 if len(columns) else 0),
+                              dtype=np.float32)
+    block.sum_duplicates()
+    norms = np.sqrt(np.asarray(block.multiply(block).sum(axis=1)).ravel())
+    return sparse.diags(weight / np.maximum(norms, 1e-12)) @ block
+
+
+def media_features(db_session: Session) -> Tuple[sparse.csr_matrix, np.ndarray]:
+    """
+    Build the sparse media x feature matrix: the users who played,
+    favorited or rated each media, its genres and its artists.
+    Returns the matrix and the Media ID of each row.
+    :param db_session: The database session.
+    """
+    media_ids = np.array(sorted(media_id for media_id, in db_session.query(Media.media_id)
+                                .filter(Media.deleted_at.is_(None))), dtype=np.int64)
+    users, items, strengths = recommendations.load_interactions(db_session)
+    genres = np.array(db_session.query(MediaGenre.media_id, MediaGenre.genre_id).all(),
+                      dtype=np.int64).reshape(-1, 2)
+    artists = np.array(db_session.query(MediaArtist.media_id, MediaArtist.artist_id).all(),
+                       dtype=np.int64).reshape(-1, 2)
+    blocks = [
+        _block(media_ids, items, users, strengths, PLAY_WEIGHT),
+        _block(media_ids, genres[:, 0], genres[:, 1], np.ones(len(genres), np.float32), GENRE_WEIGHT),
+        _block(media_ids, artists[:, 0], artists[:, 1], np.ones(len(artists), np.float32), ARTIST_WEIGHT),
+    ]
+    return sparse.hstack(blocks, format="csr"), media_ids
+
+
+def embed(features: sparse.csr_matrix, dim: int) -> np.ndarray:
+    """
+    Reduce feature rows to `dim` dense dimensions with a truncated SVD, so
+    media sharing listeners, genres or artists get close vectors.
+    :param features: The media x feature matrix.
+    :param dim: The embedding size, capped by the matrix rank.
+    """
+    rank = min(dim, min(features.shape) - 1)
+    if rank < 1:
+        return features.toarray().astype(np.float32)
+    left, singular_values, _ = svds(features.astype(np.float64), k=rank, random_state=0)
+    return (left * singular_values).astype(np.float32)
@@ -0,0 +1,249 @@
+"""This module is the helper for broadcasting real-time events to stream clients."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import asyncio
+import itertools
+import json
+import uuid
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set
+
+from loguru import logger
+from redis.exceptions import RedisError
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from api import database
+from api.models.comment_model import Comment
+from api.models.user_artist_model import UserArtist
+
+
+EVENT_CHANNEL = "events"
+MAX_OUTBOX = 100000  # events waiting to be published before the oldest are dropped
+PUBLISH_BATCH_SIZE = 500
+
+
+class Subscriber:
+    """
+    One stream client: its topics and a bounded queue of events to send.
+    A `None` in the queue ends the stream.
+    """
+    __slots__ = ("topics", "queue")
+
+    def __init__(self, topics: Set[str], queue_size: int):
+        self.topics = topics
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+
+
+class EventHub:
+    """
+    Fans events out to the stream clients of this process. Every worker
+    holds one Redis subscription to `EVENT_CHANNEL` and pushes each event
+    onto the bounded queues of the clients subscribed to one of its topics,
+    so idle clients cost no wake-ups. A client whose queue is full is
+    disconnected and resumes from the replay buffer with `Last-Event-ID`.
+    """
+
+    def __init__(self, queue_size: int, replay_size: int, redis_client=None):
+        self.queue_size = queue_size
+        self.redis = redis_client
+        self.stats = {"published": 0, "delivered": 0, "evicted": 0, "dropped": 0}
+        self._replay: deque = deque(maxlen=replay_size)
+        self._topics: Dict[str, Set[Subscriber]] = {}
+        self._subscribers = 0
+        self._outbox: deque = deque()
+        self._ids = itertools.count(1)
+        self._prefix = uuid.uuid4().hex[:12]
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def publish(self, event_name: str, data: dict, topics: Iterable[str]):
+        """
+        Queue an event for every worker's subscribers. Safe to call from
+        any thread; events are published in batches by a background task.
+        :param event_name: The SSE event name.
+        :param data: The JSON-able payload.
+        :param topics: The topics the event is delivered to, e.g. `media:42`.
+        """
+        if len(self._outbox) >= MAX_OUTBOX:
+            self._outbox.popleft()
+            self.stats["dropped"] += 1
+        self._outbox.append({"id": f"{self._prefix}-{next(self._ids)}", "event": event_name,
+                             "data": data, "topics": list(topics)})
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def subscribe(self, topics: Iterable[str], last_event_id: Optional[str] = None) -> Subscriber:
+        """
+        Register a stream client, queueing the buffered events it missed.
+        :param topics: The topics to receive.
+        :param last_event_id: The `Last-Event-ID` the client reconnected with.
+        """
+        topics = set(topics)
+        missed = []
+        if last_event_id is not None:
+            replay = list(self._replay)
+            # Unknown ids are older than the buffer: replay all of it.
+            position = next((index for index in range(len(replay) - 1, -1, -1)
+                             if replay[index]["id"] == last_event_id), -1)
+            missed = [item for item in replay[position + 1:] if topics.intersection(item["topics"])]
+        subscriber = Subscriber(topics, self.queue_size + len(missed))
+        for item in missed:
+            subscriber.queue.put_nowait(item)
+        for topic in topics:
+            self._topics.setdefault(topic, set()).add(subscriber)
+        self._subscribers += 1
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        """
+        Remove a stream client.
+        :param subscriber: The subscriber returned by `subscribe`.
+        """
+        if not subscriber.topics:
+            return
+        for topic in subscriber.topics:
+            subscribers = self._topics.get(topic)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._topics[topic]
+        subscriber.topics = set()
+        self._subscribers -= 1
+
+    def _evict(self, subscriber: Subscriber):
+        self.unsubscribe(subscriber)
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait(None)
+        self.stats["evicted"] += 1
+
+    def _dispatch(self, item: dict):
+        self._replay.append(item)
+        subscribers = set()
+        for topic in item["topics"]:
+            subscribers.update(self._topics.get(topic, ()))
+        for subscriber in subscribers:
+            try:
+                subscriber.queue.put_nowait(item)
+                self.stats["delivered"] += 1
+            except asyncio.QueueFull:
+                self._evict(subscriber)
+
+    async def _publish_outbox(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while self._outbox:
+                batch = [self._outbox.popleft()
+                         for _ in range(min(len(self._outbox), PUBLISH_BATCH_SIZE))]
+                self.stats["published"] += len(batch)
+                if self.redis is None:
+                    for item in batch:
+                        self._dispatch(item)
+                    continue
+                try:
+                    pipe = self.redis.pipeline(transaction=False)
+                    for item in batch:
+                        pipe.publish(EVENT_CHANNEL, json.dumps(item))
+                    await pipe.execute()
+                except RedisError as error:
+                    logger.warning(f"Event publish failed, delivering {len(batch)} events locally: {error}")
+                    for item in batch:
+                        self._dispatch(item)
+
+    async def _listen(self):
+        while True:
+            try:
+                pubsub = self.redis.pubsub()
+                await pubsub.subscribe(EVENT_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self._dispatch(json.loads(message["data"]))
+            except RedisError as error:
+                logger.warning(f"Event listener failed: {error}")
+                await asyncio.sleep(1)
+
+    async def start(self):
+        """
+        Start publishing and, with Redis, receiving events.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        if self._outbox:
+            self._wakeup.set()
+        self._tasks = [asyncio.create_task(self._publish_outbox())]
+        if self.redis is not None:
+            self._tasks.append(asyncio.create_task(self._listen()))
+
+    async def stop(self):
+        """
+        Stop the background tasks and end every stream.
+        """
+        self._loop = None
+        for task in self._tasks:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        for subscribers in list(self._topics.values()):
+            for subscriber in list(subscribers):
+                self._evict(subscriber)
+
+    def snapshot(self) -> dict:
+        """
+        Get the hub counters.
+        """
+        return {**self.stats, "subscribers": self._subscribers, "topics": len(self._topics),
+                "replay_buffered": len(self._replay), "outbox": len(self._outbox)}
+
+
+def install_event_hooks(hub: EventHub):
+    """
+    Publish new comments and artist follows written by any session on commit.
+    :param hub: The event hub.
+    """
+    @event.listens_for(Session, "after_flush")
+    def collect_events(session, flush_context):
+        pending = session.info.setdefault("hub_events", [])
+        for obj in session.new:
+            if isinstance(obj, Comment):
+                pending.append(("new_comment", {
+                    "comment_id": obj.comment_id,
+                    "media_id": obj.media_id,
+                    "user_id": obj.user_id,
+                    "comment_text": obj.comment_text,
+                }, [f"media:{obj.media_id}"]))
+            elif isinstance(obj, UserArtist):
+                pending.append(("new_follower", {
+                    "artist_id": obj.artist_id,
+                    "follower_id": obj.follower_id,
+                }, [f"artist:{obj.artist_id}", f"user:{obj.follower_id}"]))
+
+    @event.listens_for(Session, "after_commit")
+    def publish_events(session):
+        for event_name, data, topics in session.info.pop("hub_events", ()):
+            hub.publish(event_name, data, topics)
+
+    @event.listens_for(Session, "after_rollback")
+    def discard_events(session):
+        session.info.pop("hub_events", None)
+
+
+@lru_cache()
+def get_event_hub() -> EventHub:
+    """
+    Process wide event hub.
+    """
+    settings = database.conf_settings
+    return EventHub(queue_size=settings.EVENT_HUB_QUEUE_SIZE,
+                    replay_size=settings.EVENT_HUB_REPLAY_SIZE,
+                    redis_client=database.get_async_redis() if settings.EVENT_HUB_REDIS else None)
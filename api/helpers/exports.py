@@ -0,0 +1,136 @@
+"""This module is the helper for streaming exports."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import csv
+import enum
+import io
+import json
+import zlib
+from datetime import date, datetime, time
+from typing import AsyncIterator, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.helpers.pagination import encode_cursor, keyset_after
+from api.models.media_model import Media
+from api.models.play_history_model import PlayHistory
+
+
+class ExportFormat(NamedTuple):
+    """
+    An export file format.
+    """
+    media_type: str
+    extension: str
+
+
+EXPORT_FORMATS = {
+    "ndjson": ExportFormat("application/x-ndjson", "ndjson"),
+    "csv": ExportFormat("text/csv", "csv"),
+}
+GZIP_MEDIA_TYPE = "application/gzip"
+
+
+class Export(NamedTuple):
+    """
+    An exportable listing: its columns, and the unique sort key each row's
+    resume cursor is built from.
+    """
+    name: str
+    columns: Tuple
+    key_columns: Tuple
+
+
+PLAY_HISTORY_EXPORT = Export("plays", (PlayHistory.history_id, PlayHistory.user_id, PlayHistory.media_id,
+                                       PlayHistory.played_at), (PlayHistory.history_id,))
+MEDIA_EXPORT = Export("media", (Media.media_id, Media.media_title, Media.media_type, Media.duration,
+                                Media.s3_media_path, Media.thumbnail_image_path, Media.view_count,
+                                Media.is_premium_only, Media.rating_count, Media.rating_sum,
+                                Media.created_at, Media.updated_at), (Media.media_id,))
+
+
+def _plain(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    return value
+
+
+def export_statement(export: Export, *filters, cursor: Optional[str] = None):
+    """
+    Get the SELECT of an export's columns in key order, after `cursor`.
+    Raises InvalidCursor for a malformed cursor, before anything is sent.
+    :param export: The export.
+    :param filters: The WHERE clauses.
+    :param cursor: The `cursor` of the last row received.
+    """
+    return keyset_after(select(*export.columns).where(*filters), export.key_columns, cursor)
+
+
+def encode_rows(export: Export, rows: Sequence, export_format: str, header: bool = False) -> str:
+    """
+    Serialize a batch of rows, each with the cursor that resumes after it.
+    :param export: The export.
+    :param rows: The result rows.
+    :param export_format: `ndjson` or `csv`.
+    :param header: Whether to start with the CSV header.
+    """
+    names = [column.key for column in export.columns] + ["cursor"]
+    records = [[_plain(value) for value in row] + [encode_cursor([getattr(row, column.key)
+                                                                  for column in export.key_columns])]
+               for row in rows]
+    if export_format == "ndjson":
+        return "".join(json.dumps(dict(zip(names, record)), separators=(",", ":")) + "\n" for record in records)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if header:
+        writer.writerow(names)
+    writer.writerows(records)
+    return buffer.getvalue()
+
+
+async def stream_export(db_session: AsyncSession, export: Export, statement, export_format: str,
+                        compress: bool, batch_size: int) -> AsyncIterator[bytes]:
+    """
+    Stream an export through a server-side cursor one batch at a time,
+    so memory stays flat whatever the row count.
+    :param db_session: The async database session.
+    :param export: The export.
+    :param statement: The statement from `export_statement`.
+    :param export_format: `ndjson` or `csv`.
+    :param compress: Whether to gzip the output.
+    :param batch_size: The rows fetched and encoded per chunk.
+    """
+    compressor = zlib.compressobj(wbits=31) if compress else None  # 31: gzip container
+    result = await db_session.stream(statement.execution_options(stream_results=True, yield_per=batch_size))
+    header = export_format == "csv"
+    async for rows in result.partitions(batch_size):
+        chunk = encode_rows(export, rows, export_format, header=header).encode()
+        header = False
+        if compressor is not None:
+            chunk = compressor.compress(chunk)
+        if chunk:
+            yield chunk
+    if header:
+        # An empty CSV still gets its header.
+        chunk = encode_rows(export, [], export_format, header=True).encode()
+        yield chunk if compressor is None else compressor.compress(chunk)
+    if compressor is not None:
+        yield compressor.flush()
+
+
+def export_filename(export: Export, export_format: str, compress: bool, suffix: str = "") -> str:
+    """
+    Get the download file name of an export.
+    :param export: The export.
+    :param export_format: `ndjson` or `csv`.
+    :param compress: Whether the output is gzipped.
+    :param suffix: Appended to the export name, e.g. the User ID.
+    """
+    return f"{export.name}{suffix}.{EXPORT_FORMATS[export_format].extension}" + (".gz" if compress else "")
@@ -0,0 +1,231 @@
+"""This module is the helper for the home feed of followed artists."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import asyncio
+import heapq
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+
+from api.models.media_artist_model import MediaArtist
+from api.models.media_model import Media
+from api.models.user_artist_model import UserArtist
+
+
+# Feeds are sorted sets of Media IDs scored by Media ID, newest first, so
+# a release reaching a feed through two artists is listed once and the
+# last Media ID of a page is an exact cursor.
+CELEBRITIES_KEY = "feed:celebrities"
+
+
+def user_feed_key(user_id: int) -> str:
+    """
+    Get the Redis key of the releases fanned out to a user.
+    :param user_id: The User ID.
+    """
+    return f"feed:user:{user_id}"
+
+
+def artist_feed_key(artist_id: int) -> str:
+    """
+    Get the Redis key of the releases of an artist merged on read.
+    :param artist_id: The Artist ID.
+    """
+    return f"feed:artist:{artist_id}"
+
+
+def _add(pipe, key: str, media_ids: Iterable[int], max_items: int, ttl: int):
+    pipe.zadd(key, {media_id: media_id for media_id in media_ids})
+    pipe.zremrangebyrank(key, 0, -max_items - 1)
+    pipe.expire(key, ttl)
+
+
+def fan_out(db_session: Session, redis_client, media_id: int, max_followers: int, batch_size: int,
+            max_items: int, ttl: int) -> Dict[str, int]:
+    """
+    Deliver a new media to the feeds of the followers of its artists.
+    Artists with more than `max_followers` followers are only recorded on
+    their own timeline and marked for merging on read, so one release
+    never writes millions of feeds.
+    :param db_session: The database session.
+    :param redis_client: The Redis client.
+    :param media_id: The Media ID.
+    :param max_followers: The follower count above which an artist is merged on read.
+    :param batch_size: The followers written per Redis pipeline.
+    :param max_items: The cap of every feed.
+    :param ttl: Seconds an untouched feed is kept.
+    """
+    summary = {"artists": 0, "merged_on_read": 0, "feeds": 0}
+    artist_ids = [artist_id for artist_id, in db_session.query(MediaArtist.artist_id).join(
+        Media, Media.media_id == MediaArtist.media_id).filter(
+        MediaArtist.media_id == media_id, Media.deleted_at.is_(None))]
+    for artist_id in artist_ids:
+        summary["artists"] += 1
+        pipe = redis_client.pipeline(transaction=False)
+        _add(pipe, artist_feed_key(artist_id), [media_id], max_items, ttl)
+        followers = db_session.query(func.count()).select_from(UserArtist).filter(
+            UserArtist.artist_id == artist_id).scalar()
+        if followers > max_followers:
+            pipe.sadd(CELEBRITIES_KEY, artist_id)
+        pipe.execute()
+        if followers > max_followers:
+            summary["merged_on_read"] += 1
+            continue
+        last_id = 0
+        while True:
+            follower_ids = [user_id for user_id, in db_session.query(UserArtist.follower_id).filter(
+                UserArtist.artist_id == artist_id, UserArtist.follower_id > last_id).order_by(
+                UserArtist.follower_id).limit(batch_size)]
+            if not follower_ids:
+                break
+            pipe = redis_client.pipeline(transaction=False)
+            for user_id in follower_ids:
+                _add(pipe, user_feed_key(user_id), [media_id], max_items, ttl)
+            pipe.execute()
+            summary["feeds"] += len(follower_ids)
+            last_id = follower_ids[-1]
+    return summary
+
+
+def backfill(db_session: Session, redis_client, user_id: int, artist_id: int, max_items: int, ttl: int) -> int:
+    """
+    Copy the recent releases of a newly followed artist into the user's
+    feed. Returns the number of media added.
+    :param db_session: The database session.
+    :param redis_client: The Redis client.
+    :param user_id: The follower's User ID.
+    :param artist_id: The Artist ID.
+    :param max_items: The cap of the feed.
+    :param ttl: Seconds an untouched feed is kept.
+    """
+    media_ids = [media_id for media_id, in db_session.query(MediaArtist.media_id).join(
+        Media, Media.media_id == MediaArtist.media_id).filter(
+        MediaArtist.artist_id == artist_id, Media.deleted_at.is_(None)).order_by(
+        MediaArtist.media_id.desc()).limit(max_items)]
+    if media_ids:
+        pipe = redis_client.pipeline(transaction=False)
+        _add(pipe, user_feed_key(user_id), media_ids, max_items, ttl)
+        pipe.execute()
+    return len(media_ids)
+
+
+def prune(db_session: Session, redis_client, user_id: int, artist_id: int, max_items: int) -> int:
+    """
+    Remove the releases of an unfollowed artist from the user's feed,
+    keeping those also credited to another artist the user follows.
+    Returns the number of media removed.
+    :param db_session: The database session.
+    :param redis_client: The Redis client.
+    :param user_id: The former follower's User ID.
+    :param artist_id: The Artist ID.
+    :param max_items: The cap of the feed, so older releases cannot be in it.
+    """
+    media_ids = [media_id for media_id, in db_session.query(MediaArtist.media_id).filter(
+        MediaArtist.artist_id == artist_id).order_by(MediaArtist.media_id.desc()).limit(max_items)]
+    if not media_ids:
+        return 0
+    still_followed = {media_id for media_id, in db_session.query(MediaArtist.media_id).join(
+        UserArtist, UserArtist.artist_id == MediaArtist.artist_id).filter(
+        UserArtist.follower_id == user_id, MediaArtist.media_id.in_(media_ids))}
+    removed = [media_id for media_id in media_ids if media_id not in still_followed]
+    if removed:
+        redis_client.zrem(user_feed_key(user_id), *removed)
+    return len(removed)
+
+
+def merge_pages(pages: Iterable[List[int]], limit: int) -> Tuple[List[int], Optional[int]]:
+    """
+    Merge newest-first Media ID lists into one page without duplicates.
+    Returns the page and the cursor of the next one, if any.
+    :param pages: The Media IDs of each source, each sorted newest first.
+    :param limit: The page size.
+    """
+    media_ids: List[int] = []
+    more = False
+    for media_id in heapq.merge(*pages, key=lambda item: -item):
+        if media_ids and media_ids[-1] == media_id:
+            continue
+        if len(media_ids) == limit:
+            more = True
+            break
+        media_ids.append(media_id)
+    return media_ids, media_ids[-1] if more else None
+
+
+async def read_feed(redis_client, user_id: int, artist_ids: List[int], cursor: Optional[int],
+                    limit: int) -> Tuple[List[int], Optional[int]]:
+    """
+    Read a page of a user's feed: the fanned out releases merged with the
+    timelines of the followed artists that are merged on read, in one
+    Redis round trip.
+    :param redis_client: The async Redis client.
+    :param user_id: The User ID.
+    :param artist_ids: The followed artists merged on read.
+    :param cursor: The last Media ID of the previous page.
+    :param limit: The page size.
+    """
+    upper = "+inf" if cursor is None else f"({cursor}"
+    pipe = redis_client.pipeline(transaction=False)
+    for key in [user_feed_key(user_id)] + [artist_feed_key(artist_id) for artist_id in artist_ids]:
+        # One extra item tells whether a next page exists.
+        pipe.zrevrangebyscore(key, upper, "-inf", start=0, num=limit + 1)
+    pages = await pipe.execute()
+    return merge_pages([[int(media_id) for media_id in page] for page in pages], limit)
+
+
+def queue_jobs(jobs: Iterable[Tuple[Callable, tuple]]):
+    """
+    Queue feed jobs, logging those the broker refuses.
+    :param jobs: The (queue function, arguments) pairs.
+    """
+    for job, args in jobs:
+        try:
+            job(*args)
+        except Exception as error:  # The commit stands; the feed catches up on the next release.
+            logger.warning(f"Feed job {args} was not queued: {error}")
+
+
+def install_feed_hooks(fan_out_media: Callable[[int], object], backfill_feed: Callable[[int, int], object],
+                       prune_feed: Callable[[int, int], object]):
+    """
+    Queue the fan-out of media newly linked to an artist, and the backfill
+    of new follows and pruning of removed ones, after commit of any session.
+    :param fan_out_media: Queues a fan-out, given a Media ID.
+    :param backfill_feed: Queues a backfill, given a User ID and an Artist ID.
+    :param prune_feed: Queues a prune, given a User ID and an Artist ID.
+    """
+    @event.listens_for(Session, "after_flush")
+    def collect_releases(session, flush_context):
+        pending = session.info.setdefault("feed_jobs", set())
+        for obj in session.new:
+            if isinstance(obj, MediaArtist):
+                pending.add((fan_out_media, (obj.media_id,)))
+            elif isinstance(obj, UserArtist):
+                pending.add((backfill_feed, (obj.follower_id, obj.artist_id)))
+        for obj in session.deleted:
+            if isinstance(obj, UserArtist):
+                pending.add((prune_feed, (obj.follower_id, obj.artist_id)))
+
+    @event.listens_for(Session, "after_commit")
+    def queue_releases(session):
+        jobs = session.info.pop("feed_jobs", None)
+        if not jobs:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            queue_jobs(jobs)  # A sync session, already off the event loop.
+            return
+        # AsyncSession commits run on the event loop; publishing to the
+        # broker there would stall every request while it is slow.
+        loop.run_in_executor(None, queue_jobs, jobs)
+
+    @event.listens_for(Session, "after_rollback")
+    def discard_releases(session):
+        session.info.pop("feed_jobs", None)
@@ -0,0 +1,137 @@
+"""This module is the helper for resized image derivatives."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import hashlib
+import io
+from typing import Dict, NamedTuple, Optional
+
+from PIL import Image, ImageOps
+
+from api.helpers.storage import StorageBackend
+from api.models.album_model import Album
+from api.models.artist_model import Artist
+from api.models.media_model import Media
+from api.models.user_model import User
+
+
+IMAGE_PREFIX = "images"
+IMAGE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Longest edge in pixels of each variant, largest first: every variant is
+# resized from the previous one.
+IMAGE_SIZES = {"large": 1024, "medium": 512, "small": 256, "thumb": 96}
+
+
+class ImageFormat(NamedTuple):
+    """
+    An output encoding of the variants.
+    """
+    pil_format: str
+    media_type: str
+    options: dict
+
+
+IMAGE_FORMATS = {
+    "webp": ImageFormat("WEBP", "image/webp", {"quality": 80, "method": 4}),
+    "jpg": ImageFormat("JPEG", "image/jpeg", {"quality": 85, "optimize": True, "progressive": True}),
+}
+
+
+class ImageSource(NamedTuple):
+    """
+    A model column holding the storage key of an uploaded image.
+    """
+    model: type
+    id_column: str
+    path_column: str
+    tag: str  # response cache tag prefix of the row
+
+
+IMAGE_SOURCES = {
+    "media": ImageSource(Media, "media_id", "thumbnail_image_path", "media"),
+    "albums": ImageSource(Album, "album_id", "cover_art", "album"),
+    "artists": ImageSource(Artist, "artist_id", "profile_picture", "artist"),
+    "users": ImageSource(User, "user_id", "profile_picture", "user"),
+}
+
+
+def content_digest(data: bytes) -> str:
+    """
+    Get the content address of an uploaded image.
+    :param data: The image bytes.
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+def variant_name(size: str, extension: str) -> str:
+    """
+    Get the file name of a variant, e.g. `small.webp`.
+    :param size: The size name.
+    :param extension: The format extension.
+    """
+    return f"{size}.{extension}"
+
+
+def variant_key(digest: str, name: str) -> str:
+    """
+    Get the storage key of a variant. Identical uploads share their variants.
+    :param digest: The content digest of the source image.
+    :param name: The variant file name.
+    """
+    return f"{IMAGE_PREFIX}/{digest[:2]}/{digest}/{name}"
+
+
+def manifest_key(source_key: str) -> str:
+    """
+    Get the storage key of the manifest mapping a source image to its digest.
+    :param source_key: The storage key of the source image.
+    """
+    return f"{IMAGE_PREFIX}/sources/{hashlib.sha1(source_key.encode()).hexdigest()}.json"
+
+
+def pick_format(accept: Optional[str]) -> str:
+    """
+    Get the variant format to serve for an Accept header.
+    :param accept: The Accept header value.
+    """
+    return "webp" if accept and "image/webp" in accept else "jpg"
+
+
+def read_object(storage_backend: StorageBackend, key: str) -> bytes:
+    """
+    Read a whole stored object.
+    :param storage_backend: The storage backend.
+    :param key: The object key.
+    """
+    stored = storage_backend.stat(key)
+    return b"".join(storage_backend.iter_range(key, 0, stored.size - 1))
+
+
+def render_variants(data: bytes) -> Dict[str, bytes]:
+    """
+    Resize an image to every size of `IMAGE_SIZES` in every format of
+    `IMAGE_FORMATS`, never enlarging it.
+    :param data: The source image bytes.
+    """
+    with Image.open(io.BytesIO(data)) as source:
+        # JPEG sources are decoded at the smallest scale still covering the largest variant.
+        largest = max(IMAGE_SIZES.values())
+        source.draft("RGB", (largest, largest))
+        image = ImageOps.exif_transpose(source)
+        image = image.convert("RGBA" if "A" in image.getbands() or "transparency" in image.info else "RGB")
+    variants = {}
+    for size, edge in IMAGE_SIZES.items():
+        image.thumbnail((edge, edge), Image.LANCZOS, reducing_gap=3.0)
+        for extension, image_format in IMAGE_FORMATS.items():
+            output = image
+            if image.mode == "RGBA" and image_format.pil_format == "JPEG":
+                output = Image.new("RGB", image.size, (255, 255, 255))
+                output.paste(image, mask=image.getchannel("A"))
+            buffer = io.BytesIO()
+            output.save(buffer, image_format.pil_format, **image_format.options)
+            variants[variant_name(size, extension)] = buffer.getvalue()
+    return variants
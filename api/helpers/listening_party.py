@@ -0,0 +1,204 @@
+"""This module is the helper for synchronized listening party sessions."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import asyncio
+import json
+import time
+from functools import lru_cache
+from typing import Dict, Optional, Set
+
+from loguru import logger
+from starlette.websockets import WebSocket
+
+from api import database
+
+
+class HostTaken(Exception):
+    """
+    Raised when a second host joins a session.
+    """
+
+
+class PartySession:
+    """
+    Playback state of one listening party: the host reports its position,
+    followers receive it.
+    """
+    __slots__ = ("session_id", "host", "followers", "media_id", "position", "playing",
+                 "reported_at", "seq")
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.host: Optional[WebSocket] = None
+        self.followers: Set[WebSocket] = set()
+        self.media_id: Optional[int] = None
+        self.position = 0.0
+        self.playing = False
+        self.reported_at = time.time()
+        self.seq = 0
+
+    def state(self, now: float) -> dict:
+        """
+        Get the playback state extrapolated to server time `now`.
+        :param now: The server time in seconds since the epoch.
+        """
+        position = self.position + (now - self.reported_at if self.playing else 0.0)
+        return {
+            "type": "state",
+            "session_id": self.session_id,
+            "media_id": self.media_id,
+            "position": round(position, 3),
+            "playing": self.playing,
+            "host_connected": self.host is not None,
+            "server_time": now,
+            "seq": self.seq,
+        }
+
+
+class PartyHub:
+    """
+    Listening party sessions of this process. Host position updates only
+    mark their session dirty; one background task sends the latest state of
+    every dirty session to its followers each `broadcast_interval`, so the
+    send rate is bounded however often hosts report. Followers too slow to
+    take a message within `send_timeout` are disconnected.
+    Sessions live in one process, so a deployment with several workers
+    must route every connection of a session to the same worker.
+    """
+
+    def __init__(self, broadcast_interval: float, send_timeout: float):
+        self.broadcast_interval = broadcast_interval
+        self.send_timeout = send_timeout
+        self.sessions: Dict[str, PartySession] = {}
+        self.stats = {"updates_received": 0, "messages_sent": 0, "dropped": 0}
+        self._dirty: Set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    async def join(self, session_id: str, websocket: WebSocket, host: bool) -> PartySession:
+        """
+        Add a connection to a session, creating the session if needed.
+        Followers receive the current state right away.
+        :param session_id: The session ID.
+        :param websocket: The accepted connection.
+        :param host: Whether the connection controls playback.
+        """
+        session = self.sessions.get(session_id)
+        if session is None:
+            session = self.sessions[session_id] = PartySession(session_id)
+        if host:
+            if session.host is not None:
+                raise HostTaken(session_id)
+            session.host = websocket
+            self._dirty.add(session_id)
+        else:
+            session.followers.add(websocket)
+            await self._send(session, websocket, json.dumps(session.state(time.time())))
+        return session
+
+    def leave(self, session: PartySession, websocket: WebSocket):
+        """
+        Remove a connection, dropping the session when it is empty.
+        :param session: The session joined.
+        :param websocket: The connection.
+        """
+        if session.host is websocket:
+            session.host = None
+            session.playing = False
+            self._dirty.add(session.session_id)
+        else:
+            session.followers.discard(websocket)
+        # A session dropped earlier may have been replaced under the same ID.
+        if session.host is None and not session.followers \
+                and self.sessions.get(session.session_id) is session:
+            del self.sessions[session.session_id]
+
+    def update(self, session: PartySession, media_id: int, position: float, playing: bool):
+        """
+        Record the host's playback position; followers get it with the next broadcast.
+        :param session: The session.
+        :param media_id: The Media ID being played.
+        :param position: The position in seconds.
+        :param playing: Whether playback is running.
+        """
+        session.media_id = media_id
+        session.position = position
+        session.playing = playing
+        session.reported_at = time.time()
+        session.seq += 1
+        self._dirty.add(session.session_id)
+        self.stats["updates_received"] += 1
+
+    async def _send(self, session: PartySession, websocket: WebSocket, message: str):
+        try:
+            await asyncio.wait_for(websocket.send_text(message), self.send_timeout)
+            self.stats["messages_sent"] += 1
+        except Exception:  # Closed, or too slow to keep up.
+            self.stats["dropped"] += 1
+            session.followers.discard(websocket)
+            try:
+                await asyncio.wait_for(websocket.close(code=1013), self.send_timeout)
+            except Exception:
+                pass
+
+    async def broadcast(self):
+        """
+        Send the state of every session updated since the last broadcast.
+        """
+        dirty, self._dirty = self._dirty, set()
+        now = time.time()
+        sends = []
+        for session_id in dirty:
+            session = self.sessions.get(session_id)
+            if session is None or not session.followers:
+                continue
+            message = json.dumps(session.state(now))
+            sends.extend(self._send(session, follower, message) for follower in list(session.followers))
+        if sends:
+            await asyncio.gather(*sends)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.broadcast_interval)
+            try:
+                await self.broadcast()
+            except Exception:
+                logger.exception("Failed to broadcast listening party state")
+
+    async def start(self):
+        """
+        Start the background broadcaster.
+        """
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Stop the background broadcaster.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self) -> dict:
+        """
+        Get the session counts and counters.
+        """
+        return {**self.stats, "sessions": len(self.sessions),
+                "followers": sum(len(session.followers) for session in self.sessions.values())}
+
+
+@lru_cache()
+def get_party_hub() -> PartyHub:
+    """
+    Process wide listening party hub.
+    """
+    settings = database.conf_settings
+    return PartyHub(broadcast_interval=settings.PARTY_BROADCAST_INTERVAL,
+                    send_timeout=settings.PARTY_SEND_TIMEOUT)
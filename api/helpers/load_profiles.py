@@ -0,0 +1,47 @@
+"""This module is the helper for named eager-loading profiles."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+from typing import Dict, List
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import load_only, selectinload, with_expression
+
+from api.models.album_model import Album
+from api.models.artist_model import Artist
+from api.models.comment_model import Comment
+from api.models.favorite_model import Favorite
+from api.models.genre_model import Genre
+from api.models.media_model import Media
+
+
+# Collections use selectinload: one `IN` query per relation for the whole
+# page, where a joinedload would multiply the page's rows before LIMIT.
+_ARTISTS = selectinload(Media.artists).load_only(Artist.artist_id, Artist.artist_name)
+_ALBUMS = selectinload(Media.albums).load_only(Album.album_id, Album.album_title, Album.cover_art)
+_GENRES = selectinload(Media.genres).load_only(Genre.genre_id, Genre.genre_name)
+
+_FAVORITE_COUNT = select(func.count()).where(
+    Favorite.media_id == Media.media_id, Favorite.deleted_at.is_(None)).scalar_subquery()
+_COMMENT_COUNT = select(func.count()).where(
+    Comment.media_id == Media.media_id, Comment.deleted_at.is_(None)).scalar_subquery()
+
+# Loader options of each profile, and the queries it issues per page.
+MEDIA_PROFILES: Dict[str, List] = {
+    # 2 queries: list cells, with artist names.
+    "card": [
+        load_only(Media.media_id, Media.media_title, Media.media_type, Media.duration,
+                  Media.thumbnail_image_path, Media.view_count, Media.is_premium_only,
+                  Media.rating_count, Media.rating_sum),
+        _ARTISTS,
+    ],
+    # 4 queries: every media column with artists, albums and genres.
+    "detail": [_ARTISTS, _ALBUMS, _GENRES],
+    # 4 queries: detail plus favorite and comment counts as subquery columns.
+    "full": [_ARTISTS, _ALBUMS, _GENRES,
+             with_expression(Media.favorite_count, _FAVORITE_COUNT),
+             with_expression(Media.comment_count, _COMMENT_COUNT)],
+}
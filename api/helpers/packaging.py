@@ -0,0 +1,225 @@
+"""This module is the helper for packaging media into HLS renditions."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import math
+import os
+import shutil
+import subprocess
+from datetime import time
+from typing import List, NamedTuple, Optional
+
+from api.models.media_model import MediaTypeEnum
+
+
+SEGMENT_SECONDS = 6
+BYTE_SEGMENT_SIZE = 1024 * 1024  # bytes per segment of the byte segmenter
+FFMPEG_TIMEOUT = 600  # seconds per segment
+
+
+class Rendition(NamedTuple):
+    """
+    One output quality of the adaptive bitrate ladder.
+    """
+    name: str
+    bandwidth: int  # bits per second, as advertised in the master playlist
+    audio_bitrate: str
+    video_height: Optional[int] = None
+    video_bitrate: Optional[str] = None
+
+
+RENDITIONS = {
+    MediaTypeEnum.AUDIO: [
+        Rendition("64k", 64000, "64k"),
+        Rendition("128k", 128000, "128k"),
+        Rendition("256k", 256000, "256k"),
+    ],
+    MediaTypeEnum.VIDEO: [
+        Rendition("360p", 896000, "96k", 360, "800k"),
+        Rendition("720p", 2928000, "128k", 720, "2800k"),
+        Rendition("1080p", 5192000, "192k", 1080, "5000k"),
+    ],
+}
+
+
+class Segment(NamedTuple):
+    """
+    A slice of the source media encoded independently of the others.
+    """
+    index: int
+    start: float  # seconds
+    duration: float  # seconds
+    offset: int = 0  # bytes, for the byte segmenter
+    length: int = 0
+
+
+def get_rendition(media_type: MediaTypeEnum, name: str) -> Rendition:
+    """
+    Get a rendition of a media type by name.
+    :param media_type: The media type.
+    :param name: The rendition name.
+    """
+    return next(rendition for rendition in RENDITIONS[media_type] if rendition.name == name)
+
+
+def duration_seconds(duration: Optional[time]) -> Optional[float]:
+    """
+    Convert `Media.duration` to seconds.
+    :param duration: The media duration.
+    """
+    if duration is None:
+        return None
+    return duration.hour * 3600 + duration.minute * 60 + duration.second + duration.microsecond / 1e6
+
+
+def output_prefix(media_path: str) -> str:
+    """
+    Get the storage key prefix of the HLS output of a media file.
+    :param media_path: The `Media.s3_media_path` of the source.
+    """
+    return f"{os.path.splitext(media_path)[0]}/hls"
+
+
+def segment_name(index: int) -> str:
+    """
+    Get the file name of a segment.
+    :param index: The segment index.
+    """
+    return f"segment_{index:05d}.ts"
+
+
+class FfmpegSegmenter:
+    """
+    Transcodes each segment with an ffmpeg subprocess, seeking to its start,
+    so segments of one media can be encoded on different workers.
+    """
+    name = "ffmpeg"
+
+    def __init__(self, ffmpeg: str, ffprobe: str):
+        self.ffmpeg = ffmpeg
+        self.ffprobe = ffprobe
+
+    def plan(self, path: str, duration_hint: Optional[float]) -> List[Segment]:
+        """
+        Cut the media into segments of `SEGMENT_SECONDS`.
+        :param path: The source file.
+        :param duration_hint: The stored duration, unused as ffprobe measures it.
+        """
+        completed = subprocess.run(
+            [self.ffprobe, "-v", "error", "-show_entries", "format=duration",
+             "-of", "default=noprint_wrappers=1:nokey=1", path],
+            capture_output=True, check=True, text=True, timeout=FFMPEG_TIMEOUT,
+        )
+        duration = float(completed.stdout.strip())
+        count = max(1, math.ceil(duration / SEGMENT_SECONDS))
+        return [Segment(index, index * SEGMENT_SECONDS,
+                        min(SEGMENT_SECONDS, duration - index * SEGMENT_SECONDS))
+                for index in range(count)]
+
+    def encode(self, path: str, segment: Segment, rendition: Rendition, output_path: str):
+        """
+        Encode one segment of one rendition as MPEG-TS.
+        :param path: The source file.
+        :param segment: The segment.
+        :param rendition: The rendition.
+        :param output_path: The file to write.
+        """
+        command = [self.ffmpeg, "-v", "error", "-y", "-ss", f"{segment.start:.3f}",
+                   "-t", f"{segment.duration:.3f}", "-i", path]
+        if rendition.video_height:
+            command += ["-vf", f"scale=-2:{rendition.video_height}", "-c:v", "libx264",
+                        "-preset", "veryfast", "-b:v", rendition.video_bitrate,
+                        "-maxrate", rendition.video_bitrate, "-bufsize", rendition.video_bitrate]
+        else:
+            command += ["-vn"]
+        # Timestamps continue from the segment start, so players can join segments.
+        command += ["-c:a", "aac", "-b:a", rendition.audio_bitrate,
+                    "-output_ts_offset", f"{segment.start:.3f}", "-muxdelay", "0",
+                    "-f", "mpegts", output_path]
+        subprocess.run(command, capture_output=True, check=True, timeout=FFMPEG_TIMEOUT)
+
+
+class ByteSegmenter:
+    """
+    Pure-Python stand-in used when ffmpeg is not installed: cuts the source
+    into byte ranges without transcoding, so every rendition holds the same
+    bytes. Meant for tests and development.
+    """
+    name = "bytes"
+
+    def __init__(self, segment_size: int = BYTE_SEGMENT_SIZE):
+        self.segment_size = segment_size
+
+    def plan(self, path: str, duration_hint: Optional[float]) -> List[Segment]:
+        """
+        Cut the file into ranges of `segment_size` bytes.
+        :param path: The source file.
+        :param duration_hint: The stored duration, spread over the ranges by size.
+        """
+        size = os.path.getsize(path)
+        count = max(1, math.ceil(size / self.segment_size))
+        total = duration_hint or count * SEGMENT_SECONDS
+        segments = []
+        for index in range(count):
+            offset = index * self.segment_size
+            length = min(self.segment_size, size - offset)
+            segments.append(Segment(index, total * offset / max(size, 1),
+                                    total * length / max(size, 1), offset, length))
+        return segments
+
+    def encode(self, path: str, segment: Segment, rendition: Rendition, output_path: str):
+        """
+        Copy the byte range of one segment.
+        :param path: The source file.
+        :param segment: The segment.
+        :param rendition: The rendition, ignored.
+        :param output_path: The file to write.
+        """
+        with open(path, "rb") as source, open(output_path, "wb") as output:
+            source.seek(segment.offset)
+            output.write(source.read(segment.length))
+
+
+def get_segmenter(name: Optional[str] = None):
+    """
+    Get the ffmpeg segmenter when ffmpeg is installed, else the byte segmenter.
+    :param name: Force a segmenter by name, so every worker of a job uses the same one.
+    """
+    ffmpeg, ffprobe = shutil.which("ffmpeg"), shutil.which("ffprobe")
+    if name == FfmpegSegmenter.name or (name is None and ffmpeg and ffprobe):
+        if not (ffmpeg and ffprobe):
+            raise RuntimeError("ffmpeg and ffprobe are not installed on this worker")
+        return FfmpegSegmenter(ffmpeg, ffprobe)
+    return ByteSegmenter()
+
+
+def media_playlist(segments: List[Segment]) -> str:
+    """
+    Build the VOD playlist of one rendition.
+    :param segments: The segments in order.
+    """
+    lines = [
+        "#EXTM3U",
+        "#EXT-X-VERSION:3",
+        f"#EXT-X-TARGETDURATION:{max(1, math.ceil(max(segment.duration for segment in segments)))}",
+        "#EXT-X-MEDIA-SEQUENCE:0",
+        "#EXT-X-PLAYLIST-TYPE:VOD",
+    ]
+    for segment in segments:
+        lines += [f"#EXTINF:{segment.duration:.3f},", segment_name(segment.index)]
+    lines.append("#EXT-X-ENDLIST")
+    return "\n".join(lines) + "\n"
+
+
+def master_playlist(renditions: List[Rendition]) -> str:
+    """
+    Build the master playlist listing every rendition.
+    :param renditions: The renditions, lowest bandwidth first.
+    """
+    lines = ["#EXTM3U", "#EXT-X-VERSION:3"]
+    for rendition in renditions:
+        lines += [f"#EXT-X-STREAM-INF:BANDWIDTH={rendition.bandwidth}", f"{rendition.name}/index.m3u8"]
+    return "\n".join(lines) + "\n"
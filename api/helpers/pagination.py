@@ -0,0 +1,131 @@
+"""This module is the helper for keyset (cursor) pagination."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query
+from sqlalchemy.sql import Select
+
+
+MAX_PAGE_SIZE = 1000
+
+
+class InvalidCursor(Exception):
+    """
+    Raised when a cursor cannot be decoded for the requested listing.
+    """
+
+
+def encode_cursor(values: Sequence) -> str:
+    """
+    Encode the sort key of the last row of a page as an opaque cursor.
+    :param values: The sort key values.
+    """
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence) -> List:
+    """
+    Decode a cursor into sort key values typed after `columns`.
+    :param cursor: The opaque cursor.
+    :param columns: The sort key columns.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, ValueError):
+        raise InvalidCursor(cursor)
+    if not isinstance(payload, list) or len(payload) != len(columns):
+        raise InvalidCursor(cursor)
+    values = []
+    for column, value in zip(columns, payload):
+        try:
+            if column.type.python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif not isinstance(value, column.type.python_type):
+                raise TypeError(value)
+        except (TypeError, ValueError):
+            raise InvalidCursor(cursor)
+        values.append(value)
+    return values
+
+
+def _after(columns: Sequence, values: Sequence, descending: bool):
+    # Expanded form of (a, b) > (x, y) that MySQL can serve from an index range.
+    clauses = []
+    for index, column in enumerate(columns):
+        bound = column < values[index] if descending else column > values[index]
+        equals = [columns[prefix] == values[prefix] for prefix in range(index)]
+        clauses.append(and_(*equals, bound))
+    return or_(*clauses)
+
+
+def keyset_after(query, columns: Sequence, cursor: Optional[str] = None, descending: bool = False):
+    """
+    Order `query` by `columns` and skip the rows up to `cursor`, without a
+    limit, e.g. to stream everything after a cursor.
+    Works on both ORM queries and select() statements.
+    :param query: The query to page through.
+    :param columns: The sort key columns.
+    :param cursor: A cursor from `encode_cursor`.
+    :param descending: Whether to go from the highest key down.
+    """
+    if cursor:
+        query = query.filter(_after(columns, decode_cursor(cursor, columns), descending))
+    return query.order_by(*[column.desc() if descending else column.asc() for column in columns])
+
+
+def _page_query(query, columns: Sequence, cursor: Optional[str], limit: int, descending: bool):
+    return keyset_after(query, columns, cursor, descending).limit(limit + 1)
+
+
+def _page_result(rows: List, columns: Sequence, limit: int) -> Tuple[List, Optional[str]]:
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, column.key) for column in columns])
+    return rows, next_cursor
+
+
+def keyset_page(query: Query, columns: Sequence, cursor: Optional[str] = None,
+                limit: int = 100, descending: bool = False) -> Tuple[List, Optional[str]]:
+    """
+    Fetch one page of `query` ordered by `columns`, starting after `cursor`.
+    The last column must be unique so every row has a distinct sort key.
+    :param query: The query to page through.
+    :param columns: The sort key columns.
+    :param cursor: The cursor returned with the previous page.
+    :param limit: The number of rows per page.
+    :param descending: Whether to page from the highest key down.
+    """
+    limit = min(max(limit, 1), MAX_PAGE_SIZE)
+    rows = _page_query(query, columns, cursor, limit, descending).all()
+    return _page_result(rows, columns, limit)
+
+
+async def async_keyset_page(db_session: AsyncSession, statement: Select, columns: Sequence,
+                            cursor: Optional[str] = None, limit: int = 100,
+                            descending: bool = False) -> Tuple[List, Optional[str]]:
+    """
+    Async version of `keyset_page` for a `select()` of one entity.
+    :param db_session: The async database session.
+    :param statement: The select statement to page through.
+    :param columns: The sort key columns.
+    :param cursor: The cursor returned with the previous page.
+    :param limit: The number of rows per page.
+    :param descending: Whether to page from the highest key down.
+    """
+    limit = min(max(limit, 1), MAX_PAGE_SIZE)
+    result = await db_session.execute(_page_query(statement, columns, cursor, limit, descending))
+    return _page_result(result.scalars().all(), columns, limit)
@@ -0,0 +1,269 @@
+"""This module is the helper for buffered play history ingestion."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import asyncio
+import json
+import os
+import re
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, List, Optional
+
+from loguru import logger
+from sqlalchemy import insert
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from api import database
+from api.models.play_history_model import PlayHistory
+
+
+JOURNAL_PATTERN = re.compile(r"^plays-(\d+)-.+\.(journal|sealed)$")
+
+
+class BufferFull(Exception):
+    """
+    Raised when the ingestion buffer cannot accept more events.
+    """
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class PlayIngestBuffer:
+    """
+    Bounded write-behind buffer of play events.
+    Events are appended to a journal file on arrival and written to
+    `play_history` in multi-row inserts once `batch_size` events are pending
+    or `flush_interval` seconds have passed. Journals are only removed after
+    their events are committed, so pending plays survive a restart. Events
+    the database refuses are set aside in a `.rejected` file so they cannot
+    hold up the rest; only transient failures are retried.
+    """
+
+    def __init__(self, journal_dir: str, max_size: int, batch_size: int,
+                 flush_interval: float, session_factory: Callable[[], Session]):
+        self.journal_dir = journal_dir
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.session_factory = session_factory
+        self.pending: List[dict] = []
+        self.stats = {
+            "accepted": 0,
+            "dropped": 0,
+            "flushed": 0,
+            "flushes": 0,
+            "flush_errors": 0,
+            "rejected": 0,
+            "last_batch_size": 0,
+            "last_flush_latency_ms": 0.0,
+            "max_flush_latency_ms": 0.0,
+        }
+        self._journal = None
+        self._journal_seq = 0
+        self._sealed: List[str] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    def _journal_path(self, suffix: str) -> str:
+        self._journal_seq += 1
+        name = f"plays-{os.getpid()}-{int(time.time())}-{self._journal_seq}.{suffix}"
+        return os.path.join(self.journal_dir, name)
+
+    def recover(self):
+        """
+        Load journals left behind by this or a dead process into the buffer.
+        """
+        if not os.path.isdir(self.journal_dir):
+            return
+        for name in sorted(os.listdir(self.journal_dir)):
+            match = JOURNAL_PATTERN.match(name)
+            if not match:
+                continue
+            pid = int(match.group(1))
+            if pid != os.getpid() and _pid_alive(pid):
+                continue
+            claimed = self._journal_path("sealed")
+            try:
+                os.rename(os.path.join(self.journal_dir, name), claimed)
+            except FileNotFoundError:
+                continue  # Claimed by another worker.
+            with open(claimed, "r", encoding="utf-8") as journal:
+                for line in journal:
+                    if line.strip():
+                        event = json.loads(line)
+                        event["played_at"] = datetime.fromisoformat(event["played_at"])
+                        self.pending.append(event)
+            self._sealed.append(claimed)
+        if self._sealed:
+            logger.info(f"Recovered {len(self.pending)} play events from {len(self._sealed)} journals")
+
+    def add(self, user_id: int, media_id: int, played_at: Optional[datetime] = None):
+        """
+        Accept a play event.
+        :param user_id: The User ID.
+        :param media_id: The Media ID.
+        :param played_at: When the play happened, defaults to now.
+        """
+        if len(self.pending) >= self.max_size:
+            self.stats["dropped"] += 1
+            raise BufferFull()
+        event = {"user_id": user_id, "media_id": media_id,
+                 "played_at": played_at or datetime.utcnow()}
+        if self._journal is None:
+            os.makedirs(self.journal_dir, exist_ok=True)
+            self._journal = open(self._journal_path("journal"), "a", encoding="utf-8")
+        self._journal.write(json.dumps({**event, "played_at": event["played_at"].isoformat()}) + "\n")
+        self._journal.flush()
+        self.pending.append(event)
+        self.stats["accepted"] += 1
+        if len(self.pending) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    def _seal(self) -> List[str]:
+        if self._journal is not None:
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+            self._journal.close()
+            sealed_path = self._journal.name[:-len("journal")] + "sealed"
+            os.rename(self._journal.name, sealed_path)
+            self._sealed.append(sealed_path)
+            self._journal = None
+        sealed, self._sealed = self._sealed, []
+        return sealed
+
+    def _insert(self, batch: List[dict]):
+        db_session = self.session_factory()
+        try:
+            for offset in range(0, len(batch), self.batch_size):
+                db_session.execute(insert(PlayHistory).values(batch[offset:offset + self.batch_size]))
+            db_session.commit()
+        except Exception:
+            db_session.rollback()
+            raise
+        finally:
+            db_session.close()
+
+    def _write(self, batch: List[dict]) -> List[dict]:
+        """
+        Insert a batch, bisecting it when the database refuses some of its
+        rows. Returns the refused rows.
+        :param batch: The play events.
+        """
+        try:
+            self._insert(batch)
+        except (IntegrityError, DataError) as error:
+            if len(batch) == 1:
+                logger.warning(f"Rejected play event {batch[0]}: {error.orig}")
+                return batch
+            middle = len(batch) // 2
+            return self._write(batch[:middle]) + self._write(batch[middle:])
+        return []
+
+    def _quarantine(self, rejected: List[dict]):
+        os.makedirs(self.journal_dir, exist_ok=True)
+        with open(self._journal_path("rejected"), "w", encoding="utf-8") as quarantine:
+            for event in rejected:
+                quarantine.write(json.dumps({**event, "played_at": event["played_at"].isoformat()}) + "\n")
+            quarantine.flush()
+            os.fsync(quarantine.fileno())
+
+    def _write_batch(self, batch: List[dict]) -> List[dict]:
+        rejected = self._write(batch)
+        if rejected:
+            self._quarantine(rejected)
+        return rejected
+
+    async def flush(self):
+        """
+        Write all pending events to the database.
+        """
+        if not self.pending:
+            return
+        batch, self.pending = self.pending, []
+        sealed = self._seal()
+        start = time.perf_counter()
+        try:
+            rejected = await run_in_threadpool(self._write_batch, batch)
+        except Exception:
+            logger.exception(f"Failed to flush {len(batch)} play events")
+            self.pending = batch + self.pending
+            self._sealed = sealed + self._sealed
+            self.stats["flush_errors"] += 1
+            return
+        latency_ms = (time.perf_counter() - start) * 1000
+        for path in sealed:
+            os.remove(path)
+        self.stats["flushed"] += len(batch) - len(rejected)
+        self.stats["rejected"] += len(rejected)
+        self.stats["flushes"] += 1
+        self.stats["last_batch_size"] = len(batch)
+        self.stats["last_flush_latency_ms"] = latency_ms
+        self.stats["max_flush_latency_ms"] = max(self.stats["max_flush_latency_ms"], latency_ms)
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def start(self):
+        """
+        Recover journals and start the background flusher.
+        """
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self.recover()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Stop the background flusher and flush what is left.
+        """
+        if self._task is not None:
+            # Not cancelled: a write running in the thread pool would still
+            # commit, leaving its journals behind to be inserted again.
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    def snapshot(self) -> dict:
+        """
+        Get the ingestion counters.
+        """
+        return {**self.stats, "pending": len(self.pending), "capacity": self.max_size}
+
+
+@lru_cache()
+def get_play_buffer() -> PlayIngestBuffer:
+    """
+    Process wide play ingestion buffer.
+    """
+    settings = database.conf_settings
+    return PlayIngestBuffer(
+        journal_dir=settings.PLAY_INGEST_JOURNAL_DIR,
+        max_size=settings.PLAY_INGEST_MAX_BUFFER,
+        batch_size=settings.PLAY_INGEST_BATCH_SIZE,
+        flush_interval=settings.PLAY_INGEST_FLUSH_INTERVAL,
+        session_factory=database.SessionLocal,
+    )
@@ -0,0 +1,76 @@
+"""This module is the helper for ordering playlist entries."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+from typing import List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from api.models.playlist_media_model import PlaylistMedia
+
+
+# Entries sit POSITION_GAP apart, so an entry moved or inserted between two
+# others takes a free position in the gap and no other row is rewritten.
+# Repeated inserts at one spot halve the gap each time; below CROWDED_GAP
+# the playlist is queued for renumbering.
+POSITION_GAP = 1 << 20
+CROWDED_GAP = 1 << 10
+MAX_BULK_ENTRIES = 1000
+RENUMBER_BATCH_SIZE = 1000
+
+
+def append_positions(last: Optional[int], count: int) -> List[int]:
+    """
+    Get the positions of `count` entries added after the last one.
+    :param last: The position of the last entry, None for an empty playlist.
+    :param count: The number of entries.
+    """
+    start = 0 if last is None else last
+    return [start + POSITION_GAP * (index + 1) for index in range(count)]
+
+
+def positions_between(before: Optional[int], after: int, count: int) -> Tuple[List[int], int]:
+    """
+    Get evenly spread positions of `count` entries inserted between two
+    entries, and the spacing left between them. No positions are returned
+    when the gap is too small.
+    :param before: The position of the entry before, None at the head.
+    :param after: The position of the entry after.
+    :param count: The number of entries.
+    """
+    lower = after - POSITION_GAP * (count + 1) if before is None else before
+    step = (after - lower) // (count + 1)
+    if step < 1:
+        return [], 0
+    return [lower + step * (index + 1) for index in range(count)], step
+
+
+def renumber(db_session: Session, playlist_id: int) -> int:
+    """
+    Space the entries of a playlist POSITION_GAP apart again, keeping their
+    order. The caller holds the playlist lock and commits.
+    Returns the number of entries.
+    :param db_session: The database session.
+    :param playlist_id: The Playlist ID.
+    """
+    entries = PlaylistMedia.playlist_id == playlist_id
+    entry_ids = [entry_id for entry_id, in db_session.query(PlaylistMedia.entry_id).filter(entries)
+                 .order_by(PlaylistMedia.position)]
+    if not entry_ids:
+        return 0
+    lowest, highest = db_session.query(func.min(PlaylistMedia.position),
+                                       func.max(PlaylistMedia.position)).filter(entries).one()
+    # Park every entry below both the old and the new positions first, so
+    # the unique (playlist_id, position) index holds after every row.
+    shift = highest - lowest + 1 + max(0, lowest)
+    db_session.query(PlaylistMedia).filter(entries).update(
+        {PlaylistMedia.position: PlaylistMedia.position - shift}, synchronize_session=False)
+    for start in range(0, len(entry_ids), RENUMBER_BATCH_SIZE):
+        db_session.bulk_update_mappings(PlaylistMedia, [
+            {"entry_id": entry_id, "position": POSITION_GAP * (start + index + 1)}
+            for index, entry_id in enumerate(entry_ids[start:start + RENUMBER_BATCH_SIZE])])
+    return len(entry_ids)
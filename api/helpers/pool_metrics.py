@@ -0,0 +1,154 @@
+"""This module is the helper for database connection pool metrics."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import threading
+import time
+from typing import Dict, List
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolMetrics:
+    """
+    Counters and latencies of one connection pool.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pool = None
+        self._lock = threading.Lock()
+        self.waits = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+        self.connect_ms_total = 0.0
+        self.connect_ms_max = 0.0
+
+    def count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def record_wait(self, wait_ms: float, timed_out: bool):
+        with self._lock:
+            self.waits += 1
+            self.wait_ms_total += wait_ms
+            self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+            if timed_out:
+                self.timeouts += 1
+
+    def record_connect(self, connect_ms: float):
+        with self._lock:
+            self.connects += 1
+            self.connect_ms_total += connect_ms
+            self.connect_ms_max = max(self.connect_ms_max, connect_ms)
+
+    def snapshot(self) -> dict:
+        """
+        Get the pool gauges and counters.
+        """
+        with self._lock:
+            result = {
+                "name": self.name,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait_ms_avg": self.wait_ms_total / self.waits if self.waits else 0.0,
+                "wait_ms_max": self.wait_ms_max,
+                "connect_ms_avg": self.connect_ms_total / self.connects if self.connects else 0.0,
+                "connect_ms_max": self.connect_ms_max,
+            }
+        if isinstance(self.pool, QueuePool):
+            result.update({
+                "size": self.pool.size(),
+                "checked_in": self.pool.checkedin(),
+                "checked_out": self.pool.checkedout(),
+                "overflow": self.pool.overflow(),
+            })
+        return result
+
+
+POOL_METRICS: Dict[str, PoolMetrics] = {}
+
+
+class _TimedPoolMixin:
+    """
+    Records how long `connect()` waits for a pooled connection.
+    """
+
+    def connect(self):
+        metrics = POOL_METRICS.get(self._orig_logging_name)
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            if metrics is not None:
+                metrics.pool = self
+                metrics.record_wait((time.perf_counter() - start) * 1000, timed_out)
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    """
+    QueuePool recording connection wait time.
+    """
+
+
+class TimedAsyncAdaptedQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool recording connection wait time.
+    """
+
+
+def instrument_engine(engine, name: str) -> PoolMetrics:
+    """
+    Collect pool metrics of an engine created with `pool_logging_name=name`.
+    :param engine: The sync engine, or the `sync_engine` of an async engine.
+    :param name: The pool name.
+    """
+    metrics = POOL_METRICS.setdefault(name, PoolMetrics(name))
+    metrics.pool = engine.pool
+
+    @event.listens_for(engine, "do_connect")
+    def receive_do_connect(dialect, connection_record, cargs, cparams):
+        connection_record.info["connect_started"] = time.perf_counter()
+
+    @event.listens_for(engine, "connect")
+    def receive_connect(dbapi_connection, connection_record):
+        started = connection_record.info.pop("connect_started", None)
+        if started is not None:
+            metrics.record_connect((time.perf_counter() - started) * 1000)
+
+    @event.listens_for(engine, "checkout")
+    def receive_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.count("checkouts")
+
+    @event.listens_for(engine, "checkin")
+    def receive_checkin(dbapi_connection, connection_record):
+        metrics.count("checkins")
+
+    @event.listens_for(engine, "invalidate")
+    def receive_invalidate(dbapi_connection, connection_record, exception):
+        metrics.count("invalidations")
+
+    return metrics
+
+
+def get_pool_metrics() -> List[dict]:
+    """
+    Get the metrics of every instrumented pool.
+    """
+    return [metrics.snapshot() for metrics in POOL_METRICS.values()]
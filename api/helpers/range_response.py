@@ -0,0 +1,145 @@
+"""This module is the helper for HTTP byte-range responses."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+from email.utils import parsedate_to_datetime
+from typing import Optional, Tuple
+
+from starlette.concurrency import iterate_in_threadpool
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+from api.helpers.storage import StorageBackend, StoredObject
+
+
+ZEROCOPY_EXTENSION = "http.response.zerocopysend"
+
+
+class RangeNotSatisfiable(Exception):
+    """
+    Raised when a Range header does not overlap the object.
+    """
+
+
+def parse_range_header(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single `bytes=` range into inclusive offsets.
+    Returns None when the header should be ignored and the full body served.
+    :param range_header: The Range header value.
+    :param size: The object size in bytes.
+    """
+    unit, _, ranges = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in ranges:
+        return None
+    first, dash, last = ranges.strip().partition("-")
+    if not dash:
+        return None
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            suffix_length = int(last)
+            if suffix_length == 0:
+                raise RangeNotSatisfiable(range_header)
+            start = max(size - suffix_length, 0)
+            end = size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable(range_header)
+    if end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+def if_range_matches(if_range: Optional[str], stored: StoredObject) -> bool:
+    """
+    Check whether an If-Range validator still matches the object.
+    :param if_range: The If-Range header value.
+    :param stored: The stored object metadata.
+    """
+    if not if_range:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith(("\"", "W/")):
+        return if_range == stored.etag
+    return if_range == stored.last_modified
+
+
+def is_not_modified(if_none_match: Optional[str], if_modified_since: Optional[str],
+                    stored: StoredObject) -> bool:
+    """
+    Check whether a conditional GET can be answered with 304 Not Modified.
+    If-Modified-Since is ignored when If-None-Match is sent.
+    :param if_none_match: The If-None-Match header value.
+    :param if_modified_since: The If-Modified-Since header value.
+    :param stored: The stored object metadata.
+    """
+    if if_none_match:
+        etags = [etag.strip() for etag in if_none_match.split(",")]
+        # Weak comparison, as for any GET.
+        return "*" in etags or stored.etag in (etag[2:] if etag.startswith("W/") else etag
+                                               for etag in etags)
+    if if_modified_since:
+        try:
+            return int(stored.mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+class MediaRangeResponse(Response):
+    """
+    Response streaming the whole object or a single byte range of it.
+    The body is handed to the server with the ASGI zero-copy extension
+    (`os.sendfile`) when available, otherwise read from a memory map.
+    """
+
+    def __init__(self, storage_backend: StorageBackend, stored: StoredObject,
+                 byte_range: Optional[Tuple[int, int]] = None,
+                 media_type: Optional[str] = None, headers: Optional[dict] = None):
+        self.storage_backend = storage_backend
+        self.stored = stored
+        if byte_range is None:
+            self.start, self.end = 0, stored.size - 1
+            status_code = 200
+        else:
+            self.start, self.end = byte_range
+            status_code = 206
+        super().__init__(status_code=status_code, headers=headers, media_type=media_type)
+        self.headers["content-length"] = str(self.end - self.start + 1)
+        self.headers["accept-ranges"] = "bytes"
+        self.headers["etag"] = stored.etag
+        self.headers["last-modified"] = stored.last_modified
+        if byte_range is not None:
+            self.headers["content-range"] = f"bytes {self.start}-{self.end}/{stored.size}"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers,
+        })
+        count = self.end - self.start + 1
+        local_path = self.storage_backend.local_path(self.stored.key)
+        if count > 0 and local_path and ZEROCOPY_EXTENSION in scope.get("extensions", {}):
+            with open(local_path, "rb") as file_obj:
+                await send({
+                    "type": ZEROCOPY_EXTENSION,
+                    "file": file_obj,
+                    "offset": self.start,
+                    "count": count,
+                    "more_body": False,
+                })
+            return
+        chunks = self.storage_backend.iter_range(self.stored.key, self.start, self.end)
+        try:
+            async for chunk in iterate_in_threadpool(chunks):
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        finally:
+            chunks.close()
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
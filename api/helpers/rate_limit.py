@@ -0,0 +1,381 @@
+"""This module is the helper for rate limiting and request admission control."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import asyncio
+import json
+import math
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Deque, Dict, List, NamedTuple, Optional, Tuple
+
+from loguru import logger
+from redis.exceptions import RedisError
+
+from api import database
+
+
+KEY_PREFIX = "ratelimit"
+EXEMPT_PREFIXES = ("/admin", "/docs", "/redoc", "/openapi.json")
+IDLE_BUCKET_SECONDS = 300  # full buckets untouched this long are dropped
+
+
+class RateLimit(NamedTuple):
+    """
+    A token bucket limit: `rate` requests per second on average, with
+    bursts of up to `burst` requests.
+    """
+    rate: float
+    burst: float
+
+
+class TokenBucket:
+    """
+    An in-process token bucket. Tokens may go below zero when other
+    processes spent them, which delays this process until they refill.
+    """
+
+    def __init__(self, limit: RateLimit, now: float):
+        self.limit = limit
+        self.tokens = limit.burst
+        self.updated = now
+        self.spent = 0.0  # since the last sync
+        self.seen = 0.0  # cluster total at the last sync
+
+    def refill(self, now: float):
+        """
+        Add the tokens earned since the last update.
+        :param now: The monotonic time in seconds.
+        """
+        self.tokens = min(self.limit.burst, self.tokens + (now - self.updated) * self.limit.rate)
+        self.updated = now
+
+    def take(self, now: float) -> float:
+        """
+        Spend a token. Returns 0 when allowed, else the seconds until a
+        token is available.
+        :param now: The monotonic time in seconds.
+        """
+        self.refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            self.spent += 1
+            return 0.0
+        return (1 - self.tokens) / self.limit.rate
+
+
+def route_limit(path: str, routes: Dict[str, RateLimit]) -> Optional[Tuple[str, RateLimit]]:
+    """
+    Get the limit of the longest route prefix matching a path.
+    :param path: The request path.
+    :param routes: The limit of each route prefix.
+    """
+    matches = [prefix for prefix in routes if path == prefix or path.startswith(prefix.rstrip("/") + "/")]
+    if not matches:
+        return None
+    prefix = max(matches, key=len)
+    return prefix, routes[prefix]
+
+
+class RateLimiter:
+    """
+    Per-user, per-IP and per-route token buckets. Decisions are taken in
+    process; every `sync_interval` the tokens spent here are added to a
+    shared Redis counter per bucket, and the tokens spent by the other
+    processes since the last sync are taken from the local bucket, so the
+    limits hold across the cluster within one sync interval.
+    """
+
+    def __init__(self, user_limit: RateLimit, ip_limit: RateLimit, routes: Dict[str, RateLimit],
+                 sync_interval: float, redis_client=None):
+        self.user_limit = user_limit
+        self.ip_limit = ip_limit
+        self.routes = routes
+        self.sync_interval = sync_interval
+        self.redis = redis_client
+        self.stats = {"allowed": 0, "limited": 0, "syncs": 0, "sync_errors": 0}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def _bucket(self, key: str, limit: RateLimit, now: float) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(limit, now)
+        return bucket
+
+    def check(self, path: str, ip: Optional[str], user_id: Optional[str]) -> float:
+        """
+        Spend a token of every bucket a request falls in. Returns 0 when
+        the request is allowed, else the seconds to wait before retrying.
+        Nothing is spent when any bucket is empty.
+        :param path: The request path.
+        :param ip: The client IP address.
+        :param user_id: The client User ID, if known.
+        """
+        now = time.monotonic()
+        client = f"user:{user_id}" if user_id else f"ip:{ip}"
+        buckets = []
+        if user_id:
+            buckets.append(self._bucket(client, self.user_limit, now))
+        if ip:
+            buckets.append(self._bucket(f"ip:{ip}", self.ip_limit, now))
+        matched = route_limit(path, self.routes)
+        if matched is not None:
+            prefix, limit = matched
+            buckets.append(self._bucket(f"route:{prefix}:{client}", limit, now))
+        for bucket in buckets:
+            bucket.refill(now)
+        wait = max([(1 - bucket.tokens) / bucket.limit.rate for bucket in buckets if bucket.tokens < 1],
+                   default=0.0)
+        if wait:
+            self.stats["limited"] += 1
+            return wait
+        for bucket in buckets:
+            bucket.take(now)
+        self.stats["allowed"] += 1
+        return 0.0
+
+    async def sync(self):
+        """
+        Exchange the tokens spent since the last sync with Redis, and drop
+        idle buckets.
+        """
+        now = time.monotonic()
+        for key in [key for key, bucket in self._buckets.items()
+                    if not bucket.spent and now - bucket.updated > IDLE_BUCKET_SECONDS]:
+            del self._buckets[key]
+        if self.redis is None:
+            return
+        spent = []
+        for key, bucket in self._buckets.items():
+            if bucket.spent:
+                spent.append((key, bucket))
+            else:
+                # What others spent while this process was idle was offset by the
+                # refill meanwhile; count from the next exchange instead.
+                bucket.seen = 0.0
+        if not spent:
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for key, bucket in spent:
+                pipe.incrbyfloat(f"{KEY_PREFIX}:{key}", bucket.spent)
+                # The counter outlives a full refill, after which its history is moot.
+                pipe.expire(f"{KEY_PREFIX}:{key}",
+                            math.ceil(bucket.limit.burst / bucket.limit.rate) + IDLE_BUCKET_SECONDS)
+            results = await pipe.execute()
+        except RedisError as error:
+            logger.warning(f"Rate limit sync failed: {error}")
+            self.stats["sync_errors"] += 1
+            return
+        for (key, bucket), total in zip(spent, results[::2]):
+            total = float(total)
+            if bucket.seen:
+                others = max(0.0, total - bucket.seen - bucket.spent)
+                bucket.tokens = max(-bucket.limit.burst, bucket.tokens - others)
+            bucket.seen = total
+            bucket.spent = 0.0
+        self.stats["syncs"] += 1
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            await self.sync()
+
+    async def start(self):
+        """
+        Start the background sync.
+        """
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Stop the background sync.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self) -> dict:
+        """
+        Get the limiter stats.
+        """
+        return {**self.stats, "buckets": len(self._buckets)}
+
+
+class Overloaded(Exception):
+    """
+    A request was shed by admission control.
+    """
+
+    def __init__(self, retry_after: float):
+        super().__init__(retry_after)
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Global concurrency limit with a bounded wait queue. A request waits
+    for one of `max_concurrency` slots in arrival order; it is shed when
+    `max_queue` requests are already waiting, or when it has waited
+    `queue_target` seconds, so queueing never adds more than the target
+    to latency.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int, queue_target: float):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_target = queue_target
+        self.stats = {"admitted": 0, "shed": 0}
+        self.in_flight = 0
+        self.max_wait = 0.0  # since the last snapshot
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self):
+        """
+        Wait for a slot, raising `Overloaded` when shed.
+        """
+        if self.in_flight < self.max_concurrency and not self._waiters:
+            self.in_flight += 1
+            self.stats["admitted"] += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self.stats["shed"] += 1
+            raise Overloaded(self.queue_target)
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(waiter, self.queue_target)
+        except asyncio.TimeoutError:
+            self.stats["shed"] += 1
+            raise Overloaded(self.queue_target)
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()  # Handed a slot while the client went away.
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            self.max_wait = max(self.max_wait, time.monotonic() - started)
+        self.stats["admitted"] += 1
+
+    def release(self):
+        """
+        Free a slot, handing it to the oldest waiter if any.
+        """
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def snapshot(self) -> dict:
+        """
+        Get the admission stats, resetting the longest wait.
+        """
+        snapshot = {**self.stats, "in_flight": self.in_flight, "waiting": len(self._waiters),
+                    "max_wait": round(self.max_wait, 4)}
+        self.max_wait = 0.0
+        return snapshot
+
+
+def _reject(status_code: int, detail: str, retry_after: float):
+    body = json.dumps({"detail": detail}).encode()
+    headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()),
+               (b"retry-after", str(max(1, math.ceil(retry_after))).encode())]
+    return {"type": "http.response.start", "status": status_code, "headers": headers}, \
+        {"type": "http.response.body", "body": body}
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware answering 429 to clients over their rate limits and
+    503 to requests shed by admission control, both with Retry-After.
+    Admission covers a request until its response starts. Admin and docs
+    paths and WebSocket connections are not limited.
+    """
+
+    def __init__(self, app, user_header: str = "x-user-id"):
+        self.app = app
+        self.user_header = user_header.lower().encode()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(EXEMPT_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+        user_id = dict(scope["headers"]).get(self.user_header)
+        client = scope.get("client")
+        wait = get_rate_limiter().check(scope["path"], client[0] if client else None,
+                                        user_id.decode("latin-1") if user_id else None)
+        if wait:
+            for message in _reject(429, "Too many requests", wait):
+                await send(message)
+            return
+        admission = get_admission_controller()
+        try:
+            await admission.acquire()
+        except Overloaded as overloaded:
+            for message in _reject(503, "Server overloaded", overloaded.retry_after):
+                await send(message)
+            return
+        # The slot is freed once the response starts: the handler's work is
+        # done by then, and streamed bodies (SSE, exports, byte ranges) would
+        # otherwise hold it for as long as the client keeps reading.
+        held = True
+
+        async def send_started(message):
+            nonlocal held
+            if message["type"] == "http.response.start" and held:
+                held = False
+                admission.release()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_started)
+        finally:
+            if held:
+                admission.release()
+
+
+def parse_routes(routes: Dict[str, List[float]]) -> Dict[str, RateLimit]:
+    """
+    Get route limits from settings.
+    :param routes: The `[rate, burst]` of each route prefix.
+    """
+    return {prefix: RateLimit(float(rate), float(burst)) for prefix, (rate, burst) in routes.items()}
+
+
+@lru_cache()
+def get_rate_limiter() -> RateLimiter:
+    """
+    Process wide rate limiter.
+    """
+    settings = database.conf_settings
+    return RateLimiter(
+        user_limit=RateLimit(settings.RATE_LIMIT_USER_RATE, settings.RATE_LIMIT_USER_BURST),
+        ip_limit=RateLimit(settings.RATE_LIMIT_IP_RATE, settings.RATE_LIMIT_IP_BURST),
+        routes=parse_routes(settings.RATE_LIMIT_ROUTES),
+        sync_interval=settings.RATE_LIMIT_SYNC_INTERVAL,
+        redis_client=database.get_async_redis(),
+    )
+
+
+@lru_cache()
+def get_admission_controller() -> AdmissionController:
+    """
+    Process wide admission controller.
+    """
+    settings = database.conf_settings
+    return AdmissionController(max_concurrency=settings.ADMISSION_MAX_CONCURRENCY,
+                               max_queue=settings.ADMISSION_MAX_QUEUE,
+                               queue_target=settings.ADMISSION_QUEUE_TARGET)
@@ -0,0 +1,93 @@
+"""This module is the helper for the rating aggregates stored on media."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+from typing import Dict, Optional
+
+from sqlalchemy import case, func, select, update
+from sqlalchemy.orm import Session
+
+from api.models.media_model import Media
+from api.models.rating_model import Rating
+
+
+HISTOGRAM_COLUMNS = ("rating_count_1", "rating_count_2", "rating_count_3", "rating_count_4", "rating_count_5")
+STATS_COLUMNS = ("rating_count", "rating_sum") + HISTOGRAM_COLUMNS
+
+
+def rating_delta(old: Optional[int], new: Optional[int]) -> Dict[str, int]:
+    """
+    Get the change of each aggregate column when a rating moves from `old`
+    to `new`; None stands for no active rating, before a create or after
+    a soft-delete.
+    :param old: The previous rating.
+    :param new: The new rating.
+    """
+    delta: Dict[str, int] = {}
+    for value, sign in ((old, -1), (new, 1)):
+        if value is not None:
+            delta["rating_count"] = delta.get("rating_count", 0) + sign
+            delta["rating_sum"] = delta.get("rating_sum", 0) + sign * value
+            column = HISTOGRAM_COLUMNS[value - 1]
+            delta[column] = delta.get(column, 0) + sign
+    return {column: change for column, change in delta.items() if change}
+
+
+def change_statement(media_id: int, old: Optional[int], new: Optional[int]):
+    """
+    Get the UPDATE applying a rating change to the aggregates of a media,
+    or None when nothing changes. Columns are incremented in place, so
+    concurrent changes add up without reading the row first.
+    :param media_id: The Media ID.
+    :param old: The previous rating.
+    :param new: The new rating.
+    """
+    delta = rating_delta(old, new)
+    if not delta:
+        return None
+    return update(Media).where(Media.media_id == media_id).values(
+        {column: getattr(Media, column) + change for column, change in delta.items()})
+
+
+def _aggregates(media_id_column) -> Dict[str, object]:
+    active = (Rating.media_id == media_id_column, Rating.deleted_at.is_(None))
+    expressions = {"rating_count": func.count(), "rating_sum": func.sum(Rating.rating)}
+    for value, column in enumerate(HISTOGRAM_COLUMNS, start=1):
+        expressions[column] = func.sum(case((Rating.rating == value, 1), else_=0))
+    return {column: func.coalesce(select(expression).where(*active).scalar_subquery(), 0)
+            for column, expression in expressions.items()}
+
+
+def reconcile(db_session: Session, batch_size: int) -> Dict[str, int]:
+    """
+    Recompute the aggregates of every media from its ratings and rewrite
+    those that drifted, e.g. after ratings were changed outside the API.
+    Media are checked in batches by Media ID, each batch committed on its own.
+    :param db_session: The database session.
+    :param batch_size: The number of media per batch.
+    """
+    summary = {"checked": 0, "fixed": 0}
+    last_id = 0
+    while True:
+        stored = db_session.query(Media.media_id, *(getattr(Media, column) for column in STATS_COLUMNS)).filter(
+            Media.media_id > last_id).order_by(Media.media_id).limit(batch_size).all()
+        if not stored:
+            return summary
+        last_id = stored[-1][0]
+        expected = {row[0]: tuple(row[1:]) for row in db_session.query(
+            Rating.media_id, func.count(), func.sum(Rating.rating),
+            *(func.sum(case((Rating.rating == value, 1), else_=0)) for value in range(1, 6))
+        ).filter(Rating.media_id.in_([row[0] for row in stored]), Rating.deleted_at.is_(None)
+                 ).group_by(Rating.media_id)}
+        drifted = [row[0] for row in stored
+                   if tuple(row[1:]) != tuple(int(value or 0) for value in expected.get(row[0], (0,) * 7))]
+        if drifted:
+            # Recomputed inside the UPDATE so changes made since the read are not lost.
+            db_session.execute(update(Media).where(Media.media_id.in_(drifted))
+                               .values(_aggregates(Media.media_id)).execution_options(synchronize_session=False))
+        db_session.commit()
+        summary["checked"] += len(stored)
+        summary["fixed"] += len(drifted)
@@ -0,0 +1,264 @@
+"""This module is the helper for collaborative-filtering recommendations."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import json
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from api.models.favorite_model import Favorite
+from api.models.play_history_model import PlayHistory
+from api.models.rating_model import Rating
+
+
+NEIGHBOURS_KEY = "recs:neighbours"
+POPULAR_KEY = "recs:popular"
+WATERMARK_KEY = "recs:watermark"
+WRITE_BATCH_SIZE = 1000
+
+# Interaction strength: log1p(plays) + FAVORITE_WEIGHT if favorited
+# + (rating - RATING_OFFSET) for ratings above the offset.
+FAVORITE_WEIGHT = 2.0
+RATING_OFFSET = 2
+
+
+def user_key(user_id: int) -> str:
+    """
+    Get the Redis key of a user's recommendations.
+    :param user_id: The User ID.
+    """
+    return f"recs:user:{user_id}"
+
+
+def load_interactions(db_session: Session, user_ids: Optional[Iterable[int]] = None
+                      ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Load the interaction strength of every (user, media) pair from plays,
+    favorites and ratings. Pairs may repeat, one per source.
+    :param db_session: The database session.
+    :param user_ids: Only load these users, default all.
+    """
+    sources = [
+        (PlayHistory, func.count(), [], np.log1p),
+        (Favorite, func.count(), [Favorite.deleted_at.is_(None)],
+         lambda counts: np.full(len(counts), FAVORITE_WEIGHT)),
+        (Rating, func.max(Rating.rating), [Rating.deleted_at.is_(None), Rating.rating > RATING_OFFSET],
+         lambda ratings: ratings - RATING_OFFSET),
+    ]
+    users, items, strengths = [], [], []
+    for model, value, filters, weight in sources:
+        query = db_session.query(model.user_id, model.media_id, value).filter(*filters)
+        if user_ids is not None:
+            query = query.filter(model.user_id.in_(list(user_ids)))
+        rows = query.group_by(model.user_id, model.media_id).all()
+        if rows:
+            columns = np.asarray(rows, dtype=np.float64).T
+            users.append(columns[0])
+            items.append(columns[1])
+            strengths.append(weight(columns[2]))
+    if not users:
+        return np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0, np.float32)
+    return (np.concatenate(users).astype(np.int64), np.concatenate(items).astype(np.int64),
+            np.concatenate(strengths).astype(np.float32))
+
+
+def current_watermark(db_session: Session) -> Dict[str, str]:
+    """
+    Get the position in the interaction tables to refresh from next time:
+    the last play id, and the database clock for favorites and ratings,
+    which are compared by `updated_at`.
+    :param db_session: The database session.
+    """
+    history_id = db_session.query(func.max(PlayHistory.history_id)).scalar() or 0
+    return {"history_id": str(history_id), "db_time": db_session.query(func.now()).scalar().isoformat()}
+
+
+def changed_users(db_session: Session, watermark: Dict[str, str]) -> Set[int]:
+    """
+    Get the users with plays, favorites or ratings since a watermark.
+    :param db_session: The database session.
+    :param watermark: A watermark from `current_watermark`.
+    """
+    since = datetime.fromisoformat(watermark["db_time"])
+    queries = [
+        db_session.query(PlayHistory.user_id).filter(PlayHistory.history_id > int(watermark["history_id"])),
+        db_session.query(Favorite.user_id).filter(Favorite.updated_at >= since),
+        db_session.query(Rating.user_id).filter(Rating.updated_at >= since),
+    ]
+    return {user_id for query in queries for user_id, in query.distinct()}
+
+
+def interaction_matrix(users: np.ndarray, items: np.ndarray, strengths: np.ndarray
+                       ) -> Tuple[sparse.csr_matrix, np.ndarray, np.ndarray]:
+    """
+    Build the sparse user x item matrix, summing repeated pairs.
+    Returns the matrix and the User IDs and Media IDs of its rows and columns.
+    :param users: The User ID of each interaction.
+    :param items: The Media ID of each interaction.
+    :param strengths: The strength of each interaction.
+    """
+    user_ids, rows = np.unique(users, return_inverse=True)
+    item_ids, columns = np.unique(items, return_inverse=True)
+    matrix = sparse.csr_matrix((strengths, (rows, columns)), shape=(len(user_ids), len(item_ids)),
+                               dtype=np.float32)
+    matrix.sum_duplicates()
+    return matrix, user_ids, item_ids
+
+
+def _top_per_row(block: sparse.csr_matrix, top_n: int, exclude: Optional[sparse.csr_matrix] = None
+                 ) -> List[Tuple[np.ndarray, np.ndarray]]:
+    rows = []
+    for row in range(block.shape[0]):
+        start, end = block.indptr[row], block.indptr[row + 1]
+        columns, scores = block.indices[start:end], block.data[start:end]
+        if exclude is not None:
+            keep = ~np.isin(columns, exclude.indices[exclude.indptr[row]:exclude.indptr[row + 1]])
+            columns, scores = columns[keep], scores[keep]
+        keep = scores > 0
+        columns, scores = columns[keep], scores[keep]
+        if len(scores) > top_n:
+            best = np.argpartition(-scores, top_n - 1)[:top_n]
+            columns, scores = columns[best], scores[best]
+        order = np.argsort(-scores, kind="stable")
+        rows.append((columns[order], scores[order]))
+    return rows
+
+
+def item_neighbours(matrix: sparse.csr_matrix, top_n: int, shrink: float = 10.0,
+                    block_size: int = 2048) -> sparse.csr_matrix:
+    """
+    Get the `top_n` most similar items of every item as a sparse item x item
+    matrix. Similarity is the cosine of the item columns, with `shrink`
+    added to the denominator to damp pairs seen together by few users.
+    Items are processed in blocks so memory follows co-occurrences.
+    :param matrix: The user x item matrix.
+    :param top_n: The number of neighbours kept per item.
+    :param shrink: The similarity shrinkage.
+    :param block_size: The number of items per block.
+    """
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=0)).ravel())
+    transposed = matrix.T.tocsr()
+    rows, columns, scores = [], [], []
+    for start in range(0, matrix.shape[1], block_size):
+        block = (transposed[start:start + block_size] @ matrix).tocsr()
+        block_items = np.repeat(np.arange(start, start + block.shape[0]), np.diff(block.indptr))
+        block.data /= norms[block_items] * norms[block.indices] + shrink
+        block.data[block_items == block.indices] = 0  # An item is not its own neighbour.
+        for offset, (neighbours, similarities) in enumerate(_top_per_row(block, top_n)):
+            rows.append(np.full(len(neighbours), start + offset))
+            columns.append(neighbours)
+            scores.append(similarities)
+    if not rows:
+        return sparse.csr_matrix((matrix.shape[1], matrix.shape[1]), dtype=np.float32)
+    return sparse.csr_matrix((np.concatenate(scores), (np.concatenate(rows), np.concatenate(columns))),
+                             shape=(matrix.shape[1], matrix.shape[1]), dtype=np.float32)
+
+
+def recommend(matrix: sparse.csr_matrix, neighbours: sparse.csr_matrix, top_k: int,
+              block_size: int = 1024) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Score every item for every user as the sum of the similarities of the
+    items the user interacted with, weighted by interaction strength, and
+    keep the `top_k` the user has not interacted with.
+    Returns the column indices and scores of each user row.
+    :param matrix: The user x item matrix.
+    :param neighbours: The item neighbours from `item_neighbours`.
+    :param top_k: The number of recommendations per user.
+    :param block_size: The number of users per block.
+    """
+    results = []
+    for start in range(0, matrix.shape[0], block_size):
+        users = matrix[start:start + block_size]
+        results.extend(_top_per_row((users @ neighbours).tocsr(), top_k, exclude=users))
+    return results
+
+
+def recommend_one(strengths: Dict[int, float], neighbours: Dict[int, List[List]], top_k: int
+                  ) -> List[List]:
+    """
+    Score items for one user as `recommend` does, from stored neighbour
+    lists, for incremental refreshes.
+    :param strengths: The interaction strength of each Media ID of the user.
+    :param neighbours: The `[media_id, similarity]` neighbours of each Media ID.
+    :param top_k: The number of recommendations.
+    """
+    scores: Dict[int, float] = {}
+    for media_id, strength in strengths.items():
+        for neighbour_id, similarity in neighbours.get(media_id, ()):
+            if neighbour_id not in strengths:
+                scores[neighbour_id] = scores.get(neighbour_id, 0.0) + strength * similarity
+    best = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:top_k]
+    return [[media_id, round(score, 6)] for media_id, score in best]
+
+
+def encode(items: List[List]) -> str:
+    """
+    Serialize a recommendation list for the store.
+    :param items: The `[media_id, score]` pairs.
+    """
+    return json.dumps({"generated_at": time.time(), "items": items})
+
+
+class RecommendationStore:
+    """
+    Precomputed recommendations in Redis: one string per user and the
+    neighbour lists of every item in one hash, so reads are a single GET.
+    """
+
+    def __init__(self, redis_client):
+        self.redis = redis_client
+
+    def save_neighbours(self, neighbours: Dict[int, List[List]]):
+        """
+        Replace the stored item neighbours.
+        :param neighbours: The `[media_id, similarity]` neighbours of each Media ID.
+        """
+        staging = f"{NEIGHBOURS_KEY}:staging"
+        self.redis.delete(staging)
+        items = list(neighbours.items())
+        for start in range(0, len(items), WRITE_BATCH_SIZE):
+            self.redis.hset(staging, mapping={media_id: json.dumps(pairs)
+                                              for media_id, pairs in items[start:start + WRITE_BATCH_SIZE]})
+        if items:
+            self.redis.rename(staging, NEIGHBOURS_KEY)
+        else:
+            self.redis.delete(NEIGHBOURS_KEY)
+
+    def load_neighbours(self, media_ids: Iterable[int]) -> Dict[int, List[List]]:
+        """
+        Get the stored neighbours of some items.
+        :param media_ids: The Media IDs.
+        """
+        media_ids = list(media_ids)
+        if not media_ids:
+            return {}
+        values = self.redis.hmget(NEIGHBOURS_KEY, media_ids)
+        return {media_id: json.loads(value) for media_id, value in zip(media_ids, values) if value}
+
+    def save_users(self, recommendations: Dict[int, List[List]]):
+        """
+        Store the recommendations of some users.
+        :param recommendations: The `[media_id, score]` pairs of each User ID.
+        """
+        items = list(recommendations.items())
+        for start in range(0, len(items), WRITE_BATCH_SIZE):
+            pipe = self.redis.pipeline(transaction=False)
+            for user_id, pairs in items[start:start + WRITE_BATCH_SIZE]:
+                pipe.set(user_key(user_id), encode(pairs))
+            pipe.execute()
+
+    def save_popular(self, items: List[List]):
+        """
+        Store the fallback list of users without recommendations.
+        :param items: The `[media_id, score]` pairs.
+        """
+        self.redis.set(POPULAR_KEY, encode(items))
@@ -0,0 +1,97 @@
+"""This module is the helper for routing reads to database replicas."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import itertools
+import threading
+import time
+from typing import List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+
+LATENCY_SMOOTHING = 0.2  # weight of the newest sample in the moving average
+EXPLORE_EVERY = 10  # least_latency falls back to round robin every Nth choice
+
+
+class ReplicaSelector:
+    """
+    Picks the replica engine serving the next read-only session.
+    `round_robin` cycles through the replicas, `least_latency` prefers the
+    replica with the lowest moving average query time.
+    """
+
+    def __init__(self, engines: List[Engine], strategy: str = "round_robin"):
+        if strategy not in ("round_robin", "least_latency"):
+            raise ValueError(f"Unknown replica selection strategy {strategy}")
+        self.engines = engines
+        self.strategy = strategy
+        self.latency_ms = {id(engine): 0.0 for engine in engines}
+        self._lock = threading.Lock()
+        self._cycle = itertools.cycle(engines)
+        self._choices = 0
+        for engine in engines:
+            self._instrument(engine)
+
+    def _instrument(self, engine: Engine):
+        @event.listens_for(engine, "before_cursor_execute")
+        def receive_before(conn, cursor, statement, parameters, context, executemany):
+            conn.info["query_started"] = time.perf_counter()
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def receive_after(conn, cursor, statement, parameters, context, executemany):
+            started = conn.info.pop("query_started", None)
+            if started is not None:
+                sample = (time.perf_counter() - started) * 1000
+                with self._lock:
+                    average = self.latency_ms[id(engine)]
+                    self.latency_ms[id(engine)] = (sample if not average else
+                                                   average + LATENCY_SMOOTHING * (sample - average))
+
+    def choose(self) -> Engine:
+        """
+        Get the replica engine for a new session.
+        """
+        with self._lock:
+            self._choices += 1
+            if self.strategy == "round_robin" or self._choices % EXPLORE_EVERY == 0:
+                return next(self._cycle)
+            return min(self.engines, key=lambda engine: self.latency_ms[id(engine)])
+
+
+class RoutingSession(Session):
+    """
+    Session sending plain SELECTs to a replica and everything else to the
+    primary. Once the session writes it stays on the primary, so it reads
+    its own writes.
+    """
+
+    def __init__(self, primary_engine: Engine, selector: Optional[ReplicaSelector] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.primary_engine = primary_engine
+        self.selector = selector
+        self.pinned = selector is None
+        self._replica = None
+
+    def use_primary(self):
+        """
+        Send every following statement of this session to the primary.
+        """
+        self.pinned = True
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if (self.pinned or self._flushing or not isinstance(clause, Select)
+                or clause._for_update_arg is not None):
+            # Writes, locking reads, raw SQL and flushes go to the primary,
+            # and keep the session there.
+            self.pinned = True
+            return self.primary_engine
+        if self._replica is None:
+            self._replica = self.selector.choose()
+        return self._replica
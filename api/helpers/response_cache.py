@@ -0,0 +1,383 @@
+"""This module is the helper for caching catalog responses."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+from loguru import logger
+from redis.exceptions import RedisError
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from api import database
+
+
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+# Tables whose rows appear in cached responses, and the tag of each id column.
+# Ratings are summed into the cached media.
+CATALOG_TABLES = {"media", "albums", "artists", "genres", "users", "ratings", "favorites", "comments",
+                  "media_artists", "media_albums", "media_genres", "album_artists"}
+TAG_COLUMNS = {"media_id": "media", "album_id": "album", "artist_id": "artist", "genre_id": "genre",
+               "user_id": "user"}
+LIST_TAGS = {"media": "media:list", "albums": "album:list", "artists": "artist:list",
+             "genres": "genre:list",
+             # Expanded media pages embed these links, and media pages the rating,
+             # favorite and comment aggregates.
+             "media_artists": "media:list", "media_albums": "media:list", "media_genres": "media:list",
+             "ratings": "media:list", "favorites": "media:list", "comments": "media:list"}
+
+
+def entity_tags(obj) -> List[str]:
+    """
+    Get the cache tags affected by a change to a catalog row.
+    :param obj: The ORM object.
+    """
+    table_name = getattr(obj, "__tablename__", None)
+    if table_name not in CATALOG_TABLES:
+        return []
+    tags = [f"{prefix}:{getattr(obj, column)}" for column, prefix in TAG_COLUMNS.items()
+            if getattr(obj, column, None) is not None]
+    if table_name in LIST_TAGS:
+        tags.append(LIST_TAGS[table_name])
+    return tags
+
+
+class ResponseCache:
+    """
+    Two tier cache of JSON responses: an in-process LRU with a short TTL in
+    front of Redis. Entries carry tags such as `media:42`; invalidating a
+    tag drops the entries of every worker through Redis pub/sub.
+    Concurrent misses on one key share a single load. For `fill_delay`
+    seconds after a tag is invalidated its entries bypass Redis and are
+    not stored, so a replica still behind the write cannot put the old
+    value back.
+    """
+
+    def __init__(self, local_max_entries: int, local_ttl: float, redis_ttl: int,
+                 redis_client=None, sync_redis_client=None, prefix: str = "cache", fill_delay: float = 0.0):
+        self.local_max_entries = local_max_entries
+        self.local_ttl = local_ttl
+        self.redis_ttl = redis_ttl
+        self.fill_delay = fill_delay
+        self.redis = redis_client
+        self.sync_redis = sync_redis_client
+        self.prefix = prefix
+        self.stats = {
+            "local_hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "evictions": 0,
+            "invalidations": 0,
+        }
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._tag_keys: Dict[str, Set[str]] = {}
+        self._tag_versions: Dict[str, int] = {}
+        self._invalidated_at: Dict[str, float] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._listeners: List[Callable[[List[str]], None]] = []
+        self._task: Optional[asyncio.Task] = None
+        # Tags waiting for the publisher task to invalidate them in Redis.
+        self._outbox: Set[str] = set()
+        self._outbox_ready: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._publisher: Optional[asyncio.Task] = None
+
+    def _get_local(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value, _ = entry
+            if expires_at < time.monotonic():
+                self._drop_local(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _drop_local(self, key: str):
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tag_keys.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_keys[tag]
+
+    def _set_local(self, key: str, value, tags: List[str]):
+        with self._lock:
+            if key in self._entries:
+                self._drop_local(key)
+            self._entries[key] = (time.monotonic() + self.local_ttl, value, tags)
+            for tag in tags:
+                self._tag_keys.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.local_max_entries:
+                self._drop_local(next(iter(self._entries)))
+                self.stats["evictions"] += 1
+
+    def _versions(self, tags: List[str]) -> List[int]:
+        with self._lock:
+            return [self._tag_versions.get(tag, 0) for tag in tags]
+
+    def _settling(self, tags: List[str]) -> bool:
+        if not self.fill_delay:
+            return False
+        since = time.monotonic() - self.fill_delay
+        with self._lock:
+            return any(self._invalidated_at.get(tag, since) > since for tag in tags)
+
+    async def _get_redis(self, key: str):
+        if self.redis is None:
+            return None
+        try:
+            raw = await self.redis.get(f"{self.prefix}:{key}")
+        except RedisError as error:
+            logger.warning(f"Response cache read failed: {error}")
+            return None
+        return None if raw is None else json.loads(raw)
+
+    async def _set_redis(self, key: str, value, tags: List[str]):
+        if self.redis is None:
+            return
+        try:
+            pipe = self.redis.pipeline()
+            pipe.set(f"{self.prefix}:{key}", json.dumps(value), ex=self.redis_ttl)
+            for tag in tags:
+                pipe.sadd(f"{self.prefix}:tag:{tag}", key)
+                pipe.expire(f"{self.prefix}:tag:{tag}", self.redis_ttl)
+            await pipe.execute()
+        except RedisError as error:
+            logger.warning(f"Response cache write failed: {error}")
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]],
+                          tags: Iterable[str]):
+        """
+        Get a cached value, loading and caching it on a miss.
+        A None value is returned but not cached.
+        :param key: The cache key.
+        :param loader: Coroutine function producing the JSON-able value.
+        :param tags: The tags of the entities the value depends on.
+        """
+        value = self._get_local(key)
+        if value is not None:
+            self.stats["local_hits"] += 1
+            return value
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(inflight)
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            tags = list(tags)
+            settling = self._settling(tags)
+            value = None if settling else await self._get_redis(key)
+            if value is not None:
+                self.stats["redis_hits"] += 1
+                self._set_local(key, value, tags)
+            else:
+                self.stats["misses"] += 1
+                versions = self._versions(tags)
+                value = await loader()
+                # Skip caching when a tag was invalidated while loading or just before.
+                if value is not None and not settling and versions == self._versions(tags):
+                    self._set_local(key, value, tags)
+                    await self._set_redis(key, value, tags)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as error:
+            future.set_exception(error)
+            future.exception()  # Retrieved here so an unawaited future does not warn.
+            raise
+        finally:
+            del self._inflight[key]
+
+    def add_listener(self, callback: Callable[[List[str]], None]):
+        """
+        Call `callback` with the tags of every invalidation seen by this process,
+        local or from another worker. It must not block.
+        :param callback: The function receiving the invalidated tags.
+        """
+        self._listeners.append(callback)
+
+    def invalidate_local(self, tags: Iterable[str]):
+        """
+        Drop the entries of this process carrying any of the tags.
+        :param tags: The tags to invalidate.
+        """
+        tags = list(tags)
+        now = time.monotonic()
+        with self._lock:
+            if len(self._invalidated_at) > self.local_max_entries:
+                self._invalidated_at = {tag: at for tag, at in self._invalidated_at.items()
+                                        if at > now - self.fill_delay}
+            for tag in tags:
+                self._tag_versions[tag] = self._tag_versions.get(tag, 0) + 1
+                if self.fill_delay:
+                    self._invalidated_at[tag] = now
+                for key in list(self._tag_keys.get(tag, ())):
+                    if key in self._entries:
+                        self._drop_local(key)
+        for callback in self._listeners:
+            callback(tags)
+
+    def invalidate(self, tags: Iterable[str]):
+        """
+        Drop the entries carrying any of the tags in Redis and every worker.
+        Safe to call from any thread, the event loop included: once started,
+        the Redis round trips are left to the publisher task.
+        :param tags: The tags to invalidate.
+        """
+        tags = sorted(set(tags))
+        if not tags:
+            return
+        self.stats["invalidations"] += len(tags)
+        self.invalidate_local(tags)
+        if self._loop is not None:
+            with self._lock:
+                self._outbox.update(tags)
+            self._loop.call_soon_threadsafe(self._outbox_ready.set)
+        elif self.sync_redis is not None:
+            self._invalidate_redis_sync(tags)
+
+    def _invalidate_redis_sync(self, tags: List[str]):
+        try:
+            tag_keys = [f"{self.prefix}:tag:{tag}" for tag in tags]
+            pipe = self.sync_redis.pipeline()
+            for tag_key in tag_keys:
+                pipe.smembers(tag_key)
+            members = pipe.execute()
+            keys = {f"{self.prefix}:{key.decode()}" for keys in members for key in keys}
+            pipe = self.sync_redis.pipeline()
+            pipe.delete(*tag_keys, *keys)
+            pipe.publish(INVALIDATION_CHANNEL, json.dumps(tags))
+            pipe.execute()
+        except RedisError as error:
+            logger.warning(f"Response cache invalidation failed: {error}")
+
+    async def _invalidate_redis(self, tags: List[str]):
+        try:
+            tag_keys = [f"{self.prefix}:tag:{tag}" for tag in tags]
+            pipe = self.redis.pipeline()
+            for tag_key in tag_keys:
+                pipe.smembers(tag_key)
+            members = await pipe.execute()
+            keys = {f"{self.prefix}:{key.decode()}" for keys in members for key in keys}
+            pipe = self.redis.pipeline()
+            pipe.delete(*tag_keys, *keys)
+            pipe.publish(INVALIDATION_CHANNEL, json.dumps(tags))
+            await pipe.execute()
+        except RedisError as error:
+            logger.warning(f"Response cache invalidation failed: {error}")
+
+    async def _publish_outbox(self):
+        with self._lock:
+            tags, self._outbox = sorted(self._outbox), set()
+        if tags:
+            await self._invalidate_redis(tags)
+
+    async def _publish(self):
+        while True:
+            await self._outbox_ready.wait()
+            self._outbox_ready.clear()
+            await self._publish_outbox()
+
+    async def _listen(self):
+        while True:
+            try:
+                pubsub = self.redis.pubsub()
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self.invalidate_local(json.loads(message["data"]))
+            except RedisError as error:
+                logger.warning(f"Response cache invalidation listener failed: {error}")
+                # Entries may have missed invalidations while disconnected.
+                with self._lock:
+                    self._entries.clear()
+                    self._tag_keys.clear()
+                await asyncio.sleep(1)
+
+    async def start(self):
+        """
+        Start listening for invalidations of other workers.
+        """
+        if self.redis is not None:
+            self._task = asyncio.create_task(self._listen())
+            self._outbox_ready = asyncio.Event()
+            self._loop = asyncio.get_running_loop()
+            self._publisher = asyncio.create_task(self._publish())
+
+    async def stop(self):
+        """
+        Stop listening for invalidations and publish the pending ones.
+        """
+        for task in (self._task, self._publisher):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = self._publisher = self._loop = None
+        await self._publish_outbox()
+
+    def snapshot(self) -> dict:
+        """
+        Get the cache counters.
+        """
+        with self._lock:
+            return {**self.stats, "local_entries": len(self._entries)}
+
+
+def install_invalidation_hooks(cache: ResponseCache):
+    """
+    Invalidate the tags of catalog rows written by any session on commit.
+    :param cache: The response cache.
+    """
+    @event.listens_for(Session, "after_flush")
+    def collect_tags(session, flush_context):
+        tags = session.info.setdefault("cache_tags", set())
+        for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+            tags.update(entity_tags(obj))
+
+    @event.listens_for(Session, "after_commit")
+    def invalidate_tags(session):
+        tags = session.info.pop("cache_tags", None)
+        if tags:
+            cache.invalidate(tags)
+
+    @event.listens_for(Session, "after_rollback")
+    def discard_tags(session):
+        session.info.pop("cache_tags", None)
+
+
+@lru_cache()
+def get_response_cache() -> ResponseCache:
+    """
+    Process wide response cache.
+    """
+    settings = database.conf_settings
+    redis_client = sync_redis_client = None
+    if settings.RESPONSE_CACHE_REDIS:
+        redis_client = database.get_async_redis()
+        sync_redis_client = database.get_redis()
+    return ResponseCache(local_max_entries=settings.RESPONSE_CACHE_LOCAL_MAX_ENTRIES,
+                         local_ttl=settings.RESPONSE_CACHE_LOCAL_TTL,
+                         redis_ttl=settings.RESPONSE_CACHE_REDIS_TTL,
+                         redis_client=redis_client, sync_redis_client=sync_redis_client,
+                         fill_delay=settings.RESPONSE_CACHE_FILL_DELAY)
@@ -0,0 +1,429 @@
+"""This module is the helper for full-text search of the media catalog."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import asyncio
+import bisect
+import heapq
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from api import database
+from api.helpers import response_cache
+from api.models.album_model import Album
+from api.models.artist_model import Artist
+from api.models.genre_model import Genre
+from api.models.media_album_model import MediaAlbum
+from api.models.media_artist_model import MediaArtist
+from api.models.media_genre_model import MediaGenre
+from api.models.media_model import Media
+
+
+TOKEN_PATTERN = re.compile(r"\w+")
+FIELD_WEIGHTS = {"title": 3.0, "artists": 2.0, "albums": 1.5, "genres": 1.0}
+BM25_K1 = 1.2
+BM25_B = 0.75
+MIN_PREFIX_LENGTH = 2
+MAX_PREFIX_SCAN = 5000  # index terms inspected for one prefix
+MAX_EXPANSIONS = 16  # index terms one prefix or misspelled token may match
+PREFIX_WEIGHT = 0.8
+FUZZY_WEIGHT = 0.6
+FUZZY_MIN_SIMILARITY = 0.4
+MAX_FULL_SCAN = 50000  # longer posting lists only rescore candidates of rarer tokens
+LOAD_CHUNK_SIZE = 1000
+
+# Catalog tags whose change affects the indexed documents, and the join table
+# linking the tagged entity to its media.
+LINK_TABLES = {"artist": MediaArtist.artist_id, "album": MediaAlbum.album_id,
+               "genre": MediaGenre.genre_id}
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase tokens without accents.
+    :param text: The text.
+    """
+    text = unicodedata.normalize("NFKD", text.lower())
+    return TOKEN_PATTERN.findall("".join(char for char in text if not unicodedata.combining(char)))
+
+
+def trigrams(term: str) -> Set[str]:
+    """
+    Get the character trigrams of a term padded with `$`.
+    :param term: The index term.
+    """
+    padded = f"${term}$"
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+class InvertedIndex:
+    """
+    BM25 ranked inverted index of media documents. A query token matches
+    index terms exactly, by prefix when it is the last token being typed,
+    and by trigram similarity when it matches nothing else. Scores are
+    boosted by `log(1 + view_count)`.
+    """
+
+    def __init__(self, view_count_boost: float = 0.1):
+        self.view_count_boost = view_count_boost
+        self.postings: Dict[str, Dict[int, float]] = {}
+        self.terms: List[str] = []  # sorted, for prefix lookups
+        self.trigram_terms: Dict[str, Set[str]] = {}
+        # doc_id -> (terms, length, view_count, stored fields)
+        self.documents: Dict[int, tuple] = {}
+        self.total_length = 0.0
+        self._loading = False  # terms are sorted once a load ends
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def _add_term(self, term: str):
+        if self._loading:
+            self.terms.append(term)
+        else:
+            bisect.insort(self.terms, term)
+        for gram in trigrams(term):
+            self.trigram_terms.setdefault(gram, set()).add(term)
+
+    def _remove_term(self, term: str):
+        if self._loading:
+            self.terms.remove(term)
+        else:
+            del self.terms[bisect.bisect_left(self.terms, term)]
+        for gram in trigrams(term):
+            terms = self.trigram_terms[gram]
+            terms.discard(term)
+            if not terms:
+                del self.trigram_terms[gram]
+
+    def _remove(self, doc_id: int):
+        document = self.documents.pop(doc_id, None)
+        if document is None:
+            return
+        terms, length, _, _ = document
+        self.total_length -= length
+        for term in terms:
+            postings = self.postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self.postings[term]
+                self._remove_term(term)
+
+    def upsert(self, doc_id: int, fields: Dict[str, Iterable[str]], view_count: Optional[int],
+               stored: dict):
+        """
+        Add a document, replacing the previous version of it.
+        :param doc_id: The document ID.
+        :param fields: The indexed text by field name of `FIELD_WEIGHTS`.
+        :param view_count: The popularity of the document.
+        :param stored: The fields returned with a hit.
+        """
+        frequencies: Dict[str, float] = {}
+        for field, values in fields.items():
+            for value in values:
+                for token in tokenize(value):
+                    frequencies[token] = frequencies.get(token, 0.0) + FIELD_WEIGHTS[field]
+        with self._lock:
+            self._remove(doc_id)
+            for term, frequency in frequencies.items():
+                postings = self.postings.get(term)
+                if postings is None:
+                    postings = self.postings[term] = {}
+                    self._add_term(term)
+                postings[doc_id] = frequency
+            length = sum(frequencies.values())
+            self.documents[doc_id] = (tuple(frequencies), length, view_count or 0, stored)
+            self.total_length += length
+
+    def load(self, documents: Iterable[tuple]):
+        """
+        Add many documents, sorting the new terms once at the end instead
+        of inserting them one by one.
+        :param documents: The `upsert` arguments of each document.
+        """
+        with self._lock:
+            self._loading = True
+            try:
+                for document in documents:
+                    self.upsert(*document)
+            finally:
+                self._loading = False
+                self.terms.sort()
+
+    def remove(self, doc_id: int):
+        """
+        Remove a document.
+        :param doc_id: The document ID.
+        """
+        with self._lock:
+            self._remove(doc_id)
+
+    def _expand(self, token: str, prefix: bool) -> List[Tuple[str, float]]:
+        expansions = [(token, 1.0)] if token in self.postings else []
+        if prefix and len(token) >= MIN_PREFIX_LENGTH:
+            start = bisect.bisect_left(self.terms, token)
+            candidates = []
+            for term in self.terms[start:start + MAX_PREFIX_SCAN]:
+                if not term.startswith(token):
+                    break
+                if term != token:
+                    candidates.append(term)
+            most_frequent = heapq.nlargest(MAX_EXPANSIONS, candidates,
+                                           key=lambda term: len(self.postings[term]))
+            expansions += [(term, PREFIX_WEIGHT) for term in most_frequent]
+        if not expansions and len(token) >= 3:
+            grams = trigrams(token)
+            shared = Counter(term for gram in grams for term in self.trigram_terms.get(gram, ()))
+            similar = []
+            for term, count in shared.most_common(MAX_EXPANSIONS * 4):
+                similarity = count / (len(grams) + len(trigrams(term)) - count)
+                if similarity >= FUZZY_MIN_SIMILARITY:
+                    similar.append((term, FUZZY_WEIGHT * similarity))
+            expansions += heapq.nlargest(MAX_EXPANSIONS, similar, key=lambda expansion: expansion[1])
+        return expansions
+
+    def search(self, query: str, limit: int = 20) -> List[Tuple[float, dict]]:
+        """
+        Get the best matching documents as (score, stored fields) pairs.
+        :param query: The query text.
+        :param limit: The number of hits.
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+        with self._lock:
+            count = len(self.documents)
+            if not count:
+                return []
+            average_length = self.total_length / count
+            expanded = [self._expand(token, prefix=index == len(tokens) - 1)
+                        for index, token in enumerate(tokens)]
+            # Rare tokens first, so common ones only rescore their candidates.
+            expanded.sort(key=lambda expansions: sum(len(self.postings[term]) for term, _ in expansions))
+            scores: Dict[int, float] = {}
+            matched: Dict[int, int] = {}
+            for expansions in expanded:
+                token_scores: Dict[int, float] = {}
+                for term, weight in expansions:
+                    postings = self.postings[term]
+                    idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                    if scores and len(postings) > MAX_FULL_SCAN:
+                        candidates = ((doc_id, postings[doc_id]) for doc_id in scores if doc_id in postings)
+                    else:
+                        candidates = postings.items()
+                    for doc_id, frequency in candidates:
+                        length = self.documents[doc_id][1]
+                        score = weight * idf * frequency * (BM25_K1 + 1) / (
+                            frequency + BM25_K1 * (1 - BM25_B + BM25_B * length / average_length))
+                        if score > token_scores.get(doc_id, 0.0):
+                            token_scores[doc_id] = score
+                for doc_id, score in token_scores.items():
+                    scores[doc_id] = scores.get(doc_id, 0.0) + score
+                    matched[doc_id] = matched.get(doc_id, 0) + 1
+
+            def ranked(doc_id: int) -> float:
+                view_count = self.documents[doc_id][2]
+                return (scores[doc_id] * matched[doc_id] / len(tokens)
+                        * (1 + self.view_count_boost * math.log1p(view_count)))
+
+            return [(ranked(doc_id), self.documents[doc_id][3])
+                    for doc_id in heapq.nlargest(limit, scores, key=ranked)]
+
+    def snapshot(self) -> dict:
+        """
+        Get the index size.
+        """
+        with self._lock:
+            return {"documents": len(self.documents), "terms": len(self.terms)}
+
+
+class SearchIndex:
+    """
+    Media search index of this process. It is built from the database in the
+    background at startup and kept current by reloading the media behind the
+    catalog tags invalidated in the response cache, which covers writes of
+    this process and of every other worker.
+    """
+
+    def __init__(self, refresh_interval: float, view_count_boost: float,
+                 session_factory: Callable[[], Session]):
+        self.refresh_interval = refresh_interval
+        self.view_count_boost = view_count_boost
+        self.session_factory = session_factory
+        self.index = InvertedIndex(view_count_boost)
+        self.ready = False
+        self._pending: Set[str] = set()
+        self._pending_lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def search(self, query: str, limit: int = 20) -> List[Tuple[float, dict]]:
+        """
+        Get the best matching media as (score, stored fields) pairs.
+        :param query: The query text.
+        :param limit: The number of hits.
+        """
+        return self.index.search(query, limit)
+
+    def notify(self, tags: List[str]):
+        """
+        Queue the media behind invalidated catalog tags for reindexing.
+        :param tags: The invalidated cache tags.
+        """
+        tags = [tag for tag in tags
+                if tag.split(":")[0] in ("media", *LINK_TABLES) and not tag.endswith(":list")]
+        if tags:
+            with self._pending_lock:
+                self._pending.update(tags)
+
+    def _documents(self, db_session: Session, media_rows: List) -> Iterable[tuple]:
+        names = {row.media_id: {"artists": [], "albums": [], "genres": []} for row in media_rows}
+        statements = (
+            ("artists", select(MediaArtist.media_id, Artist.artist_name)
+             .join(Artist, Artist.artist_id == MediaArtist.artist_id)
+             .where(MediaArtist.media_id.in_(names), Artist.deleted_at.is_(None))),
+            ("albums", select(MediaAlbum.media_id, Album.album_title)
+             .join(Album, Album.album_id == MediaAlbum.album_id)
+             .where(MediaAlbum.media_id.in_(names), Album.deleted_at.is_(None))),
+            ("genres", select(MediaGenre.media_id, Genre.genre_name)
+             .join(Genre, Genre.genre_id == MediaGenre.genre_id)
+             .where(MediaGenre.media_id.in_(names), Genre.deleted_at.is_(None))),
+        )
+        for field, statement in statements:
+            for media_id, name in db_session.execute(statement):
+                names[media_id][field].append(name)
+        for row in media_rows:
+            fields = names[row.media_id]
+            stored = {"media_id": row.media_id, "media_title": row.media_title,
+                      "artists": fields["artists"]}
+            yield row.media_id, {"title": [row.media_title], **fields}, row.view_count, stored
+
+    def _all_documents(self, db_session: Session) -> Iterable[tuple]:
+        last_id = 0
+        while True:
+            rows = db_session.execute(
+                select(Media.media_id, Media.media_title, Media.view_count)
+                .where(Media.deleted_at.is_(None), Media.media_id > last_id)
+                .order_by(Media.media_id).limit(LOAD_CHUNK_SIZE)
+            ).all()
+            if not rows:
+                return
+            yield from self._documents(db_session, rows)
+            last_id = rows[-1].media_id
+
+    def _build(self) -> InvertedIndex:
+        index = InvertedIndex(self.view_count_boost)
+        db_session = self.session_factory()
+        try:
+            index.load(self._all_documents(db_session))
+            return index
+        finally:
+            db_session.close()
+
+    def _refresh(self, tags: Set[str]):
+        db_session = self.session_factory()
+        try:
+            media_ids = set()
+            linked: Dict[str, List[int]] = {}
+            for tag in tags:
+                kind, entity_id = tag.split(":", 1)
+                if kind == "media":
+                    media_ids.add(int(entity_id))
+                else:
+                    linked.setdefault(kind, []).append(int(entity_id))
+            for kind, entity_ids in linked.items():
+                column = LINK_TABLES[kind]
+                media_ids.update(db_session.execute(
+                    select(column.class_.media_id).where(column.in_(entity_ids))).scalars())
+            media_ids = sorted(media_ids)
+            for offset in range(0, len(media_ids), LOAD_CHUNK_SIZE):
+                chunk = media_ids[offset:offset + LOAD_CHUNK_SIZE]
+                rows = db_session.execute(
+                    select(Media.media_id, Media.media_title, Media.view_count)
+                    .where(Media.media_id.in_(chunk), Media.deleted_at.is_(None))
+                ).all()
+                for media_id in set(chunk) - {row.media_id for row in rows}:
+                    self.index.remove(media_id)
+                for document in self._documents(db_session, rows):
+                    self.index.upsert(*document)
+        finally:
+            db_session.close()
+
+    async def refresh(self):
+        """
+        Reindex the media queued by `notify`.
+        """
+        with self._pending_lock:
+            tags, self._pending = self._pending, set()
+        if not tags:
+            return
+        try:
+            await run_in_threadpool(self._refresh, tags)
+        except Exception:
+            logger.exception(f"Failed to refresh the search index for {len(tags)} tags")
+            with self._pending_lock:
+                self._pending.update(tags)
+
+    async def _run(self):
+        while not self.ready:
+            try:
+                self.index = await run_in_threadpool(self._build)
+                self.ready = True
+            except Exception:
+                logger.exception("Failed to build the search index")
+                await asyncio.sleep(self.refresh_interval)
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            await self.refresh()
+
+    async def start(self):
+        """
+        Build the index and start applying catalog changes, in the background.
+        """
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Stop the background refresh.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self) -> dict:
+        """
+        Get the index size and state.
+        """
+        with self._pending_lock:
+            pending = len(self._pending)
+        return {**self.index.snapshot(), "ready": self.ready, "pending": pending}
+
+
+@lru_cache()
+def get_search_index() -> SearchIndex:
+    """
+    Process wide media search index.
+    """
+    settings = database.conf_settings
+    index = SearchIndex(refresh_interval=settings.SEARCH_INDEX_REFRESH_INTERVAL,
+                        view_count_boost=settings.SEARCH_VIEW_COUNT_BOOST,
+                        session_factory=database.SessionLocal)
+    response_cache.get_response_cache().add_listener(index.notify)
+    return index
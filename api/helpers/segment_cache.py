@@ -0,0 +1,280 @@
+"""This module is the helper for caching HLS playlists and segments in the API process."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import asyncio
+import hashlib
+import itertools
+import mmap
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+from starlette.concurrency import run_in_threadpool
+
+from api import database
+from api.helpers.storage import StorageBackend, StoredObject
+
+
+LFU_SAMPLE_SIZE = 16  # least recently used entries compared by hit count on eviction
+PLAYLIST_CACHE_CONTROL = "public, max-age=5"
+SEGMENT_CACHE_CONTROL = "public, max-age=86400"
+
+
+def cache_control(key: str) -> str:
+    """
+    Get the Cache-Control header of an HLS object: playlists change when the
+    media is packaged again, segments are only replaced along with them.
+    :param key: The object key.
+    """
+    return PLAYLIST_CACHE_CONTROL if key.endswith(".m3u8") else SEGMENT_CACHE_CONTROL
+
+
+class CachedObject:
+    """
+    Bytes of one stored object and the metadata they were read with.
+    """
+    __slots__ = ("stored", "data", "hits", "checked_at")
+
+    def __init__(self, stored: StoredObject, data: bytes):
+        self.stored = stored
+        self.data = data
+        self.hits = 0
+        self.checked_at = time.monotonic()
+
+
+class SegmentCache:
+    """
+    Read-through cache of small stored objects, meant for HLS playlists and
+    segments that every listener of a release fetches, and image variants.
+    Objects are held in memory up to `max_bytes`; evicted ones are written
+    to `disk_dir`, when set, up to `disk_max_bytes` and read back through a
+    memory map. The `lfu` policy evicts the least hit of the
+    `LFU_SAMPLE_SIZE` least recently used entries, so a burst of one-off
+    reads does not flush popular segments. Entries older than
+    `revalidate_after` seconds are checked against the storage metadata
+    before being served. Concurrent misses on one key share a single
+    storage read.
+    """
+
+    def __init__(self, max_bytes: int, max_object_bytes: int, revalidate_after: float,
+                 policy: str = "lru", disk_dir: Optional[str] = None, disk_max_bytes: int = 0):
+        if policy not in ("lru", "lfu"):
+            raise ValueError(f"Unknown segment cache policy: {policy}")
+        self.max_bytes = max_bytes
+        self.max_object_bytes = max_object_bytes
+        self.revalidate_after = revalidate_after
+        self.policy = policy
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes if disk_dir else 0
+        self.stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "bypassed": 0,
+            "evictions": 0,
+            "spilled": 0,
+            "bytes_served": 0,
+        }
+        self.memory_bytes = 0
+        self.disk_bytes = 0
+        self._memory: "OrderedDict[str, CachedObject]" = OrderedDict()
+        self._disk: "OrderedDict[str, Tuple[str, StoredObject]]" = OrderedDict()
+        self._disk_lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            # Files spilled by a previous run are not indexed; remove them.
+            for name in os.listdir(self.disk_dir):
+                if len(name.split(".")[0]) == 40:
+                    os.remove(os.path.join(self.disk_dir, name))
+
+    async def fetch(self, storage_backend: StorageBackend, key: str) -> Tuple[StoredObject, Optional[bytes]]:
+        """
+        Get the metadata and bytes of an object, reading it on a miss.
+        The bytes are None for objects over `max_object_bytes`, which the
+        caller streams from storage instead.
+        :param storage_backend: The storage backend holding the object.
+        :param key: The object key.
+        """
+        entry = self._memory.get(key)
+        if entry is not None and time.monotonic() - entry.checked_at < self.revalidate_after:
+            self._memory.move_to_end(key)
+            entry.hits += 1
+            self.stats["memory_hits"] += 1
+            return entry.stored, entry.data
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(inflight)
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._load(storage_backend, key)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as error:
+            future.set_exception(error)
+            future.exception()  # Retrieved here so an unawaited future does not warn.
+            raise
+        finally:
+            del self._inflight[key]
+
+    def record_served(self, size: int):
+        """
+        Count bytes sent to a client, excluding 304 responses.
+        :param size: The body size.
+        """
+        self.stats["bytes_served"] += size
+
+    async def _load(self, storage_backend: StorageBackend, key: str) -> Tuple[StoredObject, Optional[bytes]]:
+        stored = await run_in_threadpool(storage_backend.stat, key)
+        entry = self._memory.get(key)
+        if entry is not None and entry.stored == stored:
+            entry.checked_at = time.monotonic()
+            entry.hits += 1
+            self._memory.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            return stored, entry.data
+        if stored.size > self.max_object_bytes:
+            self._drop(key)
+            self.stats["bypassed"] += 1
+            return stored, None
+        data = await run_in_threadpool(self._read_disk, stored) if self.disk_dir else None
+        if data is not None:
+            self.stats["disk_hits"] += 1
+        else:
+            self.stats["misses"] += 1
+            data = await run_in_threadpool(self._read_storage, storage_backend, stored)
+        evicted = self._insert(key, CachedObject(stored, data))
+        if evicted and self.disk_dir:
+            try:
+                await run_in_threadpool(self._spill, evicted)
+            except OSError as error:
+                logger.warning(f"Segment cache spill failed: {error}")
+        return stored, data
+
+    @staticmethod
+    def _read_storage(storage_backend: StorageBackend, stored: StoredObject) -> bytes:
+        return b"".join(storage_backend.iter_range(stored.key, 0, stored.size - 1))
+
+    def _drop(self, key: str):
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self.memory_bytes -= len(entry.data)
+
+    def _insert(self, key: str, entry: CachedObject) -> List[Tuple[str, CachedObject]]:
+        self._drop(key)
+        self._memory[key] = entry
+        self.memory_bytes += len(entry.data)
+        evicted = []
+        while self.memory_bytes > self.max_bytes and self._memory:
+            if self.policy == "lfu":
+                victim = min(itertools.islice(self._memory.items(), LFU_SAMPLE_SIZE),
+                             key=lambda item: item[1].hits)[0]
+            else:
+                victim = next(iter(self._memory))
+            evicted.append((victim, self._memory[victim]))
+            self._drop(victim)
+            self.stats["evictions"] += 1
+        return evicted
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, hashlib.sha1(key.encode()).hexdigest())
+
+    def _read_disk(self, stored: StoredObject) -> Optional[bytes]:
+        with self._disk_lock:
+            item = self._disk.get(stored.key)
+            if item is None:
+                return None
+            if item[1] != stored:
+                self._unlink_disk(stored.key)
+                return None
+            self._disk.move_to_end(stored.key)
+        if stored.size == 0:
+            return b""
+        try:
+            with open(item[0], "rb") as file_obj:
+                with mmap.mmap(file_obj.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return mapped[:]
+        except OSError:
+            with self._disk_lock:
+                if self._disk.get(stored.key) is item:
+                    self._unlink_disk(stored.key)
+            return None
+
+    def _unlink_disk(self, key: str):
+        path, stored = self._disk.pop(key)
+        self.disk_bytes -= stored.size
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _spill(self, evicted: List[Tuple[str, CachedObject]]):
+        for key, entry in evicted:
+            if entry.stored.size > self.disk_max_bytes:
+                continue
+            with self._disk_lock:
+                item = self._disk.get(key)
+                if item is not None and item[1] == entry.stored:
+                    continue  # Still on disk from an earlier eviction.
+            path = self._disk_path(key)
+            temporary_path = f"{path}.{uuid.uuid4().hex}.tmp"
+            with open(temporary_path, "wb") as file_obj:
+                file_obj.write(entry.data)
+            os.replace(temporary_path, path)
+            with self._disk_lock:
+                if key in self._disk:
+                    self.disk_bytes -= self._disk.pop(key)[1].size
+                self._disk[key] = (path, entry.stored)
+                self.disk_bytes += entry.stored.size
+                self.stats["spilled"] += 1
+                while self.disk_bytes > self.disk_max_bytes:
+                    self._unlink_disk(next(iter(self._disk)))
+
+    def clear(self):
+        """
+        Drop every entry, removing the spilled files.
+        """
+        self._memory.clear()
+        self.memory_bytes = 0
+        with self._disk_lock:
+            while self._disk:
+                self._unlink_disk(next(iter(self._disk)))
+
+    def snapshot(self) -> dict:
+        """
+        Get the cache counters, sizes and hit ratio.
+        """
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"] + self.stats["coalesced"]
+        lookups = hits + self.stats["misses"] + self.stats["bypassed"]
+        return {**self.stats, "hit_ratio": hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory), "memory_bytes": self.memory_bytes,
+                "disk_entries": len(self._disk), "disk_bytes": self.disk_bytes}
+
+
+@lru_cache()
+def get_segment_cache() -> SegmentCache:
+    """
+    Process wide segment cache.
+    """
+    settings = database.conf_settings
+    return SegmentCache(max_bytes=settings.SEGMENT_CACHE_MAX_BYTES,
+                        max_object_bytes=settings.SEGMENT_CACHE_MAX_OBJECT_BYTES,
+                        revalidate_after=settings.SEGMENT_CACHE_REVALIDATE_AFTER,
+                        policy=settings.SEGMENT_CACHE_POLICY,
+                        disk_dir=settings.SEGMENT_CACHE_DISK_DIR,
+                        disk_max_bytes=settings.SEGMENT_CACHE_DISK_MAX_BYTES)
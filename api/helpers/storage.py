@@ -0,0 +1,157 @@
+"""This module is the helper for media storage backends."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import mmap
+import os
+import shutil
+import uuid
+from email.utils import formatdate
+from functools import lru_cache
+from typing import Iterator, NamedTuple, Optional
+
+from api import database
+
+
+CHUNK_SIZE = 256 * 1024  # bytes
+
+
+class StoredObject(NamedTuple):
+    """
+    Metadata of an object held by a storage backend.
+    """
+    key: str
+    size: int
+    mtime: float
+
+    @property
+    def etag(self) -> str:
+        """
+        Strong validator derived from the size and modification time.
+        """
+        return '"{:x}-{:x}"'.format(int(self.mtime * 1000000), self.size)
+
+    @property
+    def last_modified(self) -> str:
+        """
+        HTTP-date of the last modification.
+        """
+        return formatdate(self.mtime, usegmt=True)
+
+
+class StorageBackend:
+    """
+    Base class for media storage backends.
+    """
+
+    def stat(self, key: str) -> StoredObject:
+        """
+        Get the object metadata.
+        :param key: The object key, e.g. `Media.s3_media_path`.
+        """
+        raise NotImplementedError
+
+    def local_path(self, key: str) -> Optional[str]:
+        """
+        Get the filesystem path of the object, if it has one.
+        :param key: The object key.
+        """
+        return None
+
+    def iter_range(self, key: str, start: int, end: int,
+                   chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Iterate over the bytes `start` to `end` (inclusive) of the object.
+        :param key: The object key.
+        :param start: The first byte offset.
+        :param end: The last byte offset.
+        :param chunk_size: The maximum size of each chunk.
+        """
+        raise NotImplementedError
+
+    def put_file(self, key: str, path: str):
+        """
+        Store a local file as the object, replacing any previous version.
+        :param key: The object key.
+        :param path: The path of the file to upload.
+        """
+        raise NotImplementedError
+
+    def put_bytes(self, key: str, data: bytes):
+        """
+        Store bytes as the object, replacing any previous version.
+        :param key: The object key.
+        :param data: The object content.
+        """
+        raise NotImplementedError
+
+
+class LocalStorageBackend(StorageBackend):
+    """
+    Storage backend reading objects from a local directory.
+    """
+
+    def __init__(self, root: str):
+        self.root = os.path.realpath(root)
+
+    def _resolve(self, key: str) -> str:
+        path = os.path.realpath(os.path.join(self.root, key.lstrip("/")))
+        if not path.startswith(self.root + os.sep):
+            raise FileNotFoundError(key)
+        return path
+
+    def stat(self, key: str) -> StoredObject:
+        stat_result = os.stat(self._resolve(key))
+        return StoredObject(key=key, size=stat_result.st_size, mtime=stat_result.st_mtime)
+
+    def local_path(self, key: str) -> Optional[str]:
+        return self._resolve(key)
+
+    def iter_range(self, key: str, start: int, end: int,
+                   chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        # Slicing the memory map only pages in the requested window, so a
+        # seek near the end of a long video never reads the bytes before it.
+        with open(self._resolve(key), "rb") as file_obj:
+            if end < start:
+                return
+            with mmap.mmap(file_obj.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                position = start
+                while position <= end:
+                    next_position = min(position + chunk_size, end + 1)
+                    yield mapped[position:next_position]
+                    position = next_position
+
+    def _write_path(self, key: str) -> str:
+        path = self._resolve(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Written beside the target and renamed, so readers never see a partial object.
+        return f"{path}.{uuid.uuid4().hex}.tmp"
+
+    def put_file(self, key: str, path: str):
+        temporary_path = self._write_path(key)
+        shutil.copyfile(path, temporary_path)
+        os.replace(temporary_path, self._resolve(key))
+
+    def put_bytes(self, key: str, data: bytes):
+        temporary_path = self._write_path(key)
+        with open(temporary_path, "wb") as file_obj:
+            file_obj.write(data)
+        os.replace(temporary_path, self._resolve(key))
+
+
+STORAGE_BACKENDS = {
+    "local": LocalStorageBackend,
+}
+
+
+@lru_cache()
+def get_storage() -> StorageBackend:
+    """
+    Storage backend dependency configured by `MEDIA_STORAGE_BACKEND`.
+    """
+    settings = database.conf_settings
+    backend_class = STORAGE_BACKENDS[settings.MEDIA_STORAGE_BACKEND]
+    return backend_class(settings.MEDIA_STORAGE_ROOT)
@@ -0,0 +1,333 @@
+"""This module is the helper for approximate nearest-neighbour search over media embeddings."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import argparse
+import json
+import os
+import shutil
+import threading
+import time
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from api import database
+
+
+CURRENT_FILE = "CURRENT"
+KEEP_VERSIONS = 2
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLE_PER_LIST = 64  # training vectors per list
+ASSIGN_BATCH_SIZE = 65536
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """
+    Scale rows to unit length, so dot products are cosine similarities.
+    :param vectors: The float32 rows.
+    """
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return (vectors / np.maximum(norms, 1e-12)).astype(np.float32)
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    return np.concatenate([np.argmax(vectors[start:start + ASSIGN_BATCH_SIZE] @ centroids.T, axis=1)
+                           for start in range(0, len(vectors), ASSIGN_BATCH_SIZE)])
+
+
+def kmeans(vectors: np.ndarray, clusters: int, iterations: int = KMEANS_ITERATIONS,
+           seed: int = 0) -> np.ndarray:
+    """
+    Spherical k-means on a sample of unit vectors.
+    :param vectors: The unit vectors.
+    :param clusters: The number of centroids.
+    :param iterations: The number of Lloyd iterations.
+    :param seed: The random seed.
+    """
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(vectors), clusters * KMEANS_SAMPLE_PER_LIST)
+    sample = vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))]
+    centroids = sample[rng.choice(sample_size, clusters, replace=False)].copy()
+    for _ in range(iterations):
+        labels = _assign(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, sample)
+        empty = np.bincount(labels, minlength=clusters) == 0
+        # Empty lists restart from random sample vectors.
+        sums[empty] = sample[rng.choice(sample_size, int(empty.sum()))]
+        centroids = normalize(sums)
+    return centroids
+
+
+class IVFIndex:
+    """
+    Inverted file index of unit vectors: vectors are clustered around
+    `nlist` centroids and stored grouped by cluster, so a query scores the
+    centroids, then only the vectors of the `nprobe` closest clusters.
+    Raising `nprobe` trades latency for recall; `nprobe == nlist` is exact.
+    The vectors are memory-mapped from disk when loaded.
+    """
+
+    def __init__(self, ids: np.ndarray, vectors: np.ndarray, centroids: np.ndarray,
+                 offsets: np.ndarray, meta: Optional[dict] = None):
+        self.ids = ids
+        self.vectors = vectors
+        self.centroids = centroids
+        self.offsets = offsets
+        self.meta = meta or {}
+        self._order = np.argsort(ids, kind="stable")
+        self._sorted_ids = ids[self._order]
+
+    @classmethod
+    def build(cls, ids: np.ndarray, vectors: np.ndarray, nlist: Optional[int] = None,
+              seed: int = 0) -> "IVFIndex":
+        """
+        Cluster vectors into an index.
+        :param ids: The Media ID of each vector.
+        :param vectors: The vectors, normalized here.
+        :param nlist: The number of clusters, default about the square root of the count.
+        :param seed: The k-means random seed.
+        """
+        vectors = normalize(np.asarray(vectors, dtype=np.float32))
+        nlist = max(1, min(nlist or int(round(np.sqrt(len(vectors)))), len(vectors)))
+        centroids = kmeans(vectors, nlist, seed=seed)
+        labels = _assign(vectors, centroids)
+        order = np.argsort(labels, kind="stable")
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(labels, minlength=nlist))]).astype(np.int64)
+        return cls(np.asarray(ids, dtype=np.int64)[order], vectors[order], centroids, offsets,
+                   {"count": len(vectors), "dim": int(vectors.shape[1]), "nlist": nlist})
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def vector_of(self, media_id: int) -> Optional[np.ndarray]:
+        """
+        Get the stored vector of a media.
+        :param media_id: The Media ID.
+        """
+        position = np.searchsorted(self._sorted_ids, media_id)
+        if position == len(self._sorted_ids) or self._sorted_ids[position] != media_id:
+            return None
+        return np.asarray(self.vectors[self._order[position]])
+
+    @staticmethod
+    def _top(ids: np.ndarray, scores: np.ndarray, k: int, exclude: Optional[int]) -> List[Tuple[int, float]]:
+        if exclude is not None:
+            keep = ids != exclude
+            ids, scores = ids[keep], scores[keep]
+        if len(scores) > k:
+            best = np.argpartition(-scores, k - 1)[:k]
+            ids, scores = ids[best], scores[best]
+        order = np.argsort(-scores, kind="stable")
+        return [(int(ids[index]), float(scores[index])) for index in order]
+
+    def search(self, query: np.ndarray, k: int, nprobe: int,
+               exclude: Optional[int] = None) -> List[Tuple[int, float]]:
+        """
+        Get the approximate `k` nearest media by cosine similarity.
+        :param query: The query vector.
+        :param k: The number of results.
+        :param nprobe: The number of clusters scanned.
+        :param exclude: A Media ID left out of the results, e.g. the query's own.
+        """
+        query = normalize(np.asarray(query, dtype=np.float32))
+        nlist = len(self.centroids)
+        nprobe = max(1, min(nprobe, nlist))
+        probes = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+        ids, scores = [], []
+        for probe in probes:
+            start, end = self.offsets[probe], self.offsets[probe + 1]
+            if end > start:
+                ids.append(self.ids[start:end])
+                scores.append(self.vectors[start:end] @ query)
+        if not ids:
+            return []
+        return self._top(np.concatenate(ids), np.concatenate(scores), k, exclude)
+
+    def exact_search(self, query: np.ndarray, k: int, exclude: Optional[int] = None) -> List[Tuple[int, float]]:
+        """
+        Get the exact `k` nearest media by scoring every vector.
+        :param query: The query vector.
+        :param k: The number of results.
+        :param exclude: A Media ID left out of the results.
+        """
+        query = normalize(np.asarray(query, dtype=np.float32))
+        return self._top(np.asarray(self.ids), np.asarray(self.vectors @ query), k, exclude)
+
+    def save(self, directory: str) -> str:
+        """
+        Write the index as a new version under `directory` and make it current.
+        Returns the version directory.
+        :param directory: The index root directory.
+        """
+        version = f"v{time.time_ns()}"
+        path = os.path.join(directory, version)
+        os.makedirs(path)
+        for name, array in (("ids", self.ids), ("vectors", self.vectors), ("centroids", self.centroids),
+                            ("offsets", self.offsets)):
+            np.save(os.path.join(path, f"{name}.npy"), np.ascontiguousarray(array))
+        with open(os.path.join(path, "meta.json"), "w") as file_obj:
+            json.dump({**self.meta, "version": version}, file_obj)
+        temporary_path = os.path.join(directory, f"{CURRENT_FILE}.{version}.tmp")
+        with open(temporary_path, "w") as file_obj:
+            file_obj.write(version)
+        os.replace(temporary_path, os.path.join(directory, CURRENT_FILE))
+        versions = sorted(name for name in os.listdir(directory) if name.startswith("v"))
+        for old in versions[:-KEEP_VERSIONS]:
+            shutil.rmtree(os.path.join(directory, old), ignore_errors=True)
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> "IVFIndex":
+        """
+        Load an index version, memory-mapping its vectors.
+        :param path: The version directory.
+        """
+        with open(os.path.join(path, "meta.json")) as file_obj:
+            meta = json.load(file_obj)
+        return cls(np.load(os.path.join(path, "ids.npy")),
+                   np.load(os.path.join(path, "vectors.npy"), mmap_mode="r"),
+                   np.load(os.path.join(path, "centroids.npy")),
+                   np.load(os.path.join(path, "offsets.npy")), meta)
+
+
+def recall_at_k(index: IVFIndex, queries: Iterable[int], k: int, nprobe: int) -> Tuple[float, float]:
+    """
+    Measure the recall@k of `search` against `exact_search`, and the mean
+    search latency in milliseconds.
+    :param index: The index.
+    :param queries: The Media IDs used as queries.
+    :param k: The number of results per query.
+    :param nprobe: The number of clusters scanned.
+    """
+    found = expected = 0
+    elapsed = 0.0
+    queries = list(queries)
+    for media_id in queries:
+        vector = index.vector_of(media_id)
+        exact = {result_id for result_id, _ in index.exact_search(vector, k, exclude=media_id)}
+        started = time.perf_counter()
+        approximate = index.search(vector, k, nprobe, exclude=media_id)
+        elapsed += time.perf_counter() - started
+        found += len(exact.intersection(result_id for result_id, _ in approximate))
+        expected += len(exact)
+    return (found / expected if expected else 1.0), (elapsed * 1000 / len(queries) if queries else 0.0)
+
+
+def sample_queries(index: IVFIndex, count: int, seed: int = 0) -> np.ndarray:
+    """
+    Pick Media IDs of the index to benchmark with.
+    :param index: The index.
+    :param count: The number of queries.
+    :param seed: The random seed.
+    """
+    rng = np.random.default_rng(seed)
+    return rng.choice(np.asarray(index.ids), min(count, len(index)), replace=False)
+
+
+class VectorIndexService:
+    """
+    The current index of this process, reloaded when a build publishes a
+    new version. Loading maps the vectors, so it is cheap and shares pages
+    between workers.
+    """
+
+    def __init__(self, directory: str, nprobe: int):
+        self.directory = directory
+        self.nprobe = nprobe
+        self.stats = {"queries": 0, "reloads": 0}
+        self._index: Optional[IVFIndex] = None
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def current(self) -> Optional[IVFIndex]:
+        """
+        Get the current index, None before the first build.
+        """
+        try:
+            with open(os.path.join(self.directory, CURRENT_FILE)) as file_obj:
+                version = file_obj.read().strip()
+        except FileNotFoundError:
+            return None
+        if version != self._version:
+            with self._lock:
+                if version != self._version:
+                    self._index = IVFIndex.load(os.path.join(self.directory, version))
+                    self._version = version
+                    self.stats["reloads"] += 1
+        return self._index
+
+    def similar(self, media_id: int, k: int, nprobe: Optional[int] = None) -> Optional[List[Tuple[int, float]]]:
+        """
+        Get the media most similar to a media, None if it has no embedding.
+        :param media_id: The Media ID.
+        :param k: The number of results.
+        :param nprobe: The number of clusters scanned, default the configured one.
+        """
+        index = self.current()
+        vector = None if index is None else index.vector_of(media_id)
+        if vector is None:
+            return None
+        self.stats["queries"] += 1
+        return index.search(vector, k, nprobe or self.nprobe, exclude=media_id)
+
+    def snapshot(self) -> dict:
+        """
+        Get the loaded index metadata and counters.
+        """
+        index = self.current()
+        meta = index.meta if index is not None else {}
+        return {**self.stats, "version": self._version, "count": meta.get("count", 0),
+                "dim": meta.get("dim", 0), "nlist": meta.get("nlist", 0), "nprobe": self.nprobe,
+                "recall_at_10": meta.get("recall_at_10")}
+
+
+@lru_cache()
+def get_vector_index() -> VectorIndexService:
+    """
+    Process wide media vector index.
+    """
+    settings = database.conf_settings
+    return VectorIndexService(directory=settings.VECTOR_INDEX_DIR, nprobe=settings.VECTOR_INDEX_NPROBE)
+
+
+def main():
+    """
+    Print recall@k and latency against exact search for several `nprobe`,
+    on the current index or on synthetic clustered vectors.
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--directory", help="index root directory, default VECTOR_INDEX_DIR")
+    parser.add_argument("--synthetic", type=int, metavar="COUNT", help="benchmark COUNT random vectors instead")
+    parser.add_argument("--dim", type=int, default=64)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=10)
+    args = parser.parse_args()
+    if args.synthetic:
+        rng = np.random.default_rng(0)
+        centers = rng.normal(size=(max(1, args.synthetic // 100), args.dim))
+        vectors = centers[rng.integers(len(centers), size=args.synthetic)] + rng.normal(size=(args.synthetic, args.dim))
+        index = IVFIndex.build(np.arange(args.synthetic), vectors)
+    else:
+        index = VectorIndexService(args.directory or database.conf_settings.VECTOR_INDEX_DIR, 1).current()
+        if index is None:
+            parser.error("no index built yet")
+    queries = sample_queries(index, args.queries)
+    print(f"{len(index)} vectors, dim {index.vectors.shape[1]}, nlist {len(index.centroids)}")
+    print(f"{'nprobe':>8} {'recall@' + str(args.k):>10} {'ms/query':>10}")
+    nprobe = 1
+    while True:
+        recall, latency = recall_at_k(index, queries, args.k, nprobe)
+        print(f"{nprobe:>8} {recall:>10.3f} {latency:>10.3f}")
+        if nprobe >= len(index.centroids):
+            break
+        nprobe = min(nprobe * 2, len(index.centroids))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""This module is the helper for buffered media view counts."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import asyncio
+import threading
+import uuid
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Optional
+
+from loguru import logger
+from redis.exceptions import RedisError, ResponseError
+from sqlalchemy import case, func, select, update
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from api import database
+from api.models.media_model import Media
+
+
+UPDATE_CHUNK_SIZE = 1000  # rows per bulk UPDATE
+
+
+class MemoryCounterStore:
+    """
+    Pending view count deltas kept in lock-striped shards of this process.
+    """
+
+    def __init__(self, shard_count: int = 16):
+        self.shards = [({}, threading.Lock()) for _ in range(shard_count)]
+
+    def _shard(self, media_id: int):
+        return self.shards[media_id % len(self.shards)]
+
+    def increment(self, media_id: int, amount: int = 1):
+        counts, lock = self._shard(media_id)
+        with lock:
+            counts[media_id] = counts.get(media_id, 0) + amount
+
+    def pending(self, media_ids: Iterable[int]) -> Dict[int, int]:
+        result = {}
+        for media_id in media_ids:
+            counts, lock = self._shard(media_id)
+            with lock:
+                result[media_id] = counts.get(media_id, 0)
+        return result
+
+    def drain(self) -> Dict[int, int]:
+        deltas: Dict[int, int] = {}
+        for counts, lock in self.shards:
+            with lock:
+                deltas.update(counts)
+                counts.clear()
+        return deltas
+
+    def restore(self, deltas: Dict[int, int]):
+        for media_id, amount in deltas.items():
+            self.increment(media_id, amount)
+
+
+class RedisCounterStore:
+    """
+    Pending view count deltas shared by all workers through a Redis hash.
+    Increments are counted in process and only sent to the hash by the
+    flusher, so request handlers never wait on Redis; views counted by other
+    workers show once one of them has flushed, within one flush interval.
+    """
+
+    def __init__(self, redis_client, key: str = "view_counts:pending", shard_count: int = 16):
+        self.redis = redis_client
+        self.key = key
+        self.local = MemoryCounterStore(shard_count)
+
+    def increment(self, media_id: int, amount: int = 1):
+        self.local.increment(media_id, amount)
+
+    def pending(self, media_ids: Iterable[int]) -> Dict[int, int]:
+        return self.local.pending(media_ids)
+
+    def _push(self, deltas: Dict[int, int]):
+        if not deltas:
+            return
+        pipe = self.redis.pipeline()
+        for media_id, amount in deltas.items():
+            pipe.hincrby(self.key, media_id, amount)
+        pipe.execute()
+
+    def drain(self) -> Dict[int, int]:
+        local = self.local.drain()
+        try:
+            self._push(local)
+        except RedisError:
+            self.local.restore(local)
+            raise
+        # Renaming is atomic, so increments racing the flush land in a new hash.
+        flushing_key = f"{self.key}:flushing:{uuid.uuid4().hex}"
+        try:
+            self.redis.rename(self.key, flushing_key)
+        except ResponseError:
+            return {}  # Nothing pending.
+        pipe = self.redis.pipeline()
+        pipe.hgetall(flushing_key)
+        pipe.delete(flushing_key)
+        values, _ = pipe.execute()
+        return {int(media_id): int(amount) for media_id, amount in values.items()}
+
+    def restore(self, deltas: Dict[int, int]):
+        try:
+            self._push(deltas)
+        except RedisError:
+            self.local.restore(deltas)  # Sent again by the next flush.
+
+
+class ViewCounter:
+    """
+    Buffers `Media.view_count` increments and writes them back periodically
+    with one `UPDATE ... CASE` statement, instead of an UPDATE per play.
+    Flushes leave cached responses alone: view counts only grow, so a
+    cached count older than the totals written here is topped up on read.
+    """
+
+    def __init__(self, store, flush_interval: float, session_factory: Callable[[], Session]):
+        self.store = store
+        self.flush_interval = flush_interval
+        self.session_factory = session_factory
+        self.persisted: Dict[int, int] = {}  # totals written by the last flush of each media
+        self._task: Optional[asyncio.Task] = None
+
+    def increment(self, media_id: int, amount: int = 1):
+        """
+        Count views of a media item.
+        :param media_id: The Media ID.
+        :param amount: The number of views.
+        """
+        self.store.increment(media_id, amount)
+
+    def merged(self, media_id: int, persisted: Optional[int]) -> int:
+        """
+        Get the view count including increments not yet flushed.
+        :param media_id: The Media ID.
+        :param persisted: The stored, possibly cached, `Media.view_count`.
+        """
+        return max(persisted or 0, self.persisted.get(media_id, 0)) + self.store.pending([media_id])[media_id]
+
+    def merged_many(self, persisted: Dict[int, Optional[int]]) -> Dict[int, int]:
+        """
+        Get the view counts of several media items including pending increments.
+        :param persisted: The stored, possibly cached, `Media.view_count` by Media ID.
+        """
+        pending = self.store.pending(persisted)
+        return {media_id: max(view_count or 0, self.persisted.get(media_id, 0)) + pending[media_id]
+                for media_id, view_count in persisted.items()}
+
+    def _write(self, deltas: Dict[int, int]):
+        db_session = self.session_factory()
+        totals: Dict[int, int] = {}
+        try:
+            media_ids = sorted(deltas)
+            for offset in range(0, len(media_ids), UPDATE_CHUNK_SIZE):
+                chunk = {media_id: deltas[media_id]
+                         for media_id in media_ids[offset:offset + UPDATE_CHUNK_SIZE]}
+                db_session.execute(
+                    update(Media)
+                    .where(Media.media_id.in_(chunk))
+                    .values(view_count=func.coalesce(Media.view_count, 0)
+                            + case(chunk, value=Media.media_id, else_=0),
+                            # A view is not an edit of the media row.
+                            updated_at=Media.updated_at)
+                    .execution_options(synchronize_session=False)
+                )
+                totals.update(db_session.execute(
+                    select(Media.media_id, Media.view_count).where(Media.media_id.in_(chunk))).all())
+            db_session.commit()
+        except Exception:
+            db_session.rollback()
+            raise
+        finally:
+            db_session.close()
+        self.persisted.update(totals)
+
+    async def flush(self):
+        """
+        Write pending increments to `Media.view_count`.
+        """
+        try:
+            deltas = await run_in_threadpool(self.store.drain)
+        except RedisError as error:
+            logger.warning(f"Failed to drain pending view counts: {error}")
+            return
+        if not deltas:
+            return
+        try:
+            await run_in_threadpool(self._write, deltas)
+        except Exception:
+            logger.exception(f"Failed to flush view counts of {len(deltas)} media")
+            await run_in_threadpool(self.store.restore, deltas)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def start(self):
+        """
+        Start the background flusher.
+        """
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Stop the background flusher and flush what is left.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+@lru_cache()
+def get_view_counter() -> ViewCounter:
+    """
+    Process wide view counter configured by `VIEW_COUNTER_BACKEND`.
+    """
+    settings = database.conf_settings
+    if settings.VIEW_COUNTER_BACKEND == "redis":
+        store = RedisCounterStore(database.get_redis(), shard_count=settings.VIEW_COUNTER_SHARDS)
+    else:
+        store = MemoryCounterStore(settings.VIEW_COUNTER_SHARDS)
+    return ViewCounter(store, flush_interval=settings.VIEW_COUNTER_FLUSH_INTERVAL,
+                       session_factory=database.SessionLocal)
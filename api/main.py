@@ -8,13 +8,20 @@
 import os
 from functools import lru_cache
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from loguru import logger
 
 from api import database, config
+from api.helpers import (autocomplete, charts, event_hub, feed, listening_party, play_ingest, rate_limit,
+                         response_cache, search_index, view_counter)
+from api.helpers.pagination import InvalidCursor
+from api.routers import (admin, catalog, charts as charts_router, exports, feed as feed_router, images, imports,
+                         media, playlists, plays, ratings, recommendations, search, sessions, stream)
+from api.worker import backfill_feed, fan_out_media, prune_feed
 
-# from api.routers import async_router, users, items, tasks, stream, questions
+# from api.routers import async_router, users, items, tasks, questions
 
 database.Base.metadata.create_all(bind=database.engine)
 
@@ -31,6 +38,8 @@ conf_settings = get_settings()
 
 app = FastAPI(debug=conf_settings.APP_DEBUG)
 
+# Added first so CORS wraps it and rejections carry CORS headers.
+app.add_middleware(rate_limit.RateLimitMiddleware, user_header=conf_settings.RATE_LIMIT_USER_HEADER)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=conf_settings.ALLOWED_ORIGINS,
@@ -42,12 +51,69 @@ app.add_middleware(
 # app.include_router(users.router)
 # app.include_router(items.router)
 # app.include_router(tasks.router)
-# app.include_router(stream.router)
 # app.include_router(questions.router)
+app.include_router(media.router)
+app.include_router(plays.router)
+app.include_router(ratings.router)
+app.include_router(playlists.router)
+app.include_router(recommendations.router)
+app.include_router(feed_router.router)
+app.include_router(catalog.router)
+app.include_router(charts_router.router)
+app.include_router(images.router)
+app.include_router(exports.router)
+app.include_router(imports.router)
+app.include_router(search.router)
+app.include_router(stream.router)
+app.include_router(sessions.router)
+app.include_router(admin.router)
 
 logger.add("log_api.log", rotation="100 MB")  # Automatically rotate log file
 
 
+@app.exception_handler(InvalidCursor)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursor):
+    """
+    Invalid pagination cursor handler.
+    """
+    return JSONResponse(status_code=400, content={"detail": "Invalid cursor"})
+
+
+@app.on_event("startup")
+async def startup():
+    """
+    Start background workers.
+    """
+    await play_ingest.get_play_buffer().start()
+    await view_counter.get_view_counter().start()
+    response_cache.install_invalidation_hooks(response_cache.get_response_cache())
+    await response_cache.get_response_cache().start()
+    await search_index.get_search_index().start()
+    await autocomplete.get_suggest_index().start()
+    event_hub.install_event_hooks(event_hub.get_event_hub())
+    await event_hub.get_event_hub().start()
+    feed.install_feed_hooks(fan_out_media.delay, backfill_feed.delay, prune_feed.delay)
+    await listening_party.get_party_hub().start()
+    await charts.get_chart_counter().start()
+    await rate_limit.get_rate_limiter().start()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """
+    Stop background workers.
+    """
+    await play_ingest.get_play_buffer().stop()
+    await view_counter.get_view_counter().stop()
+    await response_cache.get_response_cache().stop()
+    await search_index.get_search_index().stop()
+    await autocomplete.get_suggest_index().stop()
+    await event_hub.get_event_hub().stop()
+    await listening_party.get_party_hub().stop()
+    await charts.get_chart_counter().stop()
+    await rate_limit.get_rate_limiter().stop()
+
+
 def get_info():
     """
     Info function.
@@ -14,10 +14,7 @@ def add_relationships_to_existing_models():
     Album.media = relationship("MediaAlbum", back_populates="album")
     Album.artists = relationship("AlbumArtist", back_populates="album")
 
-    # In Media model
-    Media.albums = relationship("MediaAlbum", back_populates="media")
-    Media.genres = relationship("MediaGenre", back_populates="media")
-    Media.artists = relationship("MediaArtist", back_populates="media")
+    # In Media model (artists, albums and genres are declared on Media itself)
     Media.playlists = relationship("PlaylistMedia", back_populates="media")
 
     # In Artist model
@@ -1,6 +1,6 @@
 import enum
 from sqlalchemy import Column, Integer, String, DateTime, Enum, Boolean, Time, Index
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import query_expression, relationship
 from sqlalchemy.sql import func
 
 from api.database import Base
@@ -28,6 +28,14 @@ class Media(Base):
     thumbnail_image_path = Column(String(255), nullable=True)
     view_count = Column(Integer, default=0)
     is_premium_only = Column(Boolean, default=False)
+    # Rating aggregates over non-deleted ratings, see helpers/rating_stats.py.
+    rating_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_sum = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_count_1 = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_count_2 = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_count_3 = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_count_4 = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_count_5 = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     deleted_at = Column(DateTime, nullable=True)
@@ -36,3 +44,26 @@ class Media(Base):
     favorites = relationship("Favorite", back_populates="media")
     comments = relationship("Comment", back_populates="media")
     ratings = relationship("Rating", back_populates="media")
+    # Catalog through the join tables. Never lazy loaded: pick a loading
+    # profile from helpers/load_profiles.py instead.
+    artists = relationship("Artist", secondary="media_artists", viewonly=True, lazy="raise",
+                           secondaryjoin="and_(Artist.artist_id == media_artists.c.artist_id, "
+                                         "Artist.deleted_at.is_(None))")
+    albums = relationship("Album", secondary="media_albums", viewonly=True, lazy="raise",
+                          secondaryjoin="and_(Album.album_id == media_albums.c.album_id, "
+                                        "Album.deleted_at.is_(None))")
+    genres = relationship("Genre", secondary="media_genres", viewonly=True, lazy="raise",
+                          secondaryjoin="and_(Genre.genre_id == media_genres.c.genre_id, "
+                                        "Genre.deleted_at.is_(None))")
+    # Engagement counts, filled in by the `full` loading profile.
+    favorite_count = query_expression()
+    comment_count = query_expression()
+
+    @property
+    def rating_average(self):
+        return round(self.rating_sum / self.rating_count, 2) if self.rating_count else None
+
+    @property
+    def rating_histogram(self):
+        return [self.rating_count_1 or 0, self.rating_count_2 or 0, self.rating_count_3 or 0,
+                self.rating_count_4 or 0, self.rating_count_5 or 0]
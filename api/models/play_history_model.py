@@ -13,6 +13,7 @@ class PlayHistory(Base):
         Index('idx_play_history_user_id', 'user_id'),
         Index('idx_play_history_media_id', 'media_id'),
         Index('idx_play_history_played_at', 'played_at'),
+        Index('idx_play_history_user_played_at', 'user_id', 'played_at'),
     )
 
     history_id = Column(Integer, primary_key=True, autoincrement=True)
@@ -1,17 +1,22 @@
-from sqlalchemy import Column, Integer, ForeignKey, Index
+from sqlalchemy import BigInteger, Column, DateTime, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 from api.database import Base
 
-# Many-to-Many: Playlist-Media Association Table
+# Ordered Playlist entries; a media may appear more than once.
 class PlaylistMedia(Base):
     __tablename__ = "playlist_media"
     __table_args__ = (
-        Index('idx_playlist_media_playlist_id', 'playlist_id'),
+        Index('idx_playlist_media_playlist_position', 'playlist_id', 'position', unique=True),
         Index('idx_playlist_media_media_id', 'media_id'),
     )
 
-    playlist_id = Column(Integer, ForeignKey('playlists.playlist_id', ondelete='CASCADE'), primary_key=True)
-    media_id = Column(Integer, ForeignKey('media.media_id', ondelete='CASCADE'), primary_key=True)
+    entry_id = Column(Integer, primary_key=True, autoincrement=True)
+    playlist_id = Column(Integer, ForeignKey('playlists.playlist_id', ondelete='CASCADE'), nullable=False)
+    media_id = Column(Integer, ForeignKey('media.media_id', ondelete='CASCADE'), nullable=False)
+    # Sparse sort key, see helpers/playlist_order.py.
+    position = Column(BigInteger, nullable=False)
+    added_at = Column(DateTime, server_default=func.now())
 
     # Relationships
     playlist = relationship("Playlist")
@@ -0,0 +1,107 @@
+"""This module is for the admin router."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+from typing import List
+from fastapi import APIRouter, Depends
+from api.helpers import (autocomplete, charts, event_hub, listening_party, pool_metrics, rate_limit, response_cache,
+                         search_index, segment_cache, vector_index)
+from api.schemas import admin_schema, party_schema, search_schema
+
+
+router = APIRouter()
+
+
+@router.get("/admin/db/pools", response_model=List[admin_schema.PoolMetrics])
+def read_pool_metrics():
+    """
+    Get database connection pool metrics router.
+    """
+    return pool_metrics.get_pool_metrics()
+
+
+@router.get("/admin/cache", response_model=admin_schema.ResponseCacheMetrics)
+def read_cache_metrics(cache: response_cache.ResponseCache = Depends(response_cache.get_response_cache)):
+    """
+    Get response cache metrics router.
+    :param cache: The response cache.
+    """
+    return cache.snapshot()
+
+
+@router.get("/admin/search", response_model=search_schema.SearchIndexStats)
+def read_search_stats(index: search_index.SearchIndex = Depends(search_index.get_search_index)):
+    """
+    Get search index size and state router.
+    :param index: The media search index.
+    """
+    return index.snapshot()
+
+
+@router.get("/admin/suggest", response_model=search_schema.SuggestIndexStats)
+def read_suggest_stats(index: autocomplete.SuggestIndex = Depends(autocomplete.get_suggest_index)):
+    """
+    Get typeahead index size and state router.
+    :param index: The typeahead index.
+    """
+    return index.snapshot()
+
+
+@router.get("/admin/events", response_model=admin_schema.EventHubMetrics)
+def read_event_hub_metrics(hub: event_hub.EventHub = Depends(event_hub.get_event_hub)):
+    """
+    Get stream event hub metrics router.
+    :param hub: The event hub.
+    """
+    return hub.snapshot()
+
+
+@router.get("/admin/sessions", response_model=party_schema.PartyMetrics)
+def read_party_metrics(party: listening_party.PartyHub = Depends(listening_party.get_party_hub)):
+    """
+    Get listening party session metrics router.
+    :param party: The listening party hub.
+    """
+    return party.snapshot()
+
+
+@router.get("/admin/segments", response_model=admin_schema.SegmentCacheMetrics)
+def read_segment_cache_metrics(segments: segment_cache.SegmentCache = Depends(segment_cache.get_segment_cache)):
+    """
+    Get HLS segment cache metrics router.
+    :param segments: The segment cache.
+    """
+    return segments.snapshot()
+
+
+@router.get("/admin/vectors", response_model=admin_schema.VectorIndexMetrics)
+def read_vector_index_metrics(index: vector_index.VectorIndexService = Depends(vector_index.get_vector_index)):
+    """
+    Get similar media index metrics router.
+    :param index: The media vector index.
+    """
+    return index.snapshot()
+
+
+@router.get("/admin/charts", response_model=admin_schema.ChartCounterMetrics)
+def read_chart_counter_metrics(counter: charts.ChartCounter = Depends(charts.get_chart_counter)):
+    """
+    Get the chart play counter metrics router.
+    :param counter: The chart play counter.
+    """
+    return counter.snapshot()
+
+
+@router.get("/admin/limits", response_model=admin_schema.RateLimitMetrics)
+def read_rate_limit_metrics(limiter: rate_limit.RateLimiter = Depends(rate_limit.get_rate_limiter),
+admission: rate_limit.AdmissionController = Depends(rate_limit.get_admission_controller)):
+    """
+    Get the rate limiter and admission control metrics router. The
+    longest queue wait is reset on every read.
+    :param limiter: The rate limiter.
+    :param admission: The admission controller.
+    """
+    return {**limiter.snapshot(), **admission.snapshot()}
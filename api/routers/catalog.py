@@ -0,0 +1,73 @@
+"""This module is for the catalog router."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession
+from api.helpers import async_crud, response_cache
+from api.schemas import album_schema, artist_schema, genre_schema
+from .. import database
+
+
+router = APIRouter()
+
+
+@router.get("/albums/{album_id}", response_model=album_schema.AlbumResponse)
+async def read_album(album_id: int, db_session: AsyncSession = Depends(database.get_async_read_db),
+cache: response_cache.ResponseCache = Depends(response_cache.get_response_cache)):
+    """
+    Get album by Album ID router.
+    :param album_id: The Album ID.
+    :param db_session: The async database session.
+    :param cache: The response cache.
+    """
+    async def load_album():
+        db_album = await async_crud.get_album(db_session, album_id=album_id)
+        return None if db_album is None else jsonable_encoder(album_schema.AlbumResponse.from_orm(db_album))
+
+    album = await cache.get_or_load(f"album:{album_id}", load_album, tags=[f"album:{album_id}"])
+    if album is None:
+        raise HTTPException(status_code=404, detail="Album not found")
+    return album
+
+
+@router.get("/artists/{artist_id}", response_model=artist_schema.ArtistResponse)
+async def read_artist(artist_id: int, db_session: AsyncSession = Depends(database.get_async_read_db),
+cache: response_cache.ResponseCache = Depends(response_cache.get_response_cache)):
+    """
+    Get artist by Artist ID router.
+    :param artist_id: The Artist ID.
+    :param db_session: The async database session.
+    :param cache: The response cache.
+    """
+    async def load_artist():
+        db_artist = await async_crud.get_artist(db_session, artist_id=artist_id)
+        return None if db_artist is None else jsonable_encoder(artist_schema.ArtistResponse.from_orm(db_artist))
+
+    artist = await cache.get_or_load(f"artist:{artist_id}", load_artist, tags=[f"artist:{artist_id}"])
+    if artist is None:
+        raise HTTPException(status_code=404, detail="Artist not found")
+    return artist
+
+
+@router.get("/genres/{genre_id}", response_model=genre_schema.GenreResponse)
+async def read_genre(genre_id: int, db_session: AsyncSession = Depends(database.get_async_read_db),
+cache: response_cache.ResponseCache = Depends(response_cache.get_response_cache)):
+    """
+    Get genre by Genre ID router.
+    :param genre_id: The Genre ID.
+    :param db_session: The async database session.
+    :param cache: The response cache.
+    """
+    async def load_genre():
+        db_genre = await async_crud.get_genre(db_session, genre_id=genre_id)
+        return None if db_genre is None else jsonable_encoder(genre_schema.GenreResponse.from_orm(db_genre))
+
+    genre = await cache.get_or_load(f"genre:{genre_id}", load_genre, tags=[f"genre:{genre_id}"])
+    if genre is None:
+        raise HTTPException(status_code=404, detail="Genre not found")
+    return genre
@@ -0,0 +1,59 @@
+"""This module is for the charts router."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import json
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Query
+from redis.exceptions import RedisError
+from api.helpers import charts
+from api.schemas import chart_schema
+from .. import database
+
+
+router = APIRouter()
+
+
+async def _read_chart(redis_client, window: str, scope: str, scope_id: Optional[int], limit: int) -> dict:
+    if window not in charts.CHART_WINDOWS or scope not in charts.CHART_SCOPES:
+        raise HTTPException(status_code=404, detail="Chart not found")
+    try:
+        stored = await redis_client.get(charts.chart_key(window, scope, scope_id))
+    except RedisError:
+        raise HTTPException(status_code=503, detail="Charts unavailable")
+    stored = json.loads(stored or '{"generated_at": null, "items": []}')
+    return {"window": window, "scope": scope, "scope_id": scope_id, "generated_at": stored["generated_at"],
+            "items": [{"id": item_id, "score": score} for item_id, score in stored["items"][:limit]]}
+
+
+@router.get("/charts/{window}/{scope}", response_model=chart_schema.Chart)
+async def read_chart(window: str, scope: str, limit: int = Query(50, ge=1, le=100),
+redis_client=Depends(database.get_async_redis)):
+    """
+    Get a trending chart router: the most played media, genres or artists
+    of the `hourly`, `daily` or `weekly` window, recent plays weighing more.
+    :param window: One of `hourly`, `daily` or `weekly`.
+    :param scope: One of `media`, `genres` or `artists`.
+    :param limit: The number of entries to return.
+    :param redis_client: The async Redis client.
+    """
+    return await _read_chart(redis_client, window, scope, None, limit)
+
+
+@router.get("/charts/{window}/{scope}/{scope_id}", response_model=chart_schema.Chart)
+async def read_group_chart(window: str, scope: str, scope_id: int, limit: int = Query(50, ge=1, le=100),
+redis_client=Depends(database.get_async_redis)):
+    """
+    Get the trending media of one genre or artist router.
+    :param window: One of `hourly`, `daily` or `weekly`.
+    :param scope: `genres` or `artists`.
+    :param scope_id: The Genre or Artist ID.
+    :param limit: The number of entries to return.
+    :param redis_client: The async Redis client.
+    """
+    if scope == "media":
+        raise HTTPException(status_code=404, detail="Chart not found")
+    return await _read_chart(redis_client, window, scope, scope_id, limit)
@@ -0,0 +1,69 @@
+"""This module is for the exports router."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from api.helpers import exports
+from api.models.media_model import Media
+from api.models.play_history_model import PlayHistory
+from .. import database
+
+
+router = APIRouter()
+
+
+def _export_response(db_session: AsyncSession, export: exports.Export, statement, export_format: str,
+                     compress: bool, suffix: str = "") -> StreamingResponse:
+    filename = exports.export_filename(export, export_format, compress, suffix)
+    media_type = exports.GZIP_MEDIA_TYPE if compress else exports.EXPORT_FORMATS[export_format].media_type
+    body = exports.stream_export(db_session, export, statement, export_format, compress,
+                                 database.conf_settings.EXPORT_BATCH_SIZE)
+    return StreamingResponse(body, media_type=media_type,
+                             headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+
+def _check_format(export_format: str):
+    if export_format not in exports.EXPORT_FORMATS:
+        raise HTTPException(status_code=422, detail=f"format must be one of {', '.join(exports.EXPORT_FORMATS)}")
+
+
+@router.get("/exports/users/{user_id}/plays")
+async def export_user_plays(user_id: int, format: str = "ndjson", gzip: bool = False, cursor: Optional[str] = None,
+db_session: AsyncSession = Depends(database.get_async_read_db)):
+    """
+    Stream the full play history of a user router, oldest first, as NDJSON
+    or CSV, optionally gzipped. Every row carries a `cursor`; pass the last
+    one received to resume an interrupted export.
+    :param user_id: The User ID.
+    :param format: `ndjson` or `csv`.
+    :param gzip: Whether to gzip the output.
+    :param cursor: The `cursor` of the last row received.
+    :param db_session: The async database session.
+    """
+    _check_format(format)
+    statement = exports.export_statement(exports.PLAY_HISTORY_EXPORT, PlayHistory.user_id == user_id,
+                                         cursor=cursor)
+    return _export_response(db_session, exports.PLAY_HISTORY_EXPORT, statement, format, gzip, f"-{user_id}")
+
+
+@router.get("/exports/media")
+async def export_media(format: str = "ndjson", gzip: bool = False, cursor: Optional[str] = None,
+db_session: AsyncSession = Depends(database.get_async_read_db)):
+    """
+    Stream the full media catalog router by Media ID, as NDJSON or CSV,
+    optionally gzipped. Every row carries a `cursor`; pass the last one
+    received to resume an interrupted export.
+    :param format: `ndjson` or `csv`.
+    :param gzip: Whether to gzip the output.
+    :param cursor: The `cursor` of the last row received.
+    :param db_session: The async database session.
+    """
+    _check_format(format)
+    statement = exports.export_statement(exports.MEDIA_EXPORT, Media.deleted_at.is_(None), cursor=cursor)
+    return _export_response(db_session, exports.MEDIA_EXPORT, statement, format, gzip)
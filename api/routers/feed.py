@@ -0,0 +1,75 @@
+"""This module is for the home feed router."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Query
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+from api.helpers import async_crud, feed
+from api.helpers.pagination import InvalidCursor
+from api.schemas import feed_schema, media_schema, status_schema, user_artist_schema
+from .. import database
+
+
+router = APIRouter()
+
+
+@router.get("/users/{user_id}/feed", response_model=feed_schema.FeedPage)
+async def read_user_feed(user_id: int, cursor: Optional[str] = None, limit: int = Query(20, ge=1, le=100),
+db_session: AsyncSession = Depends(database.get_async_read_db),
+redis_client=Depends(database.get_async_redis)):
+    """
+    Get a page of a user's home feed router: the newest releases of the
+    artists they follow.
+    :param user_id: The User ID.
+    :param cursor: The `next_cursor` of the previous page.
+    :param limit: The number of releases to return.
+    :param db_session: The async database session.
+    :param redis_client: The async Redis client.
+    """
+    if cursor is not None and not cursor.isdigit():
+        raise InvalidCursor(cursor)
+    try:
+        celebrities = [int(artist_id) for artist_id in await redis_client.smembers(feed.CELEBRITIES_KEY)]
+        merged = await async_crud.get_followed_artist_ids(db_session, user_id, celebrities)
+        media_ids, next_cursor = await feed.read_feed(redis_client, user_id, merged,
+                                                      None if cursor is None else int(cursor), limit)
+    except RedisError:
+        raise HTTPException(status_code=503, detail="Feed unavailable")
+    media_list = await async_crud.get_media_by_ids(db_session, media_ids, profile="card")
+    return {"items": [media_schema.MediaCard.from_orm(db_media) for db_media in media_list],
+            "next_cursor": None if next_cursor is None else str(next_cursor)}
+
+
+@router.put("/users/{user_id}/follows/{artist_id}", response_model=user_artist_schema.UserArtistResponse)
+async def follow_artist(user_id: int, artist_id: int, db_session: AsyncSession = Depends(database.get_async_db)):
+    """
+    Follow an artist router. The artist's recent releases are added to the
+    user's feed in the background.
+    :param user_id: The follower's User ID.
+    :param artist_id: The Artist ID.
+    :param db_session: The async database session.
+    """
+    if await async_crud.get_user(db_session, user_id=user_id) is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    if await async_crud.get_artist(db_session, artist_id=artist_id) is None:
+        raise HTTPException(status_code=404, detail="Artist not found")
+    return await async_crud.follow_artist(db_session, user_id=user_id, artist_id=artist_id)
+
+
+@router.delete("/users/{user_id}/follows/{artist_id}", response_model=status_schema.Status)
+async def unfollow_artist(user_id: int, artist_id: int, db_session: AsyncSession = Depends(database.get_async_db)):
+    """
+    Unfollow an artist router. The artist's releases leave the user's feed
+    in the background.
+    :param user_id: The follower's User ID.
+    :param artist_id: The Artist ID.
+    :param db_session: The async database session.
+    """
+    if await async_crud.unfollow_artist(db_session, user_id=user_id, artist_id=artist_id) is None:
+        raise HTTPException(status_code=404, detail="Follow not found")
+    return status_schema.Status(status=f"User {user_id} unfollowed artist {artist_id}")
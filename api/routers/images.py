@@ -0,0 +1,107 @@
+"""This module is for the images router."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import json
+import re
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from fastapi.responses import RedirectResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from api.helpers import async_crud, images, response_cache, segment_cache, storage
+from api.helpers.range_response import is_not_modified
+from api.schemas import tasks_schema
+from api.worker import schedule_image_variants
+from .. import database
+
+
+router = APIRouter()
+
+DIGEST_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+REDIRECT_CACHE_CONTROL = "public, max-age=300"
+
+
+@router.get("/images/{kind}/{entity_id}")
+async def read_entity_image(kind: str, entity_id: int, request: Request, size: str = "small",
+db_session: AsyncSession = Depends(database.get_async_read_db),
+cache: response_cache.ResponseCache = Depends(response_cache.get_response_cache),
+storage_backend: storage.StorageBackend = Depends(storage.get_storage),
+segments: segment_cache.SegmentCache = Depends(segment_cache.get_segment_cache)):
+    """
+    Redirect to a resized variant of the image of a media (thumbnail), album
+    (cover art), artist or user (profile picture) router. WebP is chosen
+    when the Accept header allows it, JPEG otherwise.
+    :param kind: One of `media`, `albums`, `artists` or `users`.
+    :param entity_id: The ID of the media, album, artist or user.
+    :param request: The incoming request.
+    :param size: One of `thumb`, `small`, `medium` or `large`.
+    :param db_session: The async database session.
+    :param cache: The response cache.
+    :param storage_backend: The media storage backend.
+    :param segments: The segment cache, holding the image manifests.
+    """
+    source = images.IMAGE_SOURCES.get(kind)
+    if source is None:
+        raise HTTPException(status_code=404, detail="Image not found")
+    if size not in images.IMAGE_SIZES:
+        raise HTTPException(status_code=422, detail=f"size must be one of {', '.join(images.IMAGE_SIZES)}")
+
+    async def load_image_path():
+        return {"path": await async_crud.get_image_path(db_session, source, entity_id)}
+
+    image = await cache.get_or_load(f"image:{kind}:{entity_id}", load_image_path,
+                                    tags=[f"{source.tag}:{entity_id}"])
+    if not image["path"]:
+        raise HTTPException(status_code=404, detail="Image not found")
+    try:
+        _, manifest = await segments.fetch(storage_backend, images.manifest_key(image["path"]))
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Image variants not generated yet")
+    variant = images.variant_name(size, images.pick_format(request.headers.get("accept")))
+    url = request.url_for("read_image_variant", digest=json.loads(manifest)["digest"], variant=variant)
+    return RedirectResponse(url, status_code=307,
+                            headers={"Cache-Control": REDIRECT_CACHE_CONTROL, "Vary": "Accept"})
+
+
+@router.get("/images/cas/{digest}/{variant}")
+async def read_image_variant(digest: str, variant: str, request: Request,
+storage_backend: storage.StorageBackend = Depends(storage.get_storage),
+segments: segment_cache.SegmentCache = Depends(segment_cache.get_segment_cache)):
+    """
+    Get an image variant by content address router. The bytes behind a
+    digest never change, so responses may be cached for a year.
+    :param digest: The content digest of the source image.
+    :param variant: The variant file name, e.g. `small.webp`.
+    :param request: The incoming request.
+    :param storage_backend: The media storage backend.
+    :param segments: The segment cache.
+    """
+    size, _, extension = variant.partition(".")
+    if not DIGEST_PATTERN.match(digest) or size not in images.IMAGE_SIZES or extension not in images.IMAGE_FORMATS:
+        raise HTTPException(status_code=404, detail="Image not found")
+    try:
+        stored, data = await segments.fetch(storage_backend, images.variant_key(digest, variant))
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    headers = {"Cache-Control": images.IMAGE_CACHE_CONTROL, "ETag": stored.etag,
+               "Last-Modified": stored.last_modified}
+    if is_not_modified(request.headers.get("if-none-match"), request.headers.get("if-modified-since"), stored):
+        return Response(status_code=304, headers=headers)
+    if data is None:
+        data = await run_in_threadpool(images.read_object, storage_backend, stored.key)
+    segments.record_served(len(data))
+    return Response(content=data, media_type=images.IMAGE_FORMATS[extension].media_type, headers=headers)
+
+
+@router.post("/images/variants", response_model=tasks_schema.TaskStatus, status_code=202)
+async def create_image_variants():
+    """
+    Queue resized variant generation of every uploaded image router.
+    Unchanged images are skipped, so it is safe to run at any time.
+    """
+    task_run = await run_in_threadpool(schedule_image_variants.delay)
+    return {"task_id": task_run.id, "task_status": "PENDING", "task_result": None}
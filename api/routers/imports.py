@@ -0,0 +1,77 @@
+"""This module is for the catalog imports router."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import os
+import tempfile
+import uuid
+from fastapi import APIRouter, HTTPException, Depends, Request
+from starlette.concurrency import run_in_threadpool
+from api.helpers import catalog_import, crud, storage
+from api.schemas import tasks_schema
+from api.worker import import_catalog
+from .. import database
+
+
+router = APIRouter()
+
+SPOOL_CHUNK_SIZE = 1 << 20  # bytes gathered per write of the upload to disk
+
+
+@router.post("/imports", response_model=tasks_schema.TaskStatus, status_code=202)
+async def create_import(request: Request, format: str = "csv",
+storage_backend: storage.StorageBackend = Depends(storage.get_storage)):
+    """
+    Start a bulk catalog import router. The request body is a CSV file with
+    a header row, or JSON Lines, one media per record with `media_title`,
+    `media_type`, `duration`, `s3_media_path`, `thumbnail_image_path`,
+    `is_premium_only`, `artists` and `genres` (lists, or `|` separated in
+    CSV), `album` and `album_release_date`. Media are matched by title.
+    :param request: The incoming request.
+    :param format: `csv` or `ndjson`.
+    :param storage_backend: The media storage backend.
+    """
+    if format not in catalog_import.IMPORT_FORMATS:
+        raise HTTPException(status_code=422,
+                            detail=f"format must be one of {', '.join(catalog_import.IMPORT_FORMATS)}")
+    max_bytes = database.conf_settings.IMPORT_MAX_BYTES
+    too_large = HTTPException(status_code=413, detail=f"The import file is larger than {max_bytes} bytes")
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+        raise too_large
+    key = f"imports/{uuid.uuid4().hex}.{format}"
+    # Spooled to disk off the event loop as it arrives, so large files never sit in memory.
+    upload = await run_in_threadpool(tempfile.NamedTemporaryFile, suffix=f".{format}", delete=False)
+    try:
+        size, pending = 0, bytearray()
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > max_bytes:
+                raise too_large
+            pending += chunk
+            if len(pending) >= SPOOL_CHUNK_SIZE:
+                await run_in_threadpool(upload.write, bytes(pending))
+                pending.clear()
+        await run_in_threadpool(upload.write, bytes(pending))
+        await run_in_threadpool(upload.close)
+        if size == 0:
+            raise HTTPException(status_code=422, detail="The import file is empty")
+        await run_in_threadpool(storage_backend.put_file, key, upload.name)
+    finally:
+        upload.close()
+        await run_in_threadpool(os.remove, upload.name)
+    task_run = await run_in_threadpool(import_catalog.delay, key, format)
+    return {"task_id": task_run.id, "task_status": "PENDING", "task_result": None}
+
+
+@router.get("/imports/{task_id}", response_model=tasks_schema.TaskStatus)
+def read_import(task_id: str):
+    """
+    Get the status of a catalog import router. While running, the result
+    holds the rows read, imported and failed, and the rows per second.
+    :param task_id: The import Task ID.
+    """
+    return crud.get_task(task_id=task_id)
@@ -0,0 +1,230 @@
+"""This module is for the media router."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import mimetypes
+import posixpath
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from api.helpers import async_crud, crud, response_cache, segment_cache, storage, vector_index, view_counter
+from api.helpers.load_profiles import MEDIA_PROFILES
+from api.helpers.packaging import output_prefix
+from api.helpers.range_response import (MediaRangeResponse, RangeNotSatisfiable,
+                                        if_range_matches, is_not_modified, parse_range_header)
+from api.schemas import comment_schema, media_schema, tasks_schema
+from api.worker import package_media
+from .. import database
+
+
+router = APIRouter()
+
+HLS_MEDIA_TYPES = {
+    ".m3u8": "application/vnd.apple.mpegurl",
+    ".ts": "video/mp2t",
+}
+
+
+@router.get("/media", response_model=media_schema.MediaListPage)
+async def read_media_list(cursor: Optional[str] = None, limit: int = 100, expand: Optional[str] = None,
+db_session: AsyncSession = Depends(database.get_async_read_db),
+views: view_counter.ViewCounter = Depends(view_counter.get_view_counter),
+cache: response_cache.ResponseCache = Depends(response_cache.get_response_cache)):
+    """
+    Get a page of media router. `expand` picks a loading profile: `card`
+    adds artist names to a slim row, `detail` adds artists, albums and
+    genres, `full` also adds favorite and comment counts. Each loads a
+    page in a fixed number of queries.
+    :param cursor: The `next_cursor` of the previous page.
+    :param limit: The number of media to retrieve per query.
+    :param expand: One of `card`, `detail` or `full`; default the media only.
+    :param db_session: The async database session.
+    :param views: The media view counter.
+    :param cache: The response cache.
+    """
+    if expand not in media_schema.MEDIA_PROFILE_SCHEMAS:
+        raise HTTPException(status_code=422, detail=f"expand must be one of {', '.join(MEDIA_PROFILES)}")
+    schema = media_schema.MEDIA_PROFILE_SCHEMAS[expand]
+
+    async def load_page():
+        media_list, next_cursor = await async_crud.get_media_list(db_session, cursor=cursor, limit=limit,
+                                                                  profile=expand)
+        items = [schema.from_orm(db_media) for db_media in media_list]
+        return jsonable_encoder({"items": items, "next_cursor": next_cursor})
+
+    # Expanded pages also change with the artists, albums and genres they embed.
+    tags = ["media:list"] + (["artist:list", "album:list", "genre:list"] if expand else [])
+    page = await cache.get_or_load(f"media:list:{expand}:{cursor}:{limit}", load_page, tags=tags)
+    view_counts = views.merged_many({media["media_id"]: media["view_count"] for media in page["items"]})
+    items = [{**media, "view_count": view_counts[media["media_id"]]} for media in page["items"]]
+    return {"items": items, "next_cursor": page["next_cursor"]}
+
+
+@router.get("/media/{media_id}", response_model=media_schema.MediaResponse)
+async def read_media(media_id: int, db_session: AsyncSession = Depends(database.get_async_read_db),
+views: view_counter.ViewCounter = Depends(view_counter.get_view_counter),
+cache: response_cache.ResponseCache = Depends(response_cache.get_response_cache)):
+    """
+    Get media by Media ID router.
+    :param media_id: The Media ID.
+    :param db_session: The async database session.
+    :param views: The media view counter.
+    :param cache: The response cache.
+    """
+    async def load_media():
+        db_media = await async_crud.get_media(db_session, media_id=media_id)
+        if db_media is None:
+            return None
+        return jsonable_encoder(media_schema.MediaResponse.from_orm(db_media))
+
+    media = await cache.get_or_load(f"media:{media_id}", load_media, tags=[f"media:{media_id}"])
+    if media is None:
+        raise HTTPException(status_code=404, detail="Media not found")
+    return {**media, "view_count": views.merged(media_id, media["view_count"])}
+
+
+@router.get("/media/{media_id}/content")
+async def read_media_content(media_id: int, request: Request,
+db_session: AsyncSession = Depends(database.get_async_read_db),
+storage_backend: storage.StorageBackend = Depends(storage.get_storage)):
+    """
+    Stream media content router, honouring Range and If-Range headers.
+    :param media_id: The Media ID.
+    :param request: The incoming request.
+    :param db_session: The async database session.
+    :param storage_backend: The media storage backend.
+    """
+    db_media = await async_crud.get_media(db_session, media_id=media_id)
+    if db_media is None:
+        raise HTTPException(status_code=404, detail="Media not found")
+    if not db_media.s3_media_path:
+        raise HTTPException(status_code=404, detail="Media content not found")
+    try:
+        stored = await run_in_threadpool(storage_backend.stat, db_media.s3_media_path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Media content not found")
+
+    byte_range = None
+    range_header = request.headers.get("range")
+    if range_header and if_range_matches(request.headers.get("if-range"), stored):
+        try:
+            byte_range = parse_range_header(range_header, stored.size)
+        except RangeNotSatisfiable:
+            return Response(status_code=416, headers={"Content-Range": f"bytes */{stored.size}"})
+
+    media_type = mimetypes.guess_type(db_media.s3_media_path)[0] or "application/octet-stream"
+    return MediaRangeResponse(storage_backend, stored, byte_range=byte_range, media_type=media_type)
+
+
+@router.get("/media/{media_id}/hls/{path:path}")
+async def read_media_hls(media_id: int, path: str, request: Request,
+db_session: AsyncSession = Depends(database.get_async_read_db),
+cache: response_cache.ResponseCache = Depends(response_cache.get_response_cache),
+storage_backend: storage.StorageBackend = Depends(storage.get_storage),
+segments: segment_cache.SegmentCache = Depends(segment_cache.get_segment_cache)):
+    """
+    Get an HLS playlist or segment of a packaged media router, e.g.
+    `master.m3u8`, `128k/index.m3u8` or `128k/segment_00000.ts`, served
+    from the segment cache and honouring If-None-Match and If-Modified-Since.
+    :param media_id: The Media ID.
+    :param path: The file path below the media's HLS output.
+    :param request: The incoming request.
+    :param db_session: The async database session.
+    :param cache: The response cache.
+    :param storage_backend: The media storage backend.
+    :param segments: The segment cache.
+    """
+    path = posixpath.normpath(path)
+    if path.startswith(("..", "/")) or posixpath.splitext(path)[1] not in HLS_MEDIA_TYPES:
+        raise HTTPException(status_code=404, detail="Media content not found")
+    async def load_media_path():
+        db_media = await async_crud.get_media(db_session, media_id=media_id)
+        if db_media is None:
+            return None
+        return {"s3_media_path": db_media.s3_media_path}
+
+    # Segment requests only need the storage path, cached apart from the full media.
+    media = await cache.get_or_load(f"media:{media_id}:path", load_media_path, tags=[f"media:{media_id}"])
+    if media is None:
+        raise HTTPException(status_code=404, detail="Media not found")
+    if not media["s3_media_path"]:
+        raise HTTPException(status_code=404, detail="Media content not found")
+    key = f"{output_prefix(media['s3_media_path'])}/{path}"
+    try:
+        stored, data = await segments.fetch(storage_backend, key)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Media content not found")
+
+    headers = {"Cache-Control": segment_cache.cache_control(key)}
+    if is_not_modified(request.headers.get("if-none-match"), request.headers.get("if-modified-since"), stored):
+        headers.update({"ETag": stored.etag, "Last-Modified": stored.last_modified})
+        return Response(status_code=304, headers=headers)
+    segments.record_served(stored.size)
+    media_type = HLS_MEDIA_TYPES[posixpath.splitext(path)[1]]
+    if data is None:
+        return MediaRangeResponse(storage_backend, stored, media_type=media_type, headers=headers)
+    headers.update({"ETag": stored.etag, "Last-Modified": stored.last_modified})
+    return Response(content=data, media_type=media_type, headers=headers)
+
+
+@router.get("/media/{media_id}/similar", response_model=media_schema.SimilarMediaList)
+def read_similar_media(media_id: int, limit: int = Query(10, ge=1, le=100),
+nprobe: Optional[int] = Query(None, ge=1),
+index: vector_index.VectorIndexService = Depends(vector_index.get_vector_index)):
+    """
+    Get the media most similar to a media router, from the approximate
+    nearest-neighbour index of media embeddings.
+    :param media_id: The Media ID.
+    :param limit: The number of similar media to return.
+    :param nprobe: The index clusters to scan; higher trades latency for recall.
+    :param index: The media vector index.
+    """
+    similar = index.similar(media_id, limit, nprobe)
+    if similar is None:
+        raise HTTPException(status_code=404, detail="Media not indexed")
+    return {"items": [{"media_id": similar_id, "score": score} for similar_id, score in similar]}
+
+
+@router.get("/media/{media_id}/comments", response_model=comment_schema.CommentPage)
+async def read_media_comments(media_id: int, cursor: Optional[str] = None, limit: int = 100,
+db_session: AsyncSession = Depends(database.get_async_read_db)):
+    """
+    Get a page of comments on a media router.
+    :param media_id: The Media ID.
+    :param cursor: The `next_cursor` of the previous page.
+    :param limit: The number of comments to retrieve per query.
+    :param db_session: The async database session.
+    """
+    comments, next_cursor = await async_crud.get_media_comments(db_session, media_id=media_id,
+                                                                 cursor=cursor, limit=limit)
+    return {"items": comments, "next_cursor": next_cursor}
+
+
+@router.post("/media/{media_id}/package", response_model=tasks_schema.TaskStatus, status_code=202)
+async def create_media_package(media_id: int, db_session: AsyncSession = Depends(database.get_async_read_db)):
+    """
+    Start packaging a media file as multi-rendition HLS router.
+    :param media_id: The Media ID.
+    :param db_session: The async database session.
+    """
+    db_media = await async_crud.get_media(db_session, media_id=media_id)
+    if db_media is None or not db_media.s3_media_path:
+        raise HTTPException(status_code=404, detail="Media not found")
+    task_run = await run_in_threadpool(package_media.delay, media_id)
+    return {"task_id": task_run.id, "task_status": "PENDING", "task_result": None}
+
+
+@router.get("/media/{media_id}/package/{task_id}", response_model=tasks_schema.TaskStatus)
+def read_media_package(media_id: int, task_id: str):
+    """
+    Get the status of a media packaging task router. While running, the
+    result holds `done` and `total` segment counts.
+    :param media_id: The Media ID.
+    :param task_id: The packaging Task ID.
+    """
+    return crud.get_task(task_id=task_id)
@@ -0,0 +1,108 @@
+"""This module is for the playlists router."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from api.helpers import async_crud, playlist_order
+from api.schemas import playlist_media_schema, playlist_schema, status_schema
+from api.worker import renumber_playlist
+from .. import database
+
+
+router = APIRouter()
+
+
+@router.get("/playlists", response_model=playlist_schema.PlaylistPage)
+async def read_playlists(user_id: Optional[int] = None, cursor: Optional[str] = None, limit: int = 100,
+db_session: AsyncSession = Depends(database.get_async_read_db)):
+    """
+    Get a page of playlists router.
+    :param user_id: Only return playlists of this User ID.
+    :param cursor: The `next_cursor` of the previous page.
+    :param limit: The number of playlists to retrieve per query.
+    :param db_session: The async database session.
+    """
+    playlists, next_cursor = await async_crud.get_playlists(db_session, user_id=user_id,
+                                                            cursor=cursor, limit=limit)
+    return {"items": playlists, "next_cursor": next_cursor}
+
+
+@router.get("/playlists/{playlist_id}/media", response_model=playlist_media_schema.PlaylistMediaPage)
+async def read_playlist_media(playlist_id: int, cursor: Optional[str] = None, limit: int = 100,
+db_session: AsyncSession = Depends(database.get_async_read_db)):
+    """
+    Get a page of the entries of a playlist in playing order router.
+    :param playlist_id: The Playlist ID.
+    :param cursor: The `next_cursor` of the previous page.
+    :param limit: The number of entries to retrieve per query.
+    :param db_session: The async database session.
+    """
+    entries, next_cursor = await async_crud.get_playlist_entries(db_session, playlist_id=playlist_id,
+                                                                 cursor=cursor, limit=limit)
+    return {"items": entries, "next_cursor": next_cursor}
+
+
+@router.post("/playlists/{playlist_id}/media", response_model=playlist_media_schema.PlaylistMediaList,
+             status_code=201)
+async def create_playlist_media(playlist_id: int, entries: playlist_media_schema.PlaylistMediaBulkCreate,
+db_session: AsyncSession = Depends(database.get_async_db)):
+    """
+    Append media to a playlist, or insert them ahead of `before_entry_id`,
+    router. All entries are written with one statement.
+    :param playlist_id: The Playlist ID.
+    :param entries: The Media IDs in order and where to put them.
+    :param db_session: The async database session.
+    """
+    if not 1 <= len(entries.media_ids) <= playlist_order.MAX_BULK_ENTRIES:
+        raise HTTPException(status_code=422,
+                            detail=f"media_ids must hold 1 to {playlist_order.MAX_BULK_ENTRIES} items")
+    if await async_crud.get_existing_media_ids(db_session, entries.media_ids) != set(entries.media_ids):
+        raise HTTPException(status_code=404, detail="Media not found")
+    added = await async_crud.add_playlist_entries(db_session, playlist_id=playlist_id, media_ids=entries.media_ids,
+                                                  before_entry_id=entries.before_entry_id)
+    if added is None:
+        raise HTTPException(status_code=404, detail="Playlist or entry not found")
+    db_entries, crowded = added
+    if crowded:
+        await run_in_threadpool(renumber_playlist.delay, playlist_id)
+    return {"items": db_entries}
+
+
+@router.patch("/playlists/{playlist_id}/media/{entry_id}", response_model=playlist_media_schema.PlaylistMediaResponse)
+async def move_playlist_media(playlist_id: int, entry_id: int, move: playlist_media_schema.PlaylistMediaMove,
+db_session: AsyncSession = Depends(database.get_async_db)):
+    """
+    Move a playlist entry ahead of `before_entry_id`, or to the end, router.
+    :param playlist_id: The Playlist ID.
+    :param entry_id: The entry to move.
+    :param move: Where to move it.
+    :param db_session: The async database session.
+    """
+    moved = await async_crud.move_playlist_entry(db_session, playlist_id=playlist_id, entry_id=entry_id,
+                                                 before_entry_id=move.before_entry_id)
+    if moved is None:
+        raise HTTPException(status_code=404, detail="Playlist or entry not found")
+    db_entry, crowded = moved
+    if crowded:
+        await run_in_threadpool(renumber_playlist.delay, playlist_id)
+    return db_entry
+
+
+@router.delete("/playlists/{playlist_id}/media/{entry_id}", response_model=status_schema.Status)
+async def delete_playlist_media(playlist_id: int, entry_id: int,
+db_session: AsyncSession = Depends(database.get_async_db)):
+    """
+    Remove an entry from a playlist router.
+    :param playlist_id: The Playlist ID.
+    :param entry_id: The entry to remove.
+    :param db_session: The async database session.
+    """
+    if await async_crud.delete_playlist_entry(db_session, playlist_id=playlist_id, entry_id=entry_id) is None:
+        raise HTTPException(status_code=404, detail="Playlist entry not found")
+    return status_schema.Status(status=f"Deleted playlist entry {entry_id}")
@@ -0,0 +1,66 @@
+"""This module is for the plays router."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from api.helpers import async_crud, charts, event_hub, play_ingest, view_counter
+from api.schemas import play_history_schema, status_schema
+from .. import database
+
+
+router = APIRouter()
+
+
+@router.post("/plays", response_model=status_schema.Status, status_code=202)
+async def create_play(play: play_history_schema.PlayEventCreate,
+play_buffer: play_ingest.PlayIngestBuffer = Depends(play_ingest.get_play_buffer),
+views: view_counter.ViewCounter = Depends(view_counter.get_view_counter),
+hub: event_hub.EventHub = Depends(event_hub.get_event_hub),
+chart_counter: charts.ChartCounter = Depends(charts.get_chart_counter)):
+    """
+    Accept a play event for buffered insertion router.
+    :param play: The play event schema.
+    :param play_buffer: The play ingestion buffer.
+    :param views: The media view counter.
+    :param hub: The event hub.
+    :param chart_counter: The chart play counter.
+    """
+    try:
+        play_buffer.add(user_id=play.user_id, media_id=play.media_id, played_at=play.played_at)
+    except play_ingest.BufferFull:
+        raise HTTPException(status_code=429, detail="Play buffer full",
+                            headers={"Retry-After": str(max(1, round(play_buffer.flush_interval)))})
+    views.increment(play.media_id)
+    chart_counter.record(play.media_id, play.played_at)
+    hub.publish("now_playing", {"user_id": play.user_id, "media_id": play.media_id},
+                topics=[f"media:{play.media_id}", f"user:{play.user_id}"])
+    return status_schema.Status(status="accepted")
+
+
+@router.get("/plays/stats", response_model=play_history_schema.PlayIngestStats)
+async def read_play_stats(play_buffer: play_ingest.PlayIngestBuffer = Depends(play_ingest.get_play_buffer)):
+    """
+    Get play ingestion counters router.
+    :param play_buffer: The play ingestion buffer.
+    """
+    return play_buffer.snapshot()
+
+
+@router.get("/users/{user_id}/plays", response_model=play_history_schema.PlayHistoryPage)
+async def read_user_plays(user_id: int, cursor: Optional[str] = None, limit: int = 100,
+db_session: AsyncSession = Depends(database.get_async_read_db)):
+    """
+    Get a page of a user's play history router, newest first.
+    :param user_id: The User ID.
+    :param cursor: The `next_cursor` of the previous page.
+    :param limit: The number of plays to retrieve per query.
+    :param db_session: The async database session.
+    """
+    plays, next_cursor = await async_crud.get_play_history(db_session, user_id=user_id,
+                                                           cursor=cursor, limit=limit)
+    return {"items": plays, "next_cursor": next_cursor}
@@ -0,0 +1,56 @@
+"""This module is for the ratings router."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+from fastapi import APIRouter, HTTPException, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from api.helpers import async_crud
+from api.schemas import rating_schema, status_schema
+from .. import database
+
+
+router = APIRouter()
+
+
+@router.post("/ratings", response_model=rating_schema.RatingResponse)
+async def create_rating(rating: rating_schema.RatingCreate,
+db_session: AsyncSession = Depends(database.get_async_db)):
+    """
+    Rate a media router, replacing the user's previous rating of it.
+    :param rating: The rating schema.
+    :param db_session: The async database session.
+    """
+    if await async_crud.get_media(db_session, media_id=rating.media_id) is None:
+        raise HTTPException(status_code=404, detail="Media not found")
+    return await async_crud.rate_media(db_session, rating=rating)
+
+
+@router.patch("/ratings/{rating_id}", response_model=rating_schema.RatingResponse)
+async def update_rating(rating_id: int, rating: rating_schema.RatingUpdate,
+db_session: AsyncSession = Depends(database.get_async_db)):
+    """
+    Update a rating by Rating ID router.
+    :param rating_id: The Rating ID.
+    :param rating: The rating update schema.
+    :param db_session: The async database session.
+    """
+    db_rating = await async_crud.update_rating(db_session, rating_id=rating_id, rating=rating)
+    if db_rating is None:
+        raise HTTPException(status_code=404, detail="Rating not found")
+    return db_rating
+
+
+@router.delete("/ratings/{rating_id}", response_model=status_schema.Status)
+async def delete_rating(rating_id: int, db_session: AsyncSession = Depends(database.get_async_db)):
+    """
+    Soft-delete a rating by Rating ID router.
+    :param rating_id: The Rating ID.
+    :param db_session: The async database session.
+    """
+    db_rating = await async_crud.delete_rating(db_session, rating_id=rating_id)
+    if db_rating is None:
+        raise HTTPException(status_code=404, detail="Rating not found")
+    return status_schema.Status(status=f"Deleted rating {rating_id}")
@@ -0,0 +1,37 @@
+"""This module is for the recommendations router."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import json
+from fastapi import APIRouter, HTTPException, Depends, Query
+from redis.exceptions import RedisError
+from api.helpers import recommendations
+from api.schemas import recommendation_schema
+from .. import database
+
+
+router = APIRouter()
+
+
+@router.get("/users/{user_id}/recommendations", response_model=recommendation_schema.RecommendationList)
+async def read_user_recommendations(user_id: int, limit: int = Query(20, ge=1, le=100),
+redis_client=Depends(database.get_async_redis)):
+    """
+    Get the precomputed recommendations of a user router. Users without
+    any fall back to the most popular media.
+    :param user_id: The User ID.
+    :param limit: The number of recommendations to return.
+    :param redis_client: The async Redis client.
+    """
+    try:
+        personal, popular = await redis_client.mget(recommendations.user_key(user_id),
+                                                    recommendations.POPULAR_KEY)
+    except RedisError:
+        raise HTTPException(status_code=503, detail="Recommendations unavailable")
+    stored = json.loads(personal or popular or '{"generated_at": null, "items": []}')
+    return {"user_id": user_id, "personalized": personal is not None,
+            "generated_at": stored["generated_at"],
+            "items": [{"media_id": media_id, "score": score} for media_id, score in stored["items"][:limit]]}
@@ -0,0 +1,42 @@
+"""This module is for the search router."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+from fastapi import APIRouter, Depends, Query
+from api.helpers import autocomplete, search_index
+from api.schemas import search_schema
+
+
+MAX_SEARCH_RESULTS = 100
+
+router = APIRouter()
+
+
+@router.get("/search", response_model=search_schema.SearchResults)
+def search_media(q: str = Query(..., min_length=1, max_length=255), limit: int = 20,
+index: search_index.SearchIndex = Depends(search_index.get_search_index)):
+    """
+    Full-text search of media by title, artist, album and genre router.
+    :param q: The query text; its last word matches as a prefix.
+    :param limit: The number of hits.
+    :param index: The media search index.
+    """
+    hits = index.search(q, limit=min(max(limit, 1), MAX_SEARCH_RESULTS))
+    return {"items": [{**stored, "score": score} for score, stored in hits]}
+
+
+@router.get("/suggest", response_model=search_schema.Suggestions)
+def suggest(q: str = Query(..., min_length=1, max_length=255), limit: int = 10,
+index: autocomplete.SuggestIndex = Depends(autocomplete.get_suggest_index)):
+    """
+    Typeahead suggestions of media titles, artist and album names router.
+    :param q: The typed text.
+    :param limit: The number of suggestions.
+    :param index: The typeahead index.
+    """
+    suggestions = index.suggest(q, limit=max(limit, 1))
+    return {"items": [{"kind": kind, "id": entity_id, "text": text, "view_count": view_count}
+                      for (kind, entity_id), text, view_count in suggestions]}
@@ -0,0 +1,63 @@
+"""This module is for the listening party sessions router."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import json
+import time
+from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
+from api.helpers import listening_party
+from api.schemas import party_schema
+
+
+router = APIRouter()
+
+
+@router.websocket("/ws/sessions/{session_id}")
+async def listening_party_session(websocket: WebSocket, session_id: str, host: bool = False,
+party: listening_party.PartyHub = Depends(listening_party.get_party_hub)):
+    """
+    Listening party channel router. Every client may send
+    `{"type": "time_sync", "client_time": t}` and gets the server time back
+    to estimate its clock offset. The host sends
+    `{"type": "position", "media_id": 1, "position": 12.5, "playing": true}`;
+    followers receive `state` messages with the position at `server_time`.
+    :param websocket: The connection.
+    :param session_id: The session ID.
+    :param host: Whether this connection controls playback.
+    :param party: The listening party hub.
+    """
+    await websocket.accept()
+    try:
+        session = await party.join(session_id, websocket, host=host)
+    except listening_party.HostTaken:
+        await websocket.close(code=4409)
+        return
+    try:
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+                kind = message.get("type")
+            except (ValueError, AttributeError):
+                await websocket.send_json({"type": "error", "detail": "Invalid message"})
+                continue
+            if kind == "time_sync":
+                await websocket.send_json({"type": "time_sync", "client_time": message.get("client_time"),
+                                           "server_time": time.time()})
+            elif kind == "position" and host:
+                try:
+                    position = party_schema.PartyPosition(**message)
+                except ValidationError:
+                    await websocket.send_json({"type": "error", "detail": "Invalid position"})
+                    continue
+                party.update(session, media_id=position.media_id, position=position.position,
+                             playing=position.playing)
+            else:
+                await websocket.send_json({"type": "error", "detail": f"Unexpected message {kind}"})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        party.leave(session, websocket)
@@ -5,36 +5,49 @@
 # 2.Related Library Imports
 # 3.Local application/library imports
 #--------------------------------------------#
-import asyncio
+import json
+from typing import Optional
 from sse_starlette.sse import EventSourceResponse
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from api.helpers import event_hub
 
 
-STREAM_DELAY = 1  # second
 RETRY_TIMEOUT = 15000  # milisecond
+MAX_TOPICS = 50
 
 router = APIRouter()
 
 @router.get('/stream')
-async def message_stream(request: Request):
-    def new_messages():
-        # Add logic here to check for new messages
-        yield 'Message'
-    async def event_generator():
-        while True:
-            # If client closes connection, stop sending events
-            if await request.is_disconnected():
-                break
+async def message_stream(topics: str = Query(..., description="Comma separated topics, e.g. media:42,user:7"),
+last_event_id: Optional[str] = Header(None),
+hub: event_hub.EventHub = Depends(event_hub.get_event_hub)):
+    """
+    Server-sent events of the given topics router: `now_playing` and
+    `new_comment` on `media:{id}`, `new_follower` on `artist:{id}`, and
+    the plays and follows of a user on `user:{id}`.
+    :param topics: The topics to receive.
+    :param last_event_id: The id of the last event received before reconnecting.
+    :param hub: The event hub.
+    """
+    topics = {topic.strip() for topic in topics.split(",") if topic.strip()}
+    if not topics or len(topics) > MAX_TOPICS:
+        raise HTTPException(status_code=400, detail=f"Between 1 and {MAX_TOPICS} topics are required")
+    subscriber = hub.subscribe(topics, last_event_id)
 
-            # Checks for new messages and return them to client if any
-            if new_messages():
+    async def event_generator():
+        try:
+            while True:
+                item = await subscriber.queue.get()
+                # None means the hub dropped this client; it resumes by reconnecting.
+                if item is None:
+                    break
                 yield {
-                        "event": "new_message",
-                        "id": "message_id",
+                        "event": item["event"],
+                        "id": item["id"],
                         "retry": RETRY_TIMEOUT,
-                        "data": "message_content"
+                        "data": json.dumps(item["data"])
                 }
-
-            await asyncio.sleep(STREAM_DELAY)
+        finally:
+            hub.unsubscribe(subscriber)
 
     return EventSourceResponse(event_generator())
@@ -5,7 +5,7 @@
 # 2.Related Library Imports
 # 3.Local application/library imports
 #--------------------------------------------#
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
 from api.helpers import crud
@@ -29,19 +29,17 @@ def create_user(user: users_schema.UserCreate, db_session: Session = Depends(dat
     return crud.create_user(db_session=db_session, user=user)
 
 
-@router.get("/users/", response_model=List[users_schema.User])
-def read_users(skip: int = 0, limit: int = 100,
+@router.get("/users/", response_model=users_schema.UserPage)
+def read_users(cursor: Optional[str] = None, limit: int = 100,
 db_session: Session = Depends(database.get_db)):
     """
-    Get all users router.
-    :param skip: The offset used when paging.
+    Get a page of users router.
+    :param cursor: The `next_cursor` of the previous page.
     :param limit: The number of users to retrieve per query.
     :param db_session: The database session.
     """
-    users = crud.get_users(db_session, skip=skip, limit=limit)
-    if not users:
-        raise HTTPException(status_code=404, detail="No users found")
-    return users
+    users, next_cursor = crud.get_users(db_session, cursor=cursor, limit=limit)
+    return {"items": users, "next_cursor": next_cursor}
 
 
 @router.get("/users/{user_id}", response_model=users_schema.User)
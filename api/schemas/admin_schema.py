@@ -0,0 +1,115 @@
+"""Pydantic Admin schemas."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+from typing import Optional
+from pydantic import BaseModel
+
+
+class PoolMetrics(BaseModel):
+    """
+    Connection Pool Metrics Schema.
+    """
+    name: str
+    checkouts: int
+    checkins: int
+    connects: int
+    invalidations: int
+    timeouts: int
+    wait_ms_avg: float
+    wait_ms_max: float
+    connect_ms_avg: float
+    connect_ms_max: float
+    size: Optional[int] = None
+    checked_in: Optional[int] = None
+    checked_out: Optional[int] = None
+    overflow: Optional[int] = None
+
+
+class ResponseCacheMetrics(BaseModel):
+    """
+    Response Cache Metrics Schema.
+    """
+    local_hits: int
+    redis_hits: int
+    misses: int
+    coalesced: int
+    evictions: int
+    invalidations: int
+    local_entries: int
+
+
+class EventHubMetrics(BaseModel):
+    """
+    Event Hub Metrics Schema.
+    """
+    published: int
+    delivered: int
+    evicted: int
+    dropped: int
+    subscribers: int
+    topics: int
+    replay_buffered: int
+    outbox: int
+
+
+class SegmentCacheMetrics(BaseModel):
+    """
+    Segment Cache Metrics Schema.
+    """
+    memory_hits: int
+    disk_hits: int
+    misses: int
+    coalesced: int
+    bypassed: int
+    evictions: int
+    spilled: int
+    bytes_served: int
+    hit_ratio: float
+    memory_entries: int
+    memory_bytes: int
+    disk_entries: int
+    disk_bytes: int
+
+
+class VectorIndexMetrics(BaseModel):
+    """
+    Vector Index Metrics Schema.
+    """
+    queries: int
+    reloads: int
+    version: Optional[str] = None
+    count: int
+    dim: int
+    nlist: int
+    nprobe: int
+    recall_at_10: Optional[float] = None
+
+
+class ChartCounterMetrics(BaseModel):
+    """
+    Chart Counter Metrics Schema.
+    """
+    recorded: int
+    flushes: int
+    flush_errors: int
+    pending: int
+
+
+class RateLimitMetrics(BaseModel):
+    """
+    Rate Limit and Admission Control Metrics Schema.
+    """
+    allowed: int
+    limited: int
+    syncs: int
+    sync_errors: int
+    buckets: int
+    admitted: int
+    shed: int
+    in_flight: int
+    waiting: int
+    max_wait: float
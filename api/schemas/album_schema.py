@@ -1,7 +1,7 @@
 from datetime import date, datetime
 from typing import Optional
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field
 
 # Pydantic Models
 class AlbumBase(BaseModel):
@@ -21,4 +21,5 @@ class AlbumResponse(AlbumBase):
     updated_at: datetime
     deleted_at: Optional[datetime]
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    class Config:
+        orm_mode = True
\ No newline at end of file
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field
 
 class ArtistBase(BaseModel):
     artist_name: str = Field(..., min_length=1, max_length=255)
@@ -17,4 +17,5 @@ class ArtistResponse(ArtistBase):
     updated_at: datetime
     deleted_at: Optional[datetime]
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    class Config:
+        orm_mode = True
\ No newline at end of file
@@ -0,0 +1,28 @@
+"""Pydantic Chart schemas."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+from typing import List, Optional
+from pydantic import BaseModel
+
+
+class ChartEntry(BaseModel):
+    """
+    Chart Entry Schema.
+    """
+    id: int
+    score: float
+
+
+class Chart(BaseModel):
+    """
+    Chart Schema.
+    """
+    window: str
+    scope: str
+    scope_id: Optional[int] = None
+    generated_at: Optional[float] = None
+    items: List[ChartEntry]
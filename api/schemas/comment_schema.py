@@ -1,7 +1,7 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field
 
 class CommentBase(BaseModel):
     user_id: int
@@ -17,4 +17,9 @@ class CommentResponse(CommentBase):
     updated_at: datetime
     deleted_at: Optional[datetime]
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    class Config:
+        orm_mode = True
+
+class CommentPage(BaseModel):
+    items: List[CommentResponse]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,19 @@
+"""Pydantic Feed schemas."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+from typing import List, Optional
+from pydantic import BaseModel
+
+from api.schemas.media_schema import MediaCard
+
+
+class FeedPage(BaseModel):
+    """
+    Feed Page Schema.
+    """
+    items: List[MediaCard]
+    next_cursor: Optional[str] = None
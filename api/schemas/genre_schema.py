@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field
 
 class GenreBase(BaseModel):
     genre_name: str = Field(..., min_length=1, max_length=255)
@@ -16,4 +16,5 @@ class GenreResponse(GenreBase):
     updated_at: datetime
     deleted_at: Optional[datetime]
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    class Config:
+        orm_mode = True
\ No newline at end of file
@@ -1,7 +1,7 @@
 from datetime import datetime, time
-from typing import Optional
+from typing import List, Optional, Union
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field
 
 from api.models.media_model import MediaTypeEnum
 
@@ -22,8 +22,101 @@ class MediaCreate(MediaBase):
 
 class MediaResponse(MediaBase):
     media_id: int
+    rating_count: int = 0
+    rating_average: Optional[float] = None
+    rating_histogram: List[int] = [0, 0, 0, 0, 0]
     created_at: datetime
     updated_at: datetime
     deleted_at: Optional[datetime]
 
-    model_config = ConfigDict(from_attributes=True)
+    class Config:
+        orm_mode = True
+
+
+class MediaPage(BaseModel):
+    items: List[MediaResponse]
+    next_cursor: Optional[str] = None
+
+
+class ArtistRef(BaseModel):
+    artist_id: int
+    artist_name: str
+
+    class Config:
+        orm_mode = True
+
+
+class AlbumRef(BaseModel):
+    album_id: int
+    album_title: str
+    cover_art: Optional[str] = None
+
+    class Config:
+        orm_mode = True
+
+
+class GenreRef(BaseModel):
+    genre_id: int
+    genre_name: str
+
+    class Config:
+        orm_mode = True
+
+
+# Responses of the `?expand=` loading profiles.
+class MediaCard(BaseModel):
+    media_id: int
+    media_title: str
+    media_type: MediaTypeEnum
+    duration: Optional[time] = None
+    thumbnail_image_path: Optional[str] = None
+    view_count: Optional[int] = 0
+    is_premium_only: Optional[bool] = False
+    rating_count: int = 0
+    rating_average: Optional[float] = None
+    artists: List[ArtistRef]
+
+    class Config:
+        orm_mode = True
+
+
+class MediaDetail(MediaResponse):
+    artists: List[ArtistRef]
+    albums: List[AlbumRef]
+    genres: List[GenreRef]
+
+
+class MediaFull(MediaDetail):
+    favorite_count: int
+    comment_count: int
+
+
+class MediaCardPage(BaseModel):
+    items: List[MediaCard]
+    next_cursor: Optional[str] = None
+
+
+class MediaDetailPage(BaseModel):
+    items: List[MediaDetail]
+    next_cursor: Optional[str] = None
+
+
+class MediaFullPage(BaseModel):
+    items: List[MediaFull]
+    next_cursor: Optional[str] = None
+
+
+MEDIA_PROFILE_SCHEMAS = {None: MediaResponse, "card": MediaCard, "detail": MediaDetail, "full": MediaFull}
+
+
+class SimilarMedia(BaseModel):
+    media_id: int
+    score: float
+
+
+class SimilarMediaList(BaseModel):
+    items: List[SimilarMedia]
+
+
+# Most specific first, so each page validates as the profile that built it.
+MediaListPage = Union[MediaFullPage, MediaDetailPage, MediaPage, MediaCardPage]
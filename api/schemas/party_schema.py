@@ -0,0 +1,28 @@
+"""Pydantic Listening Party schemas."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+from pydantic import BaseModel, Field
+
+
+class PartyPosition(BaseModel):
+    """
+    Host Playback Position Message Schema.
+    """
+    media_id: int
+    position: float = Field(..., ge=0)
+    playing: bool
+
+
+class PartyMetrics(BaseModel):
+    """
+    Listening Party Metrics Schema.
+    """
+    updates_received: int
+    messages_sent: int
+    dropped: int
+    sessions: int
+    followers: int
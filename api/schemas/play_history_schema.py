@@ -1,6 +1,7 @@
 from datetime import datetime
+from typing import List, Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel
 
 class PlayHistoryBase(BaseModel):
     user_id: int
@@ -11,8 +12,32 @@ class PlayHistoryCreate(PlayHistoryBase):
     pass
 
 
+class PlayEventCreate(PlayHistoryBase):
+    played_at: Optional[datetime] = None
+
+
+class PlayIngestStats(BaseModel):
+    accepted: int
+    dropped: int
+    flushed: int
+    flushes: int
+    flush_errors: int
+    rejected: int
+    last_batch_size: int
+    last_flush_latency_ms: float
+    max_flush_latency_ms: float
+    pending: int
+    capacity: int
+
+
 class PlayHistoryResponse(PlayHistoryBase):
     history_id: int
     played_at: datetime
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    class Config:
+        orm_mode = True
+
+
+class PlayHistoryPage(BaseModel):
+    items: List[PlayHistoryResponse]
+    next_cursor: Optional[str] = None
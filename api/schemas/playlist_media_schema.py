@@ -1,4 +1,7 @@
-from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
 
 
 class PlaylistMediaBase(BaseModel):
@@ -9,4 +12,23 @@ class PlaylistMediaCreate(PlaylistMediaBase):
     pass
 
 class PlaylistMediaResponse(PlaylistMediaBase):
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    entry_id: int
+    position: int
+    added_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
+
+class PlaylistMediaPage(BaseModel):
+    items: List[PlaylistMediaResponse]
+    next_cursor: Optional[str] = None
+
+class PlaylistMediaList(BaseModel):
+    items: List[PlaylistMediaResponse]
+
+class PlaylistMediaBulkCreate(BaseModel):
+    media_ids: List[int]
+    before_entry_id: Optional[int] = None
+
+class PlaylistMediaMove(BaseModel):
+    before_entry_id: Optional[int] = None
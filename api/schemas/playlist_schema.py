@@ -1,7 +1,7 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field
 
 class PlaylistBase(BaseModel):
     playlist_title: str = Field(..., min_length=1, max_length=255)
@@ -18,4 +18,9 @@ class PlaylistResponse(PlaylistBase):
     updated_at: datetime
     deleted_at: Optional[datetime]
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    class Config:
+        orm_mode = True
+
+class PlaylistPage(BaseModel):
+    items: List[PlaylistResponse]
+    next_cursor: Optional[str] = None
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field
 
 class RatingBase(BaseModel):
     user_id: int
@@ -13,10 +13,15 @@ class RatingCreate(RatingBase):
     pass
 
 
+class RatingUpdate(BaseModel):
+    rating: int = Field(..., ge=1, le=5)
+
+
 class RatingResponse(RatingBase):
     rating_id: int
     created_at: datetime
     updated_at: datetime
     deleted_at: Optional[datetime]
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    class Config:
+        orm_mode = True
\ No newline at end of file
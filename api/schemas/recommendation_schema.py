@@ -0,0 +1,27 @@
+"""Pydantic Recommendation schemas."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+from typing import List, Optional
+from pydantic import BaseModel
+
+
+class Recommendation(BaseModel):
+    """
+    Recommendation Schema.
+    """
+    media_id: int
+    score: float
+
+
+class RecommendationList(BaseModel):
+    """
+    Recommendation List Schema.
+    """
+    user_id: int
+    personalized: bool
+    generated_at: Optional[float] = None
+    items: List[Recommendation]
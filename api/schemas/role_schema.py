@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field
 
 # Pydantic Models for Request/Response Validation
 class RoleBase(BaseModel):
@@ -16,4 +16,5 @@ class RoleResponse(RoleBase):
     created_at: datetime
     updated_at: datetime
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    class Config:
+        orm_mode = True
\ No newline at end of file
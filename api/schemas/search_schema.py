@@ -0,0 +1,64 @@
+"""Pydantic Search schemas."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+from typing import List
+from pydantic import BaseModel
+
+
+class SearchHit(BaseModel):
+    """
+    Search Hit Schema.
+    """
+    media_id: int
+    media_title: str
+    artists: List[str] = []
+    score: float
+
+
+class SearchResults(BaseModel):
+    """
+    Search Results Schema.
+    """
+    items: List[SearchHit]
+
+
+class SearchIndexStats(BaseModel):
+    """
+    Search Index Stats Schema.
+    """
+    documents: int
+    terms: int
+    ready: bool
+    pending: int
+
+
+class Suggestion(BaseModel):
+    """
+    Typeahead Suggestion Schema.
+    """
+    kind: str
+    id: int
+    text: str
+    view_count: int
+
+
+class Suggestions(BaseModel):
+    """
+    Typeahead Suggestions Schema.
+    """
+    items: List[Suggestion]
+
+
+class SuggestIndexStats(BaseModel):
+    """
+    Typeahead Index Stats Schema.
+    """
+    entries: int
+    keys: int
+    cached_prefixes: int
+    ready: bool
+    pending: int
@@ -5,6 +5,7 @@
 # 2.Related Library Imports
 # 3.Local application/library imports
 #--------------------------------------------#
+from typing import Any
 from pydantic import BaseModel
 
 
@@ -35,3 +36,12 @@ class Task(TaskBase):
         Object Relational Mapping Mode.
         """
         orm_mode = True
+
+
+class TaskStatus(BaseModel):
+    """
+    Task Status Schema.
+    """
+    task_id: str
+    task_status: str
+    task_result: Any = None
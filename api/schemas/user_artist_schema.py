@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel
 
 
 class UserArtistBase(BaseModel):
@@ -9,4 +9,5 @@ class UserArtistCreate(UserArtistBase):
     pass
 
 class UserArtistResponse(UserArtistBase):
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    class Config:
+        orm_mode = True
\ No newline at end of file
@@ -6,8 +6,8 @@
 # 3.Local application/library imports
 #--------------------------------------------#
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, Field, EmailStr, ConfigDict
+from typing import List, Optional
+from pydantic import BaseModel, Field, EmailStr
 
 from api.schemas.role_schema import RoleResponse
 
@@ -31,10 +31,16 @@ class UserResponse(UserBase):
     updated_at: datetime
     deleted_at: Optional[datetime]
 
-    model_config = ConfigDict(from_attributes=True)
+    class Config:
+        orm_mode = True
+
+class UserPage(BaseModel):
+    items: List[UserResponse]
+    next_cursor: Optional[str] = None
 
 # Optional: Full User Details for Admin or Profile View
 class UserDetailResponse(UserResponse):
     role: RoleResponse
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    class Config:
+        orm_mode = True
\ No newline at end of file
@@ -6,6 +6,7 @@
 # 3.Local application/library imports
 #--------------------------------------------#
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 
@@ -16,6 +17,10 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_engine("sqlite+aiosqlite:///./test.db")
+TestingAsyncSessionLocal = sessionmaker(autoflush=False, expire_on_commit=False,
+                                        bind=async_engine, class_=AsyncSession)
+
 def override_get_db():
     """
     Override database with test database.
@@ -25,3 +30,10 @@ def override_get_db():
         yield db
     finally:
         db.close()
+
+async def override_get_async_db():
+    """
+    Override async database with test database.
+    """
+    async with TestingAsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,69 @@
+"""Tests for the catalog routes."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+from datetime import datetime
+import pytest
+from fastapi.testclient import TestClient
+from api.database import Base, get_async_read_db
+from api import main
+from api.helpers import response_cache
+from api.models.album_model import Album
+from api.models.artist_model import Artist
+from api.models.genre_model import Genre
+from api.tests.db import engine, override_get_async_db, TestingSessionLocal
+
+main.app.dependency_overrides[get_async_read_db] = override_get_async_db
+
+client = TestClient(main.app)
+
+
+@pytest.fixture()
+def catalog():
+    """
+    One album, artist and genre, served through a fresh response cache.
+    """
+    Base.metadata.create_all(bind=engine)
+    db_session = TestingSessionLocal()
+    db_session.add_all([Album(album_title="Album", release_date=datetime(2024, 1, 1)),
+                        Artist(artist_name="Artist"), Genre(genre_name="Genre")])
+    db_session.commit()
+    db_session.close()
+    main.app.dependency_overrides[response_cache.get_response_cache] = lambda: response_cache.ResponseCache(
+        local_max_entries=10, local_ttl=60, redis_ttl=60)
+    yield
+    main.app.dependency_overrides.pop(response_cache.get_response_cache)
+    Base.metadata.drop_all(bind=engine)
+
+
+def test_read_album(catalog):
+    """
+    Test an album is served and a missing one is not found.
+    """
+    response = client.get("/albums/1")
+    assert response.status_code == 200
+    assert response.json()["album_title"] == "Album"
+    assert client.get("/albums/2").status_code == 404
+
+
+def test_read_artist(catalog):
+    """
+    Test an artist is served and a missing one is not found.
+    """
+    response = client.get("/artists/1")
+    assert response.status_code == 200
+    assert response.json()["artist_name"] == "Artist"
+    assert client.get("/artists/2").status_code == 404
+
+
+def test_read_genre(catalog):
+    """
+    Test a genre is served and a missing one is not found.
+    """
+    response = client.get("/genres/1")
+    assert response.status_code == 200
+    assert response.json()["genre_name"] == "Genre"
+    assert client.get("/genres/2").status_code == 404
@@ -0,0 +1,127 @@
+"""Tests for bulk catalog imports."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import json
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from api import database, main
+from api.database import Base
+from api.helpers import catalog_import
+from api.models.album_artist_model import AlbumArtist
+from api.models.album_model import Album
+from api.models.artist_model import Artist
+from api.models.genre_model import Genre
+from api.models.media_artist_model import MediaArtist
+from api.models.media_genre_model import MediaGenre
+from api.models.media_model import Media, MediaTypeEnum
+from api.tests.db import engine, TestingSessionLocal
+
+
+CSV_FILE = (
+    "media_title,media_type,duration,artists,genres,album,album_release_date,is_premium_only\n"
+    "Song A,audio,00:03:10,Ann|Bob,Pop,First,2020-01-01,true\n"
+    "Song B,audio,,Bob,\"Pop|Rock\",First,2020-01-01,\n"
+    ",audio,,,,,,\n"
+    "Clip,film,,,,,,\n"
+    "Song C,video,00:01:00,Cy,,,,\n"
+).encode()
+
+
+def test_iter_lines_across_chunks():
+    """
+    Test lines split across byte chunks, including a multi-byte character.
+    """
+    data = "héllo\nwörld\nlast".encode()
+    chunks = [data[index:index + 3] for index in range(0, len(data), 3)]
+    assert list(catalog_import.iter_lines(chunks)) == ["héllo\n", "wörld\n", "last"]
+
+
+def test_run_import_upserts_and_links():
+    """
+    Test a CSV import resolves names once, links media, and that
+    re-importing updates media by title instead of duplicating them.
+    """
+    Base.metadata.create_all(bind=engine)
+    db_session = TestingSessionLocal()
+    try:
+        reports, batches = [], []
+        progress = catalog_import.run_import(db_session, [CSV_FILE[:40], CSV_FILE[40:]], "csv", len(CSV_FILE),
+                                             batch_size=2, report=reports.append, on_commit=batches.append)
+        assert (progress["rows"], progress["imported"], progress["failed"]) == (5, 3, 2)
+        assert [error["line"] for error in progress["errors"]] == [4, 5]
+        assert progress["artists_created"] == 3 and progress["bytes_read"] == len(CSV_FILE)
+        assert len(reports) == 2 and progress["rows_per_second"] > 0
+        assert db_session.query(MediaArtist).count() == 4
+        assert db_session.query(MediaGenre).count() == 3
+        assert db_session.query(AlbumArtist).count() == 2
+
+        update = json.dumps({"media_title": "Song C", "media_type": "audio", "artists": ["Cy", "Dee"]}).encode()
+        assert [batch.released for batch in batches] == [[1, 2], [3]]
+        assert {"media:1", "media:2", "media:list", "artist:list", "genre:list", "album:list"} \
+            <= set(batches[0].tags)
+        progress = catalog_import.run_import(db_session, [update], "ndjson", len(update), batch_size=10,
+                                             on_commit=batches.append)
+        assert progress["imported"] == 1
+        # Song C gains an artist, so reaches the feeds of Dee's followers.
+        assert batches[-1].released == [3]
+        assert db_session.query(Media).count() == 3
+        media = db_session.query(Media).filter(Media.media_title == "Song C").one()
+        assert media.media_type.value == "audio"
+        assert db_session.query(Artist).count() == 4
+    finally:
+        db_session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+def test_create_import_bounds_upload(monkeypatch):
+    """
+    Test uploads over the import size limit and empty uploads are refused.
+    """
+    monkeypatch.setattr(database.conf_settings, "IMPORT_MAX_BYTES", 16)
+    client = TestClient(main.app)
+    response = client.post("/imports", content=CSV_FILE)
+    assert response.status_code == 413
+    response = client.post("/imports", content=b"")
+    assert response.status_code == 422
+
+
+def test_run_import_matches_names_like_the_collation(tmp_path, monkeypatch):
+    """
+    Test titles and names differing only by case, in one batch or from
+    stored rows, resolve to one row under a case-insensitive collation, and
+    that an unexpected batch error fails its rows instead of the import.
+    """
+    nocase_engine = create_engine(f"sqlite:///{tmp_path / 'nocase.db'}")
+    with monkeypatch.context() as patch:
+        for column in (Media.media_title, Artist.artist_name, Genre.genre_name, Album.album_title):
+            patch.setattr(column.type, "collation", "NOCASE")
+        Base.metadata.create_all(bind=nocase_engine)
+    db_session = sessionmaker(bind=nocase_engine)()
+    try:
+        lines = [{"media_title": "Intro", "media_type": "audio", "artists": ["Ann"], "genres": ["Pop"]},
+                 {"media_title": "intro", "media_type": "audio", "artists": ["ANN", "Bob"], "genres": ["pop"]}]
+        data = "".join(json.dumps(line) + "\n" for line in lines).encode()
+        progress = catalog_import.run_import(db_session, [data], "ndjson", len(data), batch_size=10)
+        assert (progress["imported"], progress["failed"]) == (1, 0)
+        update = json.dumps({"media_title": "INTRO", "media_type": "video", "artists": ["bob"],
+                             "genres": ["POP"]}).encode()
+        progress = catalog_import.run_import(db_session, [update], "ndjson", len(update), batch_size=10)
+        assert (progress["imported"], progress["failed"], progress["artists_created"]) == (1, 0, 0)
+        assert db_session.query(Media.media_title, Media.media_type).all() == [("intro", MediaTypeEnum.VIDEO)]
+        assert db_session.query(Artist).count() == 2 and db_session.query(Genre).count() == 1
+        assert db_session.query(MediaArtist).count() == 2
+
+        def broken(self, rows):
+            raise KeyError("intro")
+
+        monkeypatch.setattr(catalog_import.CatalogImporter, "write", broken)
+        progress = catalog_import.run_import(db_session, [data], "ndjson", len(data), batch_size=1)
+        assert (progress["imported"], progress["failed"]) == (0, 2)
+    finally:
+        db_session.close()
+        Base.metadata.drop_all(bind=nocase_engine)
@@ -0,0 +1,48 @@
+"""Tests for trending charts."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+from datetime import datetime
+from api.helpers import charts
+
+
+def test_window_buckets_decay():
+    """
+    Test a window covers its span with weights decaying by age.
+    """
+    now = 1_700_000_000.0
+    buckets = charts.window_buckets(charts.CHART_WINDOWS["hourly"], now)
+    # Twelve full five-minute buckets plus the current partial one.
+    assert len(buckets) == 13
+    assert buckets[0][0] == charts.bucket_key(charts.BUCKET_SIZES["m5"], int(now) // 300 * 300)
+    weights = [weight for _, weight in buckets]
+    assert weights == sorted(weights, reverse=True)
+    assert weights[0] <= 1.0 and weights[-1] < 0.5
+
+
+def test_build_charts_sums_groups():
+    """
+    Test genres and artists score the sum of their media.
+    """
+    scores = {1: 5.0, 2: 3.0, 3: 1.0}
+    built = charts.build_charts(scores, [(1, 10), (2, 10), (3, 11), (4, 11)], [(3, 20)], size=2)
+    assert built[("media", None)] == [[1, 5.0], [2, 3.0]]
+    assert built[("genres", None)] == [[10, 8.0], [11, 1.0]]
+    assert built[("genres", 11)] == [[3, 1.0]]
+    assert built[("artists", None)] == [[20, 1.0]]
+
+
+def test_counter_buckets_plays():
+    """
+    Test plays are counted in the bucket of every granularity.
+    """
+    counter = charts.ChartCounter(flush_interval=60)
+    played_at = datetime(2024, 1, 1, 12, 7)
+    counter.record(7, played_at)
+    counter.record(7, played_at)
+    assert counter.snapshot() == {"recorded": 2, "flushes": 0, "flush_errors": 0, "pending": 2}
+    assert counter._pending[("m5", 1704110700, 7)] == 2
+    assert counter._pending[("h", 1704110400, 7)] == 2
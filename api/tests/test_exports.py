@@ -0,0 +1,61 @@
+"""Tests for streaming exports."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import csv
+import gzip
+import io
+import json
+from fastapi.testclient import TestClient
+from api.database import Base, get_async_read_db
+from api import main  # noqa: F401
+from api.models.media_model import Media, MediaTypeEnum
+from api.models.play_history_model import PlayHistory
+from api.models.user_model import User
+from api.tests.db import engine, override_get_async_db, TestingSessionLocal
+
+
+main.app.dependency_overrides[get_async_read_db] = override_get_async_db
+
+client = TestClient(main.app)
+
+
+def test_export_resume_and_formats():
+    """
+    Test exports stream every row as NDJSON, gzipped CSV, and resume after
+    a row's cursor.
+    """
+    Base.metadata.create_all(bind=engine)
+    db_session = TestingSessionLocal()
+    try:
+        db_session.add(User(first_name="A", last_name="B", username="ab", email="ab@example.com",
+                            password_hash="x"))
+        db_session.add_all([Media(media_title=f"Track {index}", media_type=MediaTypeEnum.AUDIO)
+                            for index in range(3)])
+        db_session.flush()
+        db_session.add_all([PlayHistory(user_id=1, media_id=index % 3 + 1) for index in range(2500)])
+        db_session.commit()
+
+        response = client.get("/exports/users/1/plays")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["history_id"] for row in rows] == list(range(1, 2501))
+
+        response = client.get("/exports/users/1/plays", params={"cursor": rows[1999]["cursor"]})
+        assert [json.loads(line)["history_id"] for line in response.text.splitlines()] == list(range(2001, 2501))
+
+        response = client.get("/exports/media", params={"format": "csv", "gzip": "true"})
+        assert response.headers["content-type"] == "application/gzip"
+        records = list(csv.DictReader(io.StringIO(gzip.decompress(response.content).decode())))
+        assert [(record["media_id"], record["media_type"]) for record in records] == [
+            ("1", "audio"), ("2", "audio"), ("3", "audio")]
+
+        assert client.get("/exports/media", params={"format": "xml"}).status_code == 422
+        assert client.get("/exports/media", params={"cursor": "nope"}).status_code == 400
+    finally:
+        db_session.close()
+        Base.metadata.drop_all(bind=engine)
@@ -0,0 +1,140 @@
+"""Tests for the home feed."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import pytest
+from fastapi.testclient import TestClient
+from api.database import Base, get_async_db
+from api import main
+from api.helpers import feed
+from api.models.artist_model import Artist
+from api.models.media_artist_model import MediaArtist
+from api.models.media_model import Media, MediaTypeEnum
+from api.models.user_artist_model import UserArtist
+from api.models.user_model import User
+from api.tests.db import engine, override_get_async_db, TestingSessionLocal
+
+main.app.dependency_overrides[get_async_db] = override_get_async_db
+
+client = TestClient(main.app)
+
+
+class SortedSets:
+    """
+    The Redis sorted set and set commands the feed writes with, in memory.
+    """
+
+    def __init__(self):
+        self.keys = {}
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def execute(self):
+        return []
+
+    def zadd(self, key, mapping):
+        self.keys.setdefault(key, {}).update(mapping)
+
+    def zremrangebyrank(self, key, start, stop):
+        members = sorted(self.keys.get(key, {}), key=self.keys[key].get)
+        for member in members[start:stop + 1 if stop != -1 else None]:
+            del self.keys[key][member]
+
+    def zrem(self, key, *members):
+        for member in members:
+            self.keys.get(key, {}).pop(member, None)
+
+    def sadd(self, key, *members):
+        self.keys.setdefault(key, set()).update(members)
+
+    def expire(self, key, seconds):
+        pass
+
+    def feed(self, key):
+        return sorted(self.keys.get(key, {}), reverse=True)
+
+
+@pytest.fixture()
+def follows():
+    """
+    Artist 1 with followers 1 and 2, artist 2 with followers 1 to 3, and
+    media 1 by both artists.
+    """
+    Base.metadata.create_all(bind=engine)
+    db_session = TestingSessionLocal()
+    db_session.add_all([User(first_name="U", last_name=f"{index}", username=f"user{index}",
+                             email=f"user{index}@example.com", password_hash="x") for index in range(3)])
+    db_session.add_all([Artist(artist_name="Small"), Artist(artist_name="Famous")])
+    db_session.add_all([Media(media_title=f"Track {index}", media_type=MediaTypeEnum.AUDIO) for index in range(3)])
+    db_session.add_all([UserArtist(follower_id=1, artist_id=1), UserArtist(follower_id=2, artist_id=1)]
+                       + [UserArtist(follower_id=user_id, artist_id=2) for user_id in (1, 2, 3)])
+    db_session.add_all([MediaArtist(media_id=1, artist_id=1), MediaArtist(media_id=1, artist_id=2),
+                        MediaArtist(media_id=2, artist_id=1)])
+    db_session.commit()
+    yield db_session
+    db_session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def test_fan_out_merges_popular_artists_on_read(follows):
+    """
+    Test a release reaches the followers of small artists, and is only
+    put on the timeline of artists above the follower threshold.
+    """
+    redis_client = SortedSets()
+    summary = feed.fan_out(follows, redis_client, 1, max_followers=2, batch_size=1, max_items=2, ttl=60)
+    assert summary == {"artists": 2, "merged_on_read": 1, "feeds": 2}
+    assert redis_client.feed(feed.user_feed_key(1)) == redis_client.feed(feed.user_feed_key(2)) == [1]
+    assert redis_client.feed(feed.user_feed_key(3)) == []
+    assert redis_client.feed(feed.artist_feed_key(2)) == [1]
+    assert redis_client.keys[feed.CELEBRITIES_KEY] == {2}
+    feed.fan_out(follows, redis_client, 2, max_followers=2, batch_size=10, max_items=1, ttl=60)
+    assert redis_client.feed(feed.user_feed_key(1)) == [2]
+
+
+def test_backfill_and_prune(follows):
+    """
+    Test following copies an artist's releases and unfollowing removes
+    those no other followed artist is credited on.
+    """
+    redis_client = SortedSets()
+    assert feed.backfill(follows, redis_client, 1, 1, max_items=10, ttl=60) == 2
+    assert redis_client.feed(feed.user_feed_key(1)) == [2, 1]
+    follows.query(UserArtist).filter(UserArtist.follower_id == 1, UserArtist.artist_id == 1).delete()
+    follows.commit()
+    assert feed.prune(follows, redis_client, 1, 1, max_items=10) == 1
+    assert redis_client.feed(feed.user_feed_key(1)) == [1]
+
+
+def test_follow_endpoints(follows):
+    """
+    Test following is idempotent and unfollowing a missing follow is not found.
+    """
+    response = client.put("/users/3/follows/1")
+    assert response.status_code == 200
+    assert response.json() == {"follower_id": 3, "artist_id": 1}
+    assert client.put("/users/3/follows/1").status_code == 200
+    assert client.put("/users/3/follows/9").status_code == 404
+    assert client.delete("/users/3/follows/1").status_code == 200
+    assert client.delete("/users/3/follows/1").status_code == 404
+
+
+def test_merge_pages_dedupes_newest_first():
+    """
+    Test fanned out and merged on read releases interleave once each.
+    """
+    media_ids, cursor = feed.merge_pages([[9, 7, 4], [8, 7, 3]], limit=4)
+    assert media_ids == [9, 8, 7, 4]
+    assert cursor == 4
+
+
+def test_merge_pages_last_page():
+    """
+    Test a page holding the rest of the feed has no cursor.
+    """
+    assert feed.merge_pages([[5, 2], [5]], limit=3) == ([5, 2], None)
+    assert feed.merge_pages([[], []], limit=3) == ([], None)
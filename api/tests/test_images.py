@@ -0,0 +1,76 @@
+"""Tests for image variants."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import io
+from datetime import datetime
+from fastapi.testclient import TestClient
+from PIL import Image
+from api.database import Base, get_async_read_db
+from api import main, worker
+from api.helpers import images, storage
+from api.models.album_model import Album
+from api.tests.db import engine, override_get_async_db, TestingSessionLocal
+
+main.app.dependency_overrides[get_async_read_db] = override_get_async_db
+
+client = TestClient(main.app)
+
+
+def image_bytes(mode: str, size, image_format: str) -> bytes:
+    """
+    Encoded single-colour image.
+    """
+    buffer = io.BytesIO()
+    Image.new(mode, size, (200, 30, 30, 128) if mode == "RGBA" else (200, 30, 30)).save(buffer, image_format)
+    return buffer.getvalue()
+
+
+def test_render_variants_never_enlarge():
+    """
+    Test variant sizes and formats of a transparent image.
+    """
+    variants = images.render_variants(image_bytes("RGBA", (2000, 500), "PNG"))
+    assert len(variants) == len(images.IMAGE_SIZES) * len(images.IMAGE_FORMATS)
+    with Image.open(io.BytesIO(variants["medium.webp"])) as variant:
+        assert (variant.format, variant.size, variant.mode) == ("WEBP", (512, 128), "RGBA")
+    with Image.open(io.BytesIO(variants["thumb.jpg"])) as variant:
+        assert (variant.format, variant.size) == ("JPEG", (96, 24))
+    with Image.open(io.BytesIO(images.render_variants(image_bytes("RGB", (200, 100), "JPEG"))["large.jpg"])) as variant:
+        assert variant.size == (200, 100)
+
+
+def test_image_variants_deduplicate_and_serve(tmp_path):
+    """
+    Test identical uploads sharing variants and the image endpoints.
+    """
+    storage_backend = storage.LocalStorageBackend(str(tmp_path))
+    cover = image_bytes("RGB", (800, 800), "JPEG")
+    storage_backend.put_bytes("covers/a.jpg", cover)
+    storage_backend.put_bytes("covers/b.jpg", cover)
+    assert worker._derive_image(storage_backend, "covers/a.jpg") == "generated"
+    assert worker._derive_image(storage_backend, "covers/b.jpg") == "deduplicated"
+    assert worker._derive_image(storage_backend, "covers/a.jpg") == "skipped"
+
+    Base.metadata.create_all(bind=engine)
+    db_session = TestingSessionLocal()
+    db_session.add(Album(album_title="Album", release_date=datetime(2020, 1, 1), cover_art="covers/b.jpg"))
+    db_session.commit()
+    db_session.close()
+    main.app.dependency_overrides[storage.get_storage] = lambda: storage_backend
+    try:
+        response = client.get("/images/albums/1?size=thumb", headers={"Accept": "image/webp,*/*"},
+                              allow_redirects=False)
+        assert response.status_code == 307
+        assert response.headers["location"].endswith(f"/images/cas/{images.content_digest(cover)}/thumb.webp")
+        response = client.get(response.headers["location"])
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "image/webp"
+        assert response.headers["cache-control"] == images.IMAGE_CACHE_CONTROL
+        assert client.get("/images/albums/1?size=huge").status_code == 422
+    finally:
+        main.app.dependency_overrides.pop(storage.get_storage)
+        Base.metadata.drop_all(bind=engine)
@@ -0,0 +1,120 @@
+"""Tests for eager-loading profiles."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import asyncio
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from api.database import Base, get_async_read_db
+from api import main
+from api.helpers import async_crud, response_cache
+from api.models.artist_model import Artist
+from api.models.comment_model import Comment
+from api.models.favorite_model import Favorite
+from api.models.genre_model import Genre
+from api.models.media_artist_model import MediaArtist
+from api.models.media_genre_model import MediaGenre
+from api.models.media_model import Media, MediaTypeEnum
+from api.tests.db import async_engine, engine, override_get_async_db, TestingAsyncSessionLocal, TestingSessionLocal
+
+main.app.dependency_overrides[get_async_read_db] = override_get_async_db
+
+client = TestClient(main.app)
+
+
+def _seed(media_count):
+    """
+    Media rows, each with one artist and one genre.
+    """
+    db_session = TestingSessionLocal()
+    try:
+        db_session.add_all([Artist(artist_name="Artist"), Genre(genre_name="Genre")])
+        db_session.add_all([Media(media_title=f"Track {index}", media_type=MediaTypeEnum.AUDIO)
+                            for index in range(media_count)])
+        db_session.flush()
+        db_session.add_all([MediaArtist(media_id=index + 1, artist_id=1) for index in range(media_count)])
+        db_session.add_all([MediaGenre(media_id=index + 1, genre_id=1) for index in range(media_count)])
+        db_session.commit()
+    finally:
+        db_session.close()
+
+
+def _load_page(profile, limit):
+    """
+    Load a media page with a profile, recording the statements issued.
+    """
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    async def load():
+        async with TestingAsyncSessionLocal() as db_session:
+            return await async_crud.get_media_list(db_session, limit=limit, profile=profile)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+    try:
+        media_list, _ = asyncio.run(load())
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", count)
+    return media_list, len(statements)
+
+
+def test_profiles_issue_constant_queries():
+    """
+    Test each profile loads its relations in the same number of queries
+    for small and large pages.
+    """
+    Base.metadata.create_all(bind=engine)
+    try:
+        _seed(30)
+        for profile, queries in (("card", 2), ("detail", 4), ("full", 4)):
+            small, small_queries = _load_page(profile, limit=2)
+            large, large_queries = _load_page(profile, limit=25)
+            assert small_queries == large_queries == queries
+            assert len(large) == 25 and [artist.artist_name for artist in large[0].artists] == ["Artist"]
+        assert [genre.genre_name for genre in large[-1].genres] == ["Genre"]
+        assert (large[0].favorite_count, large[0].comment_count) == (0, 0)
+    finally:
+        Base.metadata.drop_all(bind=engine)
+
+
+def test_media_list_endpoint_profiles():
+    """
+    Test GET /media serves the fields of every profile.
+    """
+    Base.metadata.create_all(bind=engine)
+    main.app.dependency_overrides[response_cache.get_response_cache] = lambda: response_cache.ResponseCache(
+        local_max_entries=10, local_ttl=60, redis_ttl=60)
+    try:
+        _seed(3)
+        expected = {
+            None: {"created_at"},
+            "card": {"artists"},
+            "detail": {"artists", "albums", "genres", "created_at"},
+            "full": {"artists", "albums", "genres", "favorite_count", "comment_count"},
+        }
+        for expand, fields in expected.items():
+            response = client.get("/media", params={"limit": 2, **({"expand": expand} if expand else {})})
+            assert response.status_code == 200
+            items = response.json()["items"]
+            assert len(items) == 2 and fields <= set(items[0])
+            assert response.json()["next_cursor"] is not None
+        assert "created_at" not in client.get("/media", params={"expand": "card"}).json()["items"][0]
+        assert client.get("/media", params={"expand": "detail"}).json()["items"][0]["genres"] == [
+            {"genre_id": 1, "genre_name": "Genre"}]
+        assert client.get("/media", params={"expand": "huge"}).status_code == 422
+    finally:
+        main.app.dependency_overrides.pop(response_cache.get_response_cache)
+        Base.metadata.drop_all(bind=engine)
+
+
+def test_full_profile_counts_invalidate_media_pages():
+    """
+    Test favorites and comments drop the cached media pages showing their counts.
+    """
+    for row in (Favorite(user_id=1, media_id=2), Comment(user_id=1, media_id=2, comment_text="Nice")):
+        assert {"media:2", "media:list"} <= set(response_cache.entity_tags(row))
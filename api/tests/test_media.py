@@ -0,0 +1,258 @@
+"""Tests for media."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from redis.exceptions import ConnectionError as RedisConnectionError, ResponseError
+from api.database import Base, get_async_read_db
+from api import main
+from api.helpers import response_cache, storage, view_counter
+from api.helpers.range_response import RangeNotSatisfiable, parse_range_header
+from api.models.comment_model import Comment
+from api.models.media_model import Media, MediaTypeEnum
+from api.tests.db import engine, override_get_async_db, TestingSessionLocal
+
+CONTENT = bytes(range(256)) * 4
+
+@pytest.fixture()
+def media_file(tmp_path):
+    """
+    Media row backed by a file in a local storage root.
+    """
+    Base.metadata.create_all(bind=engine)
+    (tmp_path / "track.mp3").write_bytes(CONTENT)
+    db_session = TestingSessionLocal()
+    db_session.add(Media(media_title="Track", media_type=MediaTypeEnum.AUDIO,
+                         s3_media_path="track.mp3"))
+    db_session.commit()
+    db_session.close()
+    main.app.dependency_overrides[storage.get_storage] = lambda: storage.LocalStorageBackend(str(tmp_path))
+    yield
+    main.app.dependency_overrides.pop(storage.get_storage)
+    Base.metadata.drop_all(bind=engine)
+
+main.app.dependency_overrides[get_async_read_db] = override_get_async_db
+
+client = TestClient(main.app)
+
+def test_parse_range_header():
+    """
+    Test byte range parsing.
+    """
+    assert parse_range_header("bytes=0-99", 1000) == (0, 99)
+    assert parse_range_header("bytes=900-", 1000) == (900, 999)
+    assert parse_range_header("bytes=-100", 1000) == (900, 999)
+    assert parse_range_header("bytes=990-2000", 1000) == (990, 999)
+    assert parse_range_header("bytes=0-1,5-6", 1000) is None
+    assert parse_range_header("items=0-1", 1000) is None
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range_header("bytes=1000-", 1000)
+
+def test_media_content_full(media_file):
+    """
+    Test full media content.
+    """
+    response = client.get("/media/1/content")
+    assert response.status_code == 200
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.content == CONTENT
+
+def test_media_hls_conditional_get(media_file, tmp_path):
+    """
+    Test HLS objects served from the segment cache with validators.
+    """
+    (tmp_path / "track" / "hls").mkdir(parents=True)
+    (tmp_path / "track" / "hls" / "master.m3u8").write_text("#EXTM3U\n")
+    response = client.get("/media/1/hls/master.m3u8")
+    assert response.status_code == 200
+    assert response.content == b"#EXTM3U\n"
+    assert response.headers["content-type"] == "application/vnd.apple.mpegurl"
+    response = client.get("/media/1/hls/master.m3u8", headers={"If-None-Match": response.headers["etag"]})
+    assert response.status_code == 304
+    assert client.get("/media/1/hls/../track.mp3").status_code == 404
+
+def test_media_content_range(media_file):
+    """
+    Test partial media content.
+    """
+    response = client.get("/media/1/content", headers={"Range": "bytes=100-199"})
+    assert response.status_code == 206
+    assert response.headers["content-range"] == f"bytes 100-199/{len(CONTENT)}"
+    assert response.content == CONTENT[100:200]
+
+def test_media_content_if_range_mismatch(media_file):
+    """
+    Test stale If-Range falls back to the full content.
+    """
+    response = client.get("/media/1/content", headers={"Range": "bytes=0-9", "If-Range": '"stale"'})
+    assert response.status_code == 200
+    assert response.content == CONTENT
+
+def test_media_content_unsatisfiable(media_file):
+    """
+    Test unsatisfiable range.
+    """
+    response = client.get("/media/1/content", headers={"Range": f"bytes={len(CONTENT)}-"})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(CONTENT)}"
+
+def test_read_media(media_file):
+    """
+    Test a media is served with its pending views.
+    """
+    views = view_counter.ViewCounter(view_counter.MemoryCounterStore(shard_count=4),
+                                     flush_interval=60, session_factory=TestingSessionLocal)
+    views.increment(1, 2)
+    main.app.dependency_overrides[view_counter.get_view_counter] = lambda: views
+    main.app.dependency_overrides[response_cache.get_response_cache] = lambda: response_cache.ResponseCache(
+        local_max_entries=10, local_ttl=60, redis_ttl=60)
+    try:
+        response = client.get("/media/1")
+        assert response.status_code == 200
+        assert response.json()["media_title"] == "Track"
+        assert response.json()["view_count"] == 2
+        assert client.get("/media/2").status_code == 404
+    finally:
+        main.app.dependency_overrides.pop(view_counter.get_view_counter)
+        main.app.dependency_overrides.pop(response_cache.get_response_cache)
+
+def test_read_media_comments(media_file):
+    """
+    Test the comments of a media are paged.
+    """
+    db_session = TestingSessionLocal()
+    db_session.add_all([Comment(user_id=1, media_id=1, comment_text=f"Comment {index}") for index in range(3)])
+    db_session.commit()
+    db_session.close()
+    response = client.get("/media/1/comments", params={"limit": 2})
+    assert response.status_code == 200
+    assert [comment["comment_text"] for comment in response.json()["items"]] == ["Comment 0", "Comment 1"]
+    assert response.json()["next_cursor"] is not None
+
+def test_view_count_flush(media_file):
+    """
+    Test pending views are merged on read and written back in bulk.
+    """
+    views = view_counter.ViewCounter(view_counter.MemoryCounterStore(shard_count=4),
+                                     flush_interval=60, session_factory=TestingSessionLocal)
+    for _ in range(3):
+        views.increment(1)
+    views.increment(2)
+    assert views.merged(1, 0) == 3
+    asyncio.run(views.flush())
+    db_session = TestingSessionLocal()
+    assert db_session.query(Media).get(1).view_count == 3
+    db_session.close()
+    assert views.merged(1, 3) == 3
+    # A response cached before the flush still shows the written views.
+    assert views.merged(1, 0) == 3 and views.merged_many({1: 0, 2: None}) == {1: 3, 2: 0}
+
+class Hashes:
+    """
+    The Redis hash commands the view counter writes with, in memory.
+    """
+
+    def __init__(self):
+        self.keys = {}
+        self.down = False
+        self.queued = []
+
+    def pipeline(self):
+        return self
+
+    def execute(self):
+        queued, self.queued = self.queued, []
+        if self.down:
+            raise RedisConnectionError("Redis is down")
+        return [command(*args) for command, args in queued]
+
+    def hincrby(self, key, field, amount):
+        self.queued.append((self._hincrby, (key, field, amount)))
+
+    def _hincrby(self, key, field, amount):
+        fields = self.keys.setdefault(key, {})
+        fields[str(field)] = fields.get(str(field), 0) + amount
+
+    def hgetall(self, key):
+        self.queued.append((lambda: dict(self.keys.get(key, {})), ()))
+
+    def delete(self, key):
+        self.queued.append((lambda: self.keys.pop(key, None), ()))
+
+    def rename(self, key, new_key):
+        if key not in self.keys:
+            raise ResponseError("no such key")
+        self.keys[new_key] = self.keys.pop(key)
+
+def test_redis_view_counts_flushed_in_batches(media_file):
+    """
+    Test views are counted in process and sent to Redis by the flusher,
+    and kept when Redis is down.
+    """
+    hashes = Hashes()
+    views = view_counter.ViewCounter(view_counter.RedisCounterStore(hashes, shard_count=4),
+                                     flush_interval=60, session_factory=TestingSessionLocal)
+    views.increment(1)
+    views.increment(1)
+    assert hashes.keys == {} and views.merged(1, 0) == 2
+    hashes.down = True
+    asyncio.run(views.flush())
+    assert views.merged(1, 0) == 2
+    hashes.down = False
+    hashes.keys["view_counts:pending"] = {"1": 3}  # Sent by another worker.
+    asyncio.run(views.flush())
+    db_session = TestingSessionLocal()
+    assert db_session.query(Media).get(1).view_count == 5
+    db_session.close()
+    assert hashes.keys == {} and views.merged(1, 5) == 5
+
+
+def test_response_cache_coalesces_and_invalidates():
+    """
+    Test concurrent misses share one load and an invalidation drops the entry.
+    """
+    cache = response_cache.ResponseCache(local_max_entries=10, local_ttl=60, redis_ttl=60)
+    loads = []
+
+    async def loader():
+        loads.append(1)
+        await asyncio.sleep(0.01)
+        return {"media_id": 1}
+
+    async def scenario():
+        first = await asyncio.gather(*[cache.get_or_load("media:1", loader, ["media:1"]) for _ in range(5)])
+        assert first == [{"media_id": 1}] * 5
+        cache.invalidate(["media:1"])
+        await cache.get_or_load("media:1", loader, ["media:1"])
+
+    asyncio.run(scenario())
+    assert len(loads) == 2
+    assert cache.snapshot()["coalesced"] == 4
+
+
+def test_response_cache_skips_fill_after_invalidation():
+    """
+    Test responses loaded just after an invalidation are not cached.
+    """
+    cache = response_cache.ResponseCache(local_max_entries=10, local_ttl=60, redis_ttl=60, fill_delay=60)
+    loads = []
+
+    async def loader():
+        loads.append(1)
+        return {"media_id": 1}
+
+    async def scenario():
+        await cache.get_or_load("media:1", loader, ["media:1"])
+        await cache.get_or_load("media:1", loader, ["media:1"])
+        cache.invalidate(["media:1"])
+        await cache.get_or_load("media:1", loader, ["media:1"])
+        await cache.get_or_load("media:1", loader, ["media:1"])
+        await cache.get_or_load("media:2", loader, ["media:2"])
+
+    asyncio.run(scenario())
+    assert len(loads) == 4
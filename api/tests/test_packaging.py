@@ -0,0 +1,44 @@
+"""Tests for media packaging."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+from api.helpers import packaging
+from api.helpers.storage import LocalStorageBackend
+from api.models.media_model import MediaTypeEnum
+
+
+def test_byte_segmenter_round_trip(tmp_path):
+    """
+    Test the byte segments of a track cover it exactly, in order.
+    """
+    source = tmp_path / "track.mp3"
+    source.write_bytes(bytes(range(256)) * 10)
+    segmenter = packaging.ByteSegmenter(segment_size=1000)
+    segments = segmenter.plan(str(source), duration_hint=25.6)
+    assert [segment.length for segment in segments] == [1000, 1000, 560]
+    assert round(sum(segment.duration for segment in segments), 3) == 25.6
+    storage_backend = LocalStorageBackend(str(tmp_path))
+    rendition = packaging.RENDITIONS[MediaTypeEnum.AUDIO][0]
+    content = b""
+    for segment in segments:
+        output_path = tmp_path / packaging.segment_name(segment.index)
+        segmenter.encode(str(source), segment, rendition, str(output_path))
+        key = f"{packaging.output_prefix('track.mp3')}/{rendition.name}/{output_path.name}"
+        storage_backend.put_file(key, str(output_path))
+        content += (tmp_path / key).read_bytes()
+    assert content == source.read_bytes()
+
+
+def test_playlists():
+    """
+    Test the media and master HLS playlists list their segments and renditions.
+    """
+    segments = [packaging.Segment(0, 0.0, 6.0), packaging.Segment(1, 6.0, 2.5)]
+    playlist = packaging.media_playlist(segments)
+    assert "#EXT-X-TARGETDURATION:6" in playlist
+    assert "#EXTINF:2.500,\nsegment_00001.ts\n#EXT-X-ENDLIST" in playlist
+    master = packaging.master_playlist(packaging.RENDITIONS[MediaTypeEnum.VIDEO])
+    assert master.count("#EXT-X-STREAM-INF") == 3 and "720p/index.m3u8" in master
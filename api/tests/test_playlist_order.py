@@ -0,0 +1,136 @@
+"""Tests for playlist ordering."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import asyncio
+from fastapi.testclient import TestClient
+from api.database import Base, get_async_db, get_async_read_db
+from api import main
+from api.helpers import async_crud, playlist_order
+from api.models.media_model import Media, MediaTypeEnum
+from api.models.playlist_media_model import PlaylistMedia
+from api.models.playlist_model import Playlist
+from api.models.user_model import User
+from api.tests.db import engine, override_get_async_db, TestingAsyncSessionLocal, TestingSessionLocal
+
+main.app.dependency_overrides[get_async_db] = override_get_async_db
+main.app.dependency_overrides[get_async_read_db] = override_get_async_db
+
+client = TestClient(main.app)
+
+
+def test_positions_between():
+    """
+    Test inserted positions fit the gap, and that a full gap yields none.
+    """
+    positions, step = playlist_order.positions_between(0, 40, 3)
+    assert (positions, step) == ([10, 20, 30], 10)
+    assert playlist_order.positions_between(5, 6, 1) == ([], 0)
+    head, _ = playlist_order.positions_between(None, 100, 2)
+    assert head[-1] < 100 and head[0] < head[1]
+
+
+def _order():
+    """
+    Media IDs of the playlist entries in position order.
+    """
+    db_session = TestingSessionLocal()
+    try:
+        return [media_id for media_id, in db_session.query(PlaylistMedia.media_id)
+                .order_by(PlaylistMedia.position)]
+    finally:
+        db_session.close()
+
+
+def test_add_move_and_renumber():
+    """
+    Test bulk appends and inserts, single-row moves, and renumbering once
+    repeated inserts at one spot exhaust the gap.
+    """
+    Base.metadata.create_all(bind=engine)
+    db_session = TestingSessionLocal()
+    try:
+        db_session.add(User(first_name="A", last_name="B", username="ab", email="ab@example.com",
+                            password_hash="x"))
+        db_session.add_all([Media(media_title=f"Track {index}", media_type=MediaTypeEnum.AUDIO)
+                            for index in range(5)])
+        db_session.add(Playlist(user_id=1, playlist_title="Mix"))
+        db_session.commit()
+
+        async def edit():
+            async with TestingAsyncSessionLocal() as async_session:
+                entries, _ = await async_crud.add_playlist_entries(async_session, 1, [1, 2, 3])
+                await async_crud.add_playlist_entries(async_session, 1, [4, 4], before_entry_id=entries[1].entry_id)
+                await async_crud.move_playlist_entry(async_session, 1, entries[2].entry_id,
+                                                     before_entry_id=entries[0].entry_id)
+                assert await async_crud.add_playlist_entries(async_session, 2, [5]) is None
+                # Each insert ahead of the same entry halves the gap until a renumber.
+                crowded_seen = False
+                for _ in range(25):
+                    _, crowded = await async_crud.add_playlist_entries(async_session, 1, [5],
+                                                                       before_entry_id=entries[1].entry_id)
+                    crowded_seen = crowded_seen or crowded
+                return crowded_seen
+
+        assert asyncio.run(edit())
+        assert _order() == [3, 1, 4, 4] + [5] * 25 + [2]
+        assert playlist_order.renumber(db_session, 1) == 30
+        db_session.commit()
+        positions = [position for position, in db_session.query(PlaylistMedia.position)
+                     .order_by(PlaylistMedia.position)]
+        assert positions == [playlist_order.POSITION_GAP * (index + 1) for index in range(30)]
+        assert _order() == [3, 1, 4, 4] + [5] * 25 + [2]
+    finally:
+        db_session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+def test_read_playlists():
+    """
+    Test the playlist listing filters by user and pages.
+    """
+    Base.metadata.create_all(bind=engine)
+    db_session = TestingSessionLocal()
+    try:
+        db_session.add_all([Playlist(user_id=user_id, playlist_title=f"Mix {index}")
+                            for index, user_id in enumerate([1, 2, 1, 1])])
+        db_session.commit()
+        response = client.get("/playlists", params={"user_id": 1, "limit": 2})
+        assert response.status_code == 200
+        assert [playlist["playlist_title"] for playlist in response.json()["items"]] == ["Mix 0", "Mix 2"]
+        response = client.get("/playlists", params={"user_id": 1, "cursor": response.json()["next_cursor"]})
+        assert [playlist["playlist_title"] for playlist in response.json()["items"]] == ["Mix 3"]
+    finally:
+        db_session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+def test_playlist_media_endpoints():
+    """
+    Test adding, listing, moving and removing playlist entries through the API.
+    """
+    Base.metadata.create_all(bind=engine)
+    db_session = TestingSessionLocal()
+    try:
+        db_session.add_all([Media(media_title=f"Track {index}", media_type=MediaTypeEnum.AUDIO)
+                            for index in range(3)])
+        db_session.add(Playlist(user_id=1, playlist_title="Mix"))
+        db_session.commit()
+        response = client.post("/playlists/1/media", json={"media_ids": [1, 2, 3]})
+        assert response.status_code == 201
+        entry_ids = [entry["entry_id"] for entry in response.json()["items"]]
+        response = client.patch(f"/playlists/1/media/{entry_ids[2]}", json={"before_entry_id": entry_ids[0]})
+        assert response.status_code == 200 and response.json()["media_id"] == 3
+        assert client.delete(f"/playlists/1/media/{entry_ids[1]}").status_code == 200
+        response = client.get("/playlists/1/media", params={"limit": 1})
+        assert response.status_code == 200
+        assert [entry["media_id"] for entry in response.json()["items"]] == [3]
+        response = client.get("/playlists/1/media", params={"cursor": response.json()["next_cursor"]})
+        assert [entry["media_id"] for entry in response.json()["items"]] == [1]
+        assert client.post("/playlists/1/media", json={"media_ids": [9]}).status_code == 404
+    finally:
+        db_session.close()
+        Base.metadata.drop_all(bind=engine)
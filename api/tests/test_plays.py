@@ -0,0 +1,168 @@
+"""Tests for play history ingestion."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import asyncio
+import time
+from datetime import datetime, timedelta
+import pytest
+from fastapi.testclient import TestClient
+from api.database import Base, get_async_read_db
+from api import main
+from api.helpers import crud
+from api.helpers.pagination import InvalidCursor
+from api.helpers.play_ingest import BufferFull, PlayIngestBuffer, get_play_buffer
+from api.models.play_history_model import PlayHistory
+from api.tests.db import engine, override_get_async_db, TestingSessionLocal
+
+main.app.dependency_overrides[get_async_read_db] = override_get_async_db
+
+client = TestClient(main.app)
+
+@pytest.fixture()
+def test_db():
+    """
+    Test database.
+    """
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+def _buffer(journal_dir, max_size=10):
+    """
+    Play buffer writing to the test database.
+    """
+    return PlayIngestBuffer(journal_dir=str(journal_dir), max_size=max_size, batch_size=2,
+                            flush_interval=60, session_factory=TestingSessionLocal)
+
+def _count_plays():
+    """
+    Count play history rows.
+    """
+    db_session = TestingSessionLocal()
+    try:
+        return db_session.query(PlayHistory).count()
+    finally:
+        db_session.close()
+
+def test_flush_inserts_batch(test_db, tmp_path):
+    """
+    Test pending plays are inserted and journals removed on flush.
+    """
+    play_buffer = _buffer(tmp_path)
+    for media_id in range(1, 6):
+        play_buffer.add(user_id=1, media_id=media_id)
+    asyncio.run(play_buffer.flush())
+    assert _count_plays() == 5
+    assert list(tmp_path.iterdir()) == []
+    assert play_buffer.snapshot()["flushed"] == 5
+    assert play_buffer.snapshot()["last_batch_size"] == 5
+
+def test_buffer_full(test_db, tmp_path):
+    """
+    Test plays beyond capacity are rejected and counted.
+    """
+    play_buffer = _buffer(tmp_path, max_size=1)
+    play_buffer.add(user_id=1, media_id=1)
+    with pytest.raises(BufferFull):
+        play_buffer.add(user_id=1, media_id=2)
+    assert play_buffer.snapshot()["dropped"] == 1
+
+def test_recover_journal(test_db, tmp_path):
+    """
+    Test unflushed plays are recovered from the journal by a new buffer.
+    """
+    _buffer(tmp_path).add(user_id=1, media_id=1)
+    play_buffer = _buffer(tmp_path)
+    play_buffer.recover()
+    assert len(play_buffer.pending) == 1
+    asyncio.run(play_buffer.flush())
+    assert _count_plays() == 1
+    assert list(tmp_path.iterdir()) == []
+
+def test_flush_quarantines_refused_rows(test_db, tmp_path):
+    """
+    Test a row the database refuses is set aside and the rest of its batch
+    is written instead of the whole batch being retried.
+    """
+    play_buffer = _buffer(tmp_path)
+    for media_id in range(1, 6):
+        play_buffer.add(user_id=None if media_id == 4 else 1, media_id=media_id)
+    asyncio.run(play_buffer.flush())
+    assert _count_plays() == 4
+    assert play_buffer.pending == []
+    assert (play_buffer.snapshot()["flushed"], play_buffer.snapshot()["rejected"]) == (4, 1)
+    main.app.dependency_overrides[get_play_buffer] = lambda: play_buffer
+    try:
+        assert client.get("/plays/stats").json()["rejected"] == 1
+    finally:
+        main.app.dependency_overrides.pop(get_play_buffer)
+    [quarantine] = tmp_path.iterdir()
+    assert quarantine.suffix == ".rejected" and '"media_id": 4' in quarantine.read_text()
+    # Set aside events are not recovered into the buffer.
+    play_buffer.recover()
+    assert play_buffer.pending == []
+
+def test_stop_waits_for_running_flush(test_db, tmp_path):
+    """
+    Test stopping during a flush lets its write finish and remove its
+    journals, so a restart does not insert the plays again.
+    """
+    def slow_session():
+        time.sleep(0.2)
+        return TestingSessionLocal()
+
+    async def scenario():
+        play_buffer = PlayIngestBuffer(journal_dir=str(tmp_path), max_size=10, batch_size=2,
+                                       flush_interval=60, session_factory=slow_session)
+        await play_buffer.start()
+        play_buffer.add(user_id=1, media_id=1)
+        play_buffer.add(user_id=1, media_id=2)
+        await asyncio.sleep(0.05)
+        await play_buffer.stop()
+        return play_buffer
+
+    play_buffer = asyncio.run(scenario())
+    assert _count_plays() == 2 and play_buffer.snapshot()["flushes"] == 1
+    assert list(tmp_path.iterdir()) == []
+
+def test_play_history_cursor_pages(test_db):
+    """
+    Test play history pages follow (played_at, history_id) without gaps or repeats.
+    """
+    db_session = TestingSessionLocal()
+    played_at = datetime(2024, 1, 1)
+    for media_id in range(1, 8):
+        db_session.add(PlayHistory(user_id=1, media_id=media_id,
+                                   played_at=played_at + timedelta(minutes=media_id // 2)))
+    db_session.add(PlayHistory(user_id=2, media_id=1, played_at=played_at))
+    db_session.commit()
+    seen, cursor = [], None
+    while True:
+        plays, cursor = crud.get_play_history(db_session, user_id=1, cursor=cursor, limit=3)
+        seen.extend(play.history_id for play in plays)
+        if cursor is None:
+            break
+    db_session.close()
+    assert seen == [7, 6, 5, 4, 3, 2, 1]
+    with pytest.raises(InvalidCursor):
+        crud.get_play_history(TestingSessionLocal(), user_id=1, cursor="not-a-cursor")
+
+def test_read_user_plays(test_db):
+    """
+    Test the play history endpoint pages stored plays.
+    """
+    db_session = TestingSessionLocal()
+    db_session.add_all([PlayHistory(user_id=1, media_id=media_id, played_at=datetime(2024, 1, media_id))
+                        for media_id in range(1, 4)])
+    db_session.commit()
+    db_session.close()
+    response = client.get("/users/1/plays", params={"limit": 2})
+    assert response.status_code == 200
+    assert [play["media_id"] for play in response.json()["items"]] == [3, 2]
+    response = client.get("/users/1/plays", params={"limit": 2, "cursor": response.json()["next_cursor"]})
+    assert [play["media_id"] for play in response.json()["items"]] == [1]
+    assert response.json()["next_cursor"] is None
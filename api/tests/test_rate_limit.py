@@ -0,0 +1,107 @@
+"""Tests for rate limiting and admission control."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import asyncio
+import pytest
+from api.helpers import rate_limit
+
+
+def test_limiter_spends_every_bucket():
+    """
+    Test a request over any of its buckets is refused and spends nothing.
+    """
+    limiter = rate_limit.RateLimiter(
+        user_limit=rate_limit.RateLimit(1.0, 5.0), ip_limit=rate_limit.RateLimit(1.0, 5.0),
+        routes={"/search": rate_limit.RateLimit(0.01, 2.0)}, sync_interval=1.0)
+    assert limiter.check("/search", "10.0.0.1", "7") == 0
+    assert limiter.check("/search/", "10.0.0.1", "7") == 0
+    assert limiter.check("/search", "10.0.0.1", "7") > 1
+    # Other routes are only held by the user and IP buckets.
+    assert limiter.check("/media", "10.0.0.1", "7") == 0
+    assert limiter.snapshot()["limited"] == 1
+    assert limiter._buckets["user:7"].spent == 3
+
+
+def test_route_limit_longest_prefix():
+    """
+    Test the most specific route prefix applies.
+    """
+    routes = {"/exports": rate_limit.RateLimit(1, 1), "/exports/media": rate_limit.RateLimit(2, 2)}
+    assert rate_limit.route_limit("/exports/media", routes)[0] == "/exports/media"
+    assert rate_limit.route_limit("/exports/users/1/plays", routes)[0] == "/exports"
+    assert rate_limit.route_limit("/exportsx", routes) is None
+
+
+def test_admission_sheds_past_queue():
+    """
+    Test requests queue for a slot in order and are shed past the queue
+    bound or the queue target.
+    """
+    async def scenario():
+        admission = rate_limit.AdmissionController(max_concurrency=1, max_queue=1, queue_target=0.05)
+        await admission.acquire()
+        waiter = asyncio.ensure_future(admission.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(rate_limit.Overloaded):
+            await admission.acquire()  # The queue is full.
+        admission.release()
+        await waiter  # Handed the slot.
+        with pytest.raises(rate_limit.Overloaded):
+            await admission.acquire()  # Waited past the target.
+        admission.release()
+        return admission.snapshot()
+
+    snapshot = asyncio.run(scenario())
+    assert snapshot["admitted"] == 2 and snapshot["shed"] == 2
+    assert snapshot["in_flight"] == 0 and snapshot["waiting"] == 0
+
+
+def test_middleware_frees_slot_when_response_starts(monkeypatch):
+    """
+    Test a streamed response gives its admission slot back once started,
+    and a request failing before its response still gives it back.
+    """
+    admission = rate_limit.AdmissionController(max_concurrency=1, max_queue=1, queue_target=0.05)
+    limiter = rate_limit.RateLimiter(
+        user_limit=rate_limit.RateLimit(100.0, 100.0), ip_limit=rate_limit.RateLimit(100.0, 100.0),
+        routes={}, sync_interval=1.0)
+    monkeypatch.setattr(rate_limit, "get_admission_controller", lambda: admission)
+    monkeypatch.setattr(rate_limit, "get_rate_limiter", lambda: limiter)
+
+    async def scenario():
+        streaming, finish = asyncio.Event(), asyncio.Event()
+
+        async def app(scope, receive, send):
+            if scope["path"] == "/broken":
+                raise RuntimeError("broken")
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            streaming.set()
+            await finish.wait()
+            await send({"type": "http.response.body", "body": b""})
+
+        async def send(message):
+            sent.append(message)
+
+        async def receive():
+            return {"type": "http.request", "body": b""}
+
+        sent = []
+        middleware = rate_limit.RateLimitMiddleware(app)
+        scope = {"type": "http", "path": "/stream", "headers": [], "client": ("10.0.0.1", 1)}
+        stream = asyncio.ensure_future(middleware(scope, receive, send))
+        await streaming.wait()
+        in_flight = admission.in_flight
+        with pytest.raises(RuntimeError):
+            await middleware({**scope, "path": "/broken"}, receive, send)
+        finish.set()
+        await stream
+        return in_flight, sent
+
+    in_flight, sent = asyncio.run(scenario())
+    assert in_flight == 0
+    assert [message["type"] for message in sent] == ["http.response.start", "http.response.body"]
+    assert admission.in_flight == 0 and admission.snapshot()["admitted"] == 2
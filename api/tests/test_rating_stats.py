@@ -0,0 +1,115 @@
+"""Tests for rating aggregates."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import asyncio
+from fastapi.testclient import TestClient
+from api.database import Base, get_async_db
+from api import main
+from api.helpers import async_crud, rating_stats, response_cache
+from api.models.media_model import Media, MediaTypeEnum
+from api.models.rating_model import Rating
+from api.models.user_model import User
+from api.schemas import rating_schema
+from api.tests.db import engine, override_get_async_db, TestingAsyncSessionLocal, TestingSessionLocal
+
+main.app.dependency_overrides[get_async_db] = override_get_async_db
+
+client = TestClient(main.app)
+
+
+def test_rating_delta():
+    """
+    Test the aggregate changes of a create, an update and a soft-delete.
+    """
+    assert rating_stats.rating_delta(None, 4) == {"rating_count": 1, "rating_sum": 4, "rating_count_4": 1}
+    assert rating_stats.rating_delta(4, 2) == {"rating_sum": -2, "rating_count_4": -1, "rating_count_2": 1}
+    assert rating_stats.rating_delta(3, None) == {"rating_count": -1, "rating_sum": -3, "rating_count_3": -1}
+    assert rating_stats.rating_delta(5, 5) == {}
+
+
+def test_rating_invalidates_media_pages():
+    """
+    Test a rating change drops the cached media pages showing its aggregates.
+    """
+    tags = response_cache.entity_tags(Rating(user_id=1, media_id=2, rating=4))
+    assert {"media:2", "user:1", "media:list"} <= set(tags)
+
+
+def _media():
+    """
+    The only media row.
+    """
+    db_session = TestingSessionLocal()
+    try:
+        return db_session.query(Media).one()
+    finally:
+        db_session.close()
+
+
+def test_incremental_and_reconcile():
+    """
+    Test rating writes keep the media aggregates in step, and that
+    reconciling repairs drift.
+    """
+    Base.metadata.create_all(bind=engine)
+    db_session = TestingSessionLocal()
+    try:
+        db_session.add_all([User(first_name="A", last_name="B", username=f"user{user_id}",
+                                 email=f"user{user_id}@example.com", password_hash="x") for user_id in (1, 2)])
+        db_session.add(Media(media_title="Track", media_type=MediaTypeEnum.AUDIO))
+        db_session.commit()
+
+        async def write_ratings():
+            async with TestingAsyncSessionLocal() as async_session:
+                first = await async_crud.rate_media(async_session, rating_schema.RatingCreate(
+                    user_id=1, media_id=1, rating=5))
+                await async_crud.rate_media(async_session, rating_schema.RatingCreate(
+                    user_id=2, media_id=1, rating=3))
+                await async_crud.rate_media(async_session, rating_schema.RatingCreate(
+                    user_id=2, media_id=1, rating=4))
+                await async_crud.update_rating(async_session, first.rating_id, rating_schema.RatingUpdate(rating=1))
+                await async_crud.delete_rating(async_session, first.rating_id)
+
+        asyncio.run(write_ratings())
+        media = _media()
+        assert (media.rating_count, media.rating_sum, media.rating_histogram) == (1, 4, [0, 0, 0, 1, 0])
+        assert media.rating_average == 4
+
+        # Ratings written behind the API's back are picked up by reconcile.
+        db_session.add(Rating(user_id=1, media_id=1, rating=2))
+        db_session.commit()
+        assert rating_stats.reconcile(db_session, batch_size=10) == {"checked": 1, "fixed": 1}
+        media = _media()
+        assert (media.rating_count, media.rating_sum, media.rating_histogram) == (2, 6, [0, 1, 0, 1, 0])
+        assert rating_stats.reconcile(db_session, batch_size=10) == {"checked": 1, "fixed": 0}
+    finally:
+        db_session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+def test_rating_endpoints():
+    """
+    Test rating, re-rating and deleting through the API update the aggregates.
+    """
+    Base.metadata.create_all(bind=engine)
+    db_session = TestingSessionLocal()
+    try:
+        db_session.add(Media(media_title="Track", media_type=MediaTypeEnum.AUDIO))
+        db_session.commit()
+        response = client.post("/ratings", json={"user_id": 1, "media_id": 1, "rating": 4})
+        assert response.status_code == 200
+        rating_id = response.json()["rating_id"]
+        assert response.json()["rating"] == 4
+        response = client.patch(f"/ratings/{rating_id}", json={"rating": 2})
+        assert response.status_code == 200 and response.json()["rating"] == 2
+        assert (_media().rating_count, _media().rating_sum) == (1, 2)
+        assert client.delete(f"/ratings/{rating_id}").status_code == 200
+        assert _media().rating_count == 0
+        assert client.post("/ratings", json={"user_id": 1, "media_id": 2, "rating": 4}).status_code == 404
+    finally:
+        db_session.close()
+        Base.metadata.drop_all(bind=engine)
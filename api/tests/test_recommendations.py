@@ -0,0 +1,66 @@
+"""Tests for recommendations."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import numpy as np
+from api.database import Base
+from api import main  # noqa: F401
+from api.helpers import recommendations
+from api.models.favorite_model import Favorite
+from api.models.media_model import Media, MediaTypeEnum
+from api.models.play_history_model import PlayHistory
+from api.models.rating_model import Rating
+from api.models.user_model import User
+from api.tests.db import engine, TestingSessionLocal
+
+
+def test_item_neighbours_and_recommend():
+    """
+    Test item-item similarity and that batch and incremental scoring agree.
+    """
+    # Users 1-3 play media 10 and 11 together; user 4 only plays media 10.
+    users = np.array([1, 1, 2, 2, 3, 3, 3, 4])
+    items = np.array([10, 11, 10, 11, 10, 11, 12, 10])
+    strengths = np.ones(len(users), dtype=np.float32)
+    matrix, user_ids, item_ids = recommendations.interaction_matrix(users, items, strengths)
+    neighbours = recommendations.item_neighbours(matrix, top_n=2, shrink=0.0, block_size=1)
+    row = neighbours.getrow(0)
+    assert [item_ids[column] for column in row.indices[np.argsort(-row.data)]] == [11, 12]
+    assert neighbours.diagonal().sum() == 0
+    columns, scores = recommendations.recommend(matrix, neighbours, top_k=5)[3]
+    assert item_ids[columns].tolist() == [11, 12]
+    stored = {int(item_ids[row]): [[int(item_ids[column]), float(score)] for column, score in
+                                   zip(neighbours.getrow(row).indices, neighbours.getrow(row).data)]
+              for row in range(len(item_ids))}
+    incremental = recommendations.recommend_one({10: 1.0}, stored, top_k=5)
+    assert [media_id for media_id, _ in incremental] == [11, 12]
+    assert np.allclose([score for _, score in incremental], scores, atol=1e-5)
+
+
+def test_load_interactions_and_changed_users():
+    """
+    Test interaction strengths and the refresh watermark.
+    """
+    Base.metadata.create_all(bind=engine)
+    db_session = TestingSessionLocal()
+    try:
+        db_session.add_all([User(first_name="A", last_name="B", username="ab", email="ab@example.com",
+                                 password_hash="x"),
+                            Media(media_title="Track", media_type=MediaTypeEnum.AUDIO)])
+        db_session.flush()
+        db_session.add_all([PlayHistory(user_id=1, media_id=1), PlayHistory(user_id=1, media_id=1),
+                            Favorite(user_id=1, media_id=1), Rating(user_id=1, media_id=1, rating=5)])
+        db_session.commit()
+        users, items, strengths = recommendations.load_interactions(db_session)
+        matrix, _, _ = recommendations.interaction_matrix(users, items, strengths)
+        expected = np.log1p(2) + recommendations.FAVORITE_WEIGHT + 5 - recommendations.RATING_OFFSET
+        assert np.isclose(matrix[0, 0], expected)
+        watermark = recommendations.current_watermark(db_session)
+        assert recommendations.changed_users(db_session, {**watermark, "history_id": "0"}) == {1}
+        assert recommendations.load_interactions(db_session, user_ids=[2])[0].size == 0
+    finally:
+        db_session.close()
+        Base.metadata.drop_all(bind=engine)
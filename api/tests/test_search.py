@@ -0,0 +1,119 @@
+"""Tests for search."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+from api.database import Base
+from api import main  # noqa: F401
+from api.helpers import autocomplete
+from api.helpers.autocomplete import PrefixIndex
+from api.helpers.search_index import InvertedIndex, SearchIndex
+from api.models.artist_model import Artist
+from api.models.media_artist_model import MediaArtist
+from api.models.media_model import Media, MediaTypeEnum
+from api.tests.db import engine, TestingSessionLocal
+
+
+def index_of(*documents):
+    """
+    Inverted index of (id, title, artist, view count) documents.
+    """
+    index = InvertedIndex(view_count_boost=0.1)
+    for doc_id, title, artist, view_count in documents:
+        index.upsert(doc_id, {"title": [title], "artists": [artist]}, view_count,
+                     {"media_id": doc_id})
+    return index
+
+
+def test_search_prefix_typo_and_boost():
+    """
+    Test exact, prefix and misspelled tokens match, ranked with the view count boost.
+    """
+    index = index_of((1, "Bohemian Rhapsody", "Queen", 10),
+                     (2, "Rhapsody in Blue", "Gershwin", 1000),
+                     (3, "Under Pressure", "Queen", 0))
+    assert [stored["media_id"] for _, stored in index.search("queen")] == [1, 3]
+    assert [stored["media_id"] for _, stored in index.search("bohem")] == [1]
+    assert [stored["media_id"] for _, stored in index.search("rapsody")] == [2, 1]
+    assert index.search("queen rhaps")[0][1]["media_id"] == 1
+
+
+def test_search_remove_and_update():
+    """
+    Test replaced and removed documents leave no terms behind.
+    """
+    index = index_of((1, "Bohemian Rhapsody", "Queen", 0))
+    index.upsert(1, {"title": ["Killer Queen"]}, 0, {"media_id": 1})
+    assert index.search("bohemian") == []
+    index.remove(1)
+    assert index.search("queen") == []
+    assert index.snapshot() == {"documents": 0, "terms": 0}
+
+
+def test_load_matches_upserts():
+    """
+    Test a bulk load sorts its terms like one by one upserts, and later
+    upserts keep them sorted.
+    """
+    documents = [(1, "Under Pressure", "Queen", 0), (2, "Bohemian Rhapsody", "Queen", 10),
+                 (1, "Killer Queen", "Queen", 5)]
+    loaded = InvertedIndex(view_count_boost=0.1)
+    loaded.load((doc_id, {"title": [title], "artists": [artist]}, view_count, {"media_id": doc_id})
+                for doc_id, title, artist, view_count in documents)
+    assert loaded.terms == index_of(*documents).terms == ["bohemian", "killer", "queen", "rhapsody"]
+    loaded.upsert(3, {"title": ["Anthem"]}, 0, {"media_id": 3})
+    assert loaded.terms == sorted(loaded.terms) and loaded.search("anth")[0][1]["media_id"] == 3
+
+
+def test_search_index_build_and_refresh():
+    """
+    Test the index is built from the catalog and a changed artist is reindexed.
+    """
+    Base.metadata.create_all(bind=engine)
+    db_session = TestingSessionLocal()
+    db_session.add_all([Artist(artist_id=1, artist_name="Queen"),
+                        Media(media_id=1, media_title="Bohemian Rhapsody", media_type=MediaTypeEnum.AUDIO),
+                        MediaArtist(media_id=1, artist_id=1)])
+    db_session.commit()
+    search_index = SearchIndex(refresh_interval=1, view_count_boost=0.1,
+                               session_factory=TestingSessionLocal)
+    search_index.index = search_index._build()
+    assert search_index.search("queen")[0][1]["artists"] == ["Queen"]
+    db_session.get(Artist, 1).artist_name = "Freddie"
+    db_session.commit()
+    db_session.close()
+    search_index._refresh({"artist:1"})
+    assert search_index.search("queen") == []
+    assert search_index.search("freddie")[0][1]["media_id"] == 1
+    Base.metadata.drop_all(bind=engine)
+
+
+def test_suggest_prefix_top_k():
+    """
+    Test suggestions match word prefixes and rank by popularity.
+    """
+    index = PrefixIndex(top_k=2)
+    index.upsert(("media", 1), "Bohemian Rhapsody", 10)
+    index.upsert(("media", 2), "Rhapsody in Blue", 1000)
+    index.upsert(("artist", 1), "Queen", 500)
+    assert [ref for ref, _, _ in index.suggest("rhap", 2)] == [("media", 2), ("media", 1)]
+    assert [ref for ref, _, _ in index.suggest("Bohemian R", 2)] == [("media", 1)]
+    assert index.suggest("qu", 2) == [(("artist", 1), "Queen", 500)]
+
+
+def test_suggest_cached_prefix_updates(monkeypatch):
+    """
+    Test the cached top entries of a prefix follow upserts and removals.
+    """
+    monkeypatch.setattr(autocomplete, "SCAN_LIMIT", 2)
+    index = PrefixIndex(top_k=2)
+    index.load([(("media", media_id), f"Song {media_id}", media_id) for media_id in range(1, 7)])
+    assert "so" in index.top
+    index.upsert(("media", 1), "Song 1", 100)
+    index.remove(("media", 6))
+    index.upsert(("media", 5), "Song 5", 0)
+    assert [ref for ref, _, _ in index.suggest("so", 2)] == [("media", 1), ("media", 4)]
+    index.upsert(("media", 7), "Song 7", 50)
+    assert [ref for ref, _, _ in index.suggest("song", 2)] == [("media", 1), ("media", 7)]
@@ -0,0 +1,59 @@
+"""Tests for the HLS segment cache."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import asyncio
+from api.helpers.range_response import is_not_modified
+from api.helpers.segment_cache import SegmentCache
+from api.helpers.storage import LocalStorageBackend
+
+
+class CountingStorage(LocalStorageBackend):
+    """
+    Local storage counting object reads.
+    """
+
+    def __init__(self, root: str):
+        super().__init__(root)
+        self.reads = 0
+
+    def iter_range(self, key, start, end, chunk_size=256 * 1024):
+        self.reads += 1
+        return super().iter_range(key, start, end, chunk_size)
+
+
+def test_segment_cache_coalesces_and_spills(tmp_path):
+    """
+    Test one storage read per herd of misses and reads back from the disk tier.
+    """
+    storage_backend = CountingStorage(str(tmp_path / "media"))
+    for index in range(3):
+        storage_backend.put_bytes(f"track/hls/64k/segment_{index:05d}.ts", bytes([index]) * 100)
+    segments = SegmentCache(max_bytes=250, max_object_bytes=100, revalidate_after=60.0,
+                            disk_dir=str(tmp_path / "spill"), disk_max_bytes=1000)
+
+    async def scenario():
+        results = await asyncio.gather(*[segments.fetch(storage_backend, "track/hls/64k/segment_00000.ts")
+                                         for _ in range(10)])
+        assert storage_backend.reads == 1
+        assert all(data == b"\x00" * 100 for _, data in results)
+        await segments.fetch(storage_backend, "track/hls/64k/segment_00001.ts")
+        await segments.fetch(storage_backend, "track/hls/64k/segment_00002.ts")
+        # The first segment was evicted to disk and is read back from there.
+        stored, data = await segments.fetch(storage_backend, "track/hls/64k/segment_00000.ts")
+        assert data == b"\x00" * 100
+        assert storage_backend.reads == 3
+        return stored
+
+    stored = asyncio.run(scenario())
+    snapshot = segments.snapshot()
+    assert snapshot["misses"] == 3
+    assert snapshot["coalesced"] == 9
+    assert snapshot["disk_hits"] == 1
+    assert snapshot["memory_bytes"] <= 250
+    assert is_not_modified(f"W/{stored.etag}", None, stored)
+    assert is_not_modified(None, stored.last_modified, stored)
+    assert not is_not_modified('"other"', stored.last_modified, stored)
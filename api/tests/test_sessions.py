@@ -0,0 +1,65 @@
+"""Tests for listening party sessions."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import asyncio
+import json
+from fastapi.testclient import TestClient
+from api import main
+from api.helpers.listening_party import PartyHub
+
+
+class FakeWebSocket:
+    """
+    Connection recording the JSON messages sent to it.
+    """
+    def __init__(self):
+        self.sent = []
+
+    async def send_text(self, message: str):
+        self.sent.append(json.loads(message))
+
+
+def test_party_updates_are_coalesced():
+    """
+    Test followers get the latest host position once per broadcast, and
+    the session is dropped when everyone has left.
+    """
+    async def scenario():
+        party = PartyHub(broadcast_interval=1, send_timeout=1)
+        host, follower = FakeWebSocket(), FakeWebSocket()
+        session = await party.join("s1", host, host=True)
+        await party.join("s1", follower, host=False)
+        for position in (1.0, 2.0, 3.0):
+            party.update(session, media_id=7, position=position, playing=False)
+        await party.broadcast()
+        await party.broadcast()
+        assert [(state["position"], state["seq"]) for state in follower.sent] == [(0.0, 0), (3.0, 3)]
+        party.leave(session, host)
+        party.leave(session, follower)
+        assert party.sessions == {}
+        # Leaving the dropped session again keeps its replacement.
+        replacement = await party.join("s1", FakeWebSocket(), host=True)
+        party.leave(session, follower)
+        assert party.sessions == {"s1": replacement}
+
+    asyncio.run(scenario())
+
+
+def test_party_websocket_time_sync():
+    """
+    Test the session WebSocket answers time sync, refuses invalid positions
+    and sends followers the session state.
+    """
+    client = TestClient(main.app)
+    with client.websocket_connect("/ws/sessions/s2?host=true") as websocket:
+        websocket.send_json({"type": "time_sync", "client_time": 1.5})
+        reply = websocket.receive_json()
+        assert reply["type"] == "time_sync" and reply["client_time"] == 1.5
+        websocket.send_json({"type": "position", "media_id": 1, "position": -1, "playing": True})
+        assert websocket.receive_json() == {"type": "error", "detail": "Invalid position"}
+        with client.websocket_connect("/ws/sessions/s2") as follower:
+            assert follower.receive_json()["host_connected"] is True
@@ -0,0 +1,60 @@
+"""Tests for stream."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import asyncio
+from api.helpers.event_hub import EventHub
+
+
+async def published(hub: EventHub, count: int):
+    """
+    Publish events on the media:1 topic and let the hub deliver them.
+    """
+    for index in range(count):
+        hub.publish("now_playing", {"media_id": 1, "index": index}, topics=["media:1"])
+    await asyncio.sleep(0.01)
+
+
+def test_event_hub_fan_out_and_eviction():
+    """
+    Test events reach the subscribers of their topic and a subscriber
+    whose queue is full is evicted.
+    """
+    async def scenario():
+        hub = EventHub(queue_size=2, replay_size=10)
+        await hub.start()
+        fast = hub.subscribe(["media:1"])
+        slow = hub.subscribe(["media:1"])
+        other = hub.subscribe(["media:2"])
+        await published(hub, 2)
+        assert [(await fast.queue.get())["data"]["index"] for _ in range(2)] == [0, 1]
+        await published(hub, 1)
+        assert await slow.queue.get() is None
+        assert (await fast.queue.get())["event"] == "now_playing"
+        assert other.queue.empty()
+        assert hub.snapshot()["evicted"] == 1
+        await hub.stop()
+
+    asyncio.run(scenario())
+
+
+def test_event_hub_replay_after_last_event_id():
+    """
+    Test a resumed subscriber gets the events after its last event ID, and
+    an unknown ID replays everything kept.
+    """
+    async def scenario():
+        hub = EventHub(queue_size=2, replay_size=3)
+        await hub.start()
+        await published(hub, 4)
+        replay = list(hub._replay)
+        resumed = hub.subscribe(["media:1"], last_event_id=replay[0]["id"])
+        assert [(await resumed.queue.get())["data"]["index"] for _ in range(2)] == [2, 3]
+        expired = hub.subscribe(["media:1"], last_event_id="unknown")
+        assert expired.queue.qsize() == 3
+        await hub.stop()
+
+    asyncio.run(scenario())
@@ -0,0 +1,71 @@
+"""Tests for the similar media index."""
+#--------------------------------------------#
+# PEP-8 Imports Priority.
+# 1.Standard Library Imports
+# 2.Related Library Imports
+# 3.Local application/library imports
+#--------------------------------------------#
+import numpy as np
+from api.database import Base
+from api import main  # noqa: F401
+from api.helpers import embeddings
+from api.helpers.vector_index import IVFIndex, VectorIndexService, recall_at_k, sample_queries
+from api.models.genre_model import Genre
+from api.models.media_genre_model import MediaGenre
+from api.models.media_model import Media, MediaTypeEnum
+from api.tests.db import engine, TestingSessionLocal
+
+
+def clustered_index(count: int = 2000, dim: int = 16) -> IVFIndex:
+    """
+    IVF index of vectors gathered around random centers.
+    """
+    rng = np.random.default_rng(1)
+    centers = rng.normal(size=(20, dim))
+    vectors = centers[rng.integers(20, size=count)] + 0.3 * rng.normal(size=(count, dim))
+    return IVFIndex.build(np.arange(100, 100 + count), vectors)
+
+
+def test_ivf_recall_and_reload(tmp_path):
+    """
+    Test recall@k growing with nprobe, exact at full probe, and versioned reloads.
+    """
+    index = clustered_index()
+    queries = sample_queries(index, 50)
+    low, _ = recall_at_k(index, queries, 10, nprobe=1)
+    high, _ = recall_at_k(index, queries, 10, nprobe=8)
+    full, _ = recall_at_k(index, queries, 10, nprobe=len(index.centroids))
+    assert low <= high and high >= 0.9 and full == 1.0
+    assert 100 not in [media_id for media_id, _ in index.search(index.vector_of(100), 5, 4, exclude=100)]
+
+    service = VectorIndexService(str(tmp_path), nprobe=8)
+    assert service.similar(100, 5) is None
+    index.save(str(tmp_path))
+    assert len(service.similar(100, 5)) == 5
+    assert isinstance(service.current().vectors, np.memmap)
+    clustered_index(count=500).save(str(tmp_path))
+    assert service.similar(700, 5) is None  # Reloaded the smaller version.
+    assert service.snapshot()["reloads"] == 2
+
+
+def test_embeddings_group_shared_genres():
+    """
+    Test media sharing a genre embedding closer than media that do not.
+    """
+    Base.metadata.create_all(bind=engine)
+    db_session = TestingSessionLocal()
+    try:
+        db_session.add_all([Genre(genre_name=name) for name in ("Jazz", "Metal", "Folk")])
+        db_session.add_all([Media(media_title=f"Track {index}", media_type=MediaTypeEnum.AUDIO)
+                            for index in range(6)])
+        db_session.flush()
+        db_session.add_all([MediaGenre(media_id=media_id, genre_id=(media_id - 1) // 2 + 1)
+                            for media_id in range(1, 7)])
+        db_session.commit()
+        features, media_ids = embeddings.media_features(db_session)
+    finally:
+        db_session.close()
+        Base.metadata.drop_all(bind=engine)
+    index = IVFIndex.build(media_ids, embeddings.embed(features, dim=4), nlist=1)
+    assert index.search(index.vector_of(1), 1, 1, exclude=1)[0][0] == 2
+    assert index.search(index.vector_of(5), 1, 1, exclude=5)[0][0] == 6
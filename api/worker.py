@@ -5,10 +5,24 @@
 # 2.Related Library Imports
 # 3.Local application/library imports
 #--------------------------------------------#
+import json
+import os
+import tempfile
 import time
 from functools import lru_cache
-from celery import Celery
+from typing import List
+import numpy as np
+from celery import Celery, chord, group
+from celery.exceptions import Ignore
+from loguru import logger
 from . import config
+from api import database
+from api.helpers import (catalog_import, charts, embeddings, feed, images, packaging, playlist_order,
+                         rating_stats, recommendations, response_cache, storage, vector_index)
+from api.models.media_model import Media, MediaTypeEnum
+from api.models.playlist_model import Playlist
+# Relationship targets of the models above, imported so the mappers can configure.
+from api.models import comment_model, favorite_model, rating_model, role_model, user_model  # noqa: F401
 
 
 @lru_cache()
@@ -23,6 +37,32 @@ conf_settings = get_settings()
 celery = Celery(__name__)
 celery.conf.broker_url = conf_settings.CELERY_CONF_BROKER_URL
 celery.conf.result_backend = conf_settings.CELERY_CONF_RESULT_BACKEND
+celery.conf.beat_schedule = {
+    "schedule_image_variants": {
+        "task": "schedule_image_variants",
+        "schedule": conf_settings.IMAGE_VARIANTS_SCHEDULE_INTERVAL,
+    },
+    "build_recommendations": {
+        "task": "build_recommendations",
+        "schedule": conf_settings.RECOMMENDATIONS_REBUILD_INTERVAL,
+    },
+    "refresh_recommendations": {
+        "task": "refresh_recommendations",
+        "schedule": conf_settings.RECOMMENDATIONS_REFRESH_INTERVAL,
+    },
+    "build_vector_index": {
+        "task": "build_vector_index",
+        "schedule": conf_settings.VECTOR_INDEX_REBUILD_INTERVAL,
+    },
+    "materialize_charts": {
+        "task": "materialize_charts",
+        "schedule": conf_settings.CHARTS_MATERIALIZE_INTERVAL,
+    },
+    "reconcile_rating_stats": {
+        "task": "reconcile_rating_stats",
+        "schedule": conf_settings.RATING_STATS_RECONCILE_INTERVAL,
+    },
+}
 
 
 @celery.task(name="run_task")
@@ -33,3 +73,408 @@ def run_task(task_time :int):
     """
     time.sleep(task_time)
     return True
+
+
+def _package_progress(job_id: str, media_id: int, total: int, done: int, segmenter: str):
+    # Stored under the packaging task id, so its status reads as progress.
+    celery.backend.store_result(job_id, {"media_id": media_id, "done": done, "total": total,
+                                         "segmenter": segmenter}, "PROGRESS")
+
+
+@celery.task(bind=True, name="package_media")
+def package_media(self, media_id: int):
+    """
+    Package a media file as multi-rendition HLS. The file is cut into
+    segments, and a chord encodes every segment of every rendition in
+    parallel before the playlists are written. Progress and the final
+    result are reported under this task's id.
+    :param media_id: The Media ID.
+    """
+    db_session = database.SessionLocal()
+    try:
+        media = db_session.query(Media).filter(Media.media_id == media_id,
+                                               Media.deleted_at.is_(None)).first()
+        if media is None or not media.s3_media_path:
+            raise ValueError(f"Media {media_id} has no file to package")
+        media_path, media_type = media.s3_media_path, media.media_type
+        duration = packaging.duration_seconds(media.duration)
+    finally:
+        db_session.close()
+    source = storage.get_storage().local_path(media_path)
+    segmenter = packaging.get_segmenter()
+    segments = segmenter.plan(source, duration)
+    renditions = packaging.RENDITIONS[media_type]
+    total = len(segments) * len(renditions)
+    _package_progress(self.request.id, media_id, total, 0, segmenter.name)
+    encodes = [encode_segment.s(self.request.id, media_id, media_path, media_type.value, segmenter.name,
+                                rendition.name, list(segment), total)
+               for rendition in renditions for segment in segments]
+    callback = finalize_package.s(self.request.id, media_id, media_path, media_type.value,
+                                  [list(segment) for segment in segments])
+    chord(encodes)(callback.on_error(package_failed.s(self.request.id)))
+    # The chord callback stores the result; do not overwrite the progress.
+    raise Ignore()
+
+
+@celery.task(name="encode_segment")
+def encode_segment(job_id: str, media_id: int, media_path: str, media_type: str, segmenter_name: str,
+                   rendition_name: str, segment: List, total: int):
+    """
+    Encode one segment of one rendition and store it.
+    :param job_id: The packaging task id.
+    :param media_id: The Media ID.
+    :param media_path: The `Media.s3_media_path` of the source.
+    :param media_type: The media type value.
+    :param segmenter_name: The segmenter chosen by the packaging task.
+    :param rendition_name: The rendition name.
+    :param segment: The segment fields.
+    :param total: The number of segments of the job.
+    """
+    storage_backend = storage.get_storage()
+    segment = packaging.Segment(*segment)
+    rendition = packaging.get_rendition(MediaTypeEnum(media_type), rendition_name)
+    key = f"{packaging.output_prefix(media_path)}/{rendition.name}/{packaging.segment_name(segment.index)}"
+    with tempfile.TemporaryDirectory() as directory:
+        output_path = os.path.join(directory, packaging.segment_name(segment.index))
+        packaging.get_segmenter(segmenter_name).encode(storage_backend.local_path(media_path), segment,
+                                                       rendition, output_path)
+        storage_backend.put_file(key, output_path)
+    counter = f"package:{job_id}:done"
+    redis_client = database.get_redis()
+    done = redis_client.incr(counter)
+    redis_client.expire(counter, 86400)
+    _package_progress(job_id, media_id, total, done, segmenter_name)
+    return key
+
+
+@celery.task(name="finalize_package")
+def finalize_package(segment_keys: List[str], job_id: str, media_id: int, media_path: str,
+                     media_type: str, segments: List[List]):
+    """
+    Write the rendition and master playlists once every segment is stored.
+    :param segment_keys: The stored segment keys, from the chord.
+    :param job_id: The packaging task id.
+    :param media_id: The Media ID.
+    :param media_path: The `Media.s3_media_path` of the source.
+    :param media_type: The media type value.
+    :param segments: The segments fields.
+    """
+    storage_backend = storage.get_storage()
+    prefix = packaging.output_prefix(media_path)
+    segments = [packaging.Segment(*segment) for segment in segments]
+    renditions = packaging.RENDITIONS[MediaTypeEnum(media_type)]
+    playlist = packaging.media_playlist(segments).encode()
+    for rendition in renditions:
+        storage_backend.put_bytes(f"{prefix}/{rendition.name}/index.m3u8", playlist)
+    master_key = f"{prefix}/master.m3u8"
+    storage_backend.put_bytes(master_key, packaging.master_playlist(renditions).encode())
+    database.get_redis().delete(f"package:{job_id}:done")
+    result = {"media_id": media_id, "master_playlist": master_key,
+              "renditions": [rendition.name for rendition in renditions],
+              "segments": len(segment_keys)}
+    celery.backend.store_result(job_id, result, "SUCCESS")
+    return result
+
+
+@celery.task(name="package_failed")
+def package_failed(request, exc, traceback, job_id: str):
+    """
+    Mark a packaging job failed when one of its tasks fails.
+    :param request: The failed task request.
+    :param exc: The exception raised.
+    :param traceback: The traceback.
+    :param job_id: The packaging task id.
+    """
+    celery.backend.mark_as_failure(job_id, exc)
+
+
+def _derive_image(storage_backend: storage.StorageBackend, source_key: str) -> str:
+    stored = storage_backend.stat(source_key)
+    manifest_key = images.manifest_key(source_key)
+    try:
+        manifest = json.loads(images.read_object(storage_backend, manifest_key))
+        if manifest["size"] == stored.size and manifest["mtime"] == stored.mtime:
+            return "skipped"
+    except FileNotFoundError:
+        pass
+    data = images.read_object(storage_backend, source_key)
+    digest = images.content_digest(data)
+    names = [images.variant_name(size, extension)
+             for size in images.IMAGE_SIZES for extension in images.IMAGE_FORMATS]
+    try:
+        for name in names:
+            storage_backend.stat(images.variant_key(digest, name))
+        outcome = "deduplicated"
+    except FileNotFoundError:
+        for name, variant in images.render_variants(data).items():
+            storage_backend.put_bytes(images.variant_key(digest, name), variant)
+        outcome = "generated"
+    # Written last: readers only see digests whose variants are all stored.
+    storage_backend.put_bytes(manifest_key, json.dumps({"source": source_key, "size": stored.size,
+                                                        "mtime": stored.mtime, "digest": digest}).encode())
+    return outcome
+
+
+@celery.task(name="generate_image_variants")
+def generate_image_variants(source_keys: List[str]):
+    """
+    Generate the resized WebP and JPEG variants of a batch of uploaded images.
+    Images unchanged since their last run are skipped, and uploads whose
+    content was already processed under another key reuse its variants.
+    :param source_keys: The storage keys of the source images.
+    """
+    storage_backend = storage.get_storage()
+    counts = {"generated": 0, "deduplicated": 0, "skipped": 0, "failed": 0}
+    for source_key in source_keys:
+        try:
+            counts[_derive_image(storage_backend, source_key)] += 1
+        except Exception:  # One bad upload must not fail the batch.
+            logger.exception(f"Failed to generate image variants of {source_key}")
+            counts["failed"] += 1
+    return counts
+
+
+@celery.task(name="schedule_image_variants")
+def schedule_image_variants():
+    """
+    Queue variant generation of every image referenced by media, albums,
+    artists and users, in batches of `IMAGE_VARIANTS_BATCH_SIZE`.
+    """
+    db_session = database.SessionLocal()
+    try:
+        source_keys = set()
+        for source in images.IMAGE_SOURCES.values():
+            path_column = getattr(source.model, source.path_column)
+            rows = db_session.query(path_column).filter(path_column.isnot(None),
+                                                        source.model.deleted_at.is_(None)).distinct()
+            source_keys.update(path for path, in rows.yield_per(1000) if path)
+    finally:
+        db_session.close()
+    source_keys = sorted(source_keys)
+    batch_size = conf_settings.IMAGE_VARIANTS_BATCH_SIZE
+    batches = [source_keys[start:start + batch_size] for start in range(0, len(source_keys), batch_size)]
+    if batches:
+        group(generate_image_variants.s(batch) for batch in batches).apply_async()
+    return {"sources": len(source_keys), "batches": len(batches)}
+
+
+def _pairs(ids, columns, scores) -> List[List]:
+    return [[int(ids[column]), round(float(score), 6)] for column, score in zip(columns, scores)]
+
+
+@celery.task(name="build_recommendations")
+def build_recommendations():
+    """
+    Rebuild the item-item neighbours and every user's recommendations from
+    plays, favorites and ratings.
+    """
+    started = time.monotonic()
+    db_session = database.SessionLocal()
+    try:
+        # Taken first, so interactions written while building are refreshed later.
+        watermark = recommendations.current_watermark(db_session)
+        users, items, strengths = recommendations.load_interactions(db_session)
+    finally:
+        db_session.close()
+    matrix, user_ids, item_ids = recommendations.interaction_matrix(users, items, strengths)
+    neighbours = recommendations.item_neighbours(matrix, conf_settings.RECOMMENDATIONS_NEIGHBOURS)
+    redis_client = database.get_redis()
+    store = recommendations.RecommendationStore(redis_client)
+    store.save_neighbours({
+        int(item_ids[row]): _pairs(item_ids, neighbours.indices[neighbours.indptr[row]:neighbours.indptr[row + 1]],
+                                   neighbours.data[neighbours.indptr[row]:neighbours.indptr[row + 1]])
+        for row in range(neighbours.shape[0])
+    })
+    top_k = conf_settings.RECOMMENDATIONS_TOP_K
+    store.save_users({int(user_ids[row]): _pairs(item_ids, columns, scores) for row, (columns, scores)
+                      in enumerate(recommendations.recommend(matrix, neighbours, top_k))})
+    popularity = np.asarray(matrix.sum(axis=0)).ravel()
+    popular = np.argsort(-popularity, kind="stable")[:top_k]
+    store.save_popular(_pairs(item_ids, popular, popularity[popular]))
+    redis_client.hset(recommendations.WATERMARK_KEY, mapping=watermark)
+    return {"users": len(user_ids), "items": len(item_ids), "interactions": int(matrix.nnz),
+            "seconds": round(time.monotonic() - started, 3)}
+
+
+@celery.task(name="refresh_recommendations")
+def refresh_recommendations():
+    """
+    Recompute the recommendations of the users who played, favorited or
+    rated media since the last build or refresh, from the stored item
+    neighbours. Media added since the last build get neighbours with the next one.
+    """
+    redis_client = database.get_redis()
+    watermark = {key.decode(): value.decode()
+                 for key, value in redis_client.hgetall(recommendations.WATERMARK_KEY).items()}
+    if not watermark:
+        return {"users": 0}  # Nothing built yet.
+    store = recommendations.RecommendationStore(redis_client)
+    top_k = conf_settings.RECOMMENDATIONS_TOP_K
+    refreshed = {}
+    db_session = database.SessionLocal()
+    try:
+        next_watermark = recommendations.current_watermark(db_session)
+        user_ids = sorted(recommendations.changed_users(db_session, watermark))
+        batch_size = conf_settings.RECOMMENDATIONS_REFRESH_BATCH_SIZE
+        for start in range(0, len(user_ids), batch_size):
+            users, items, strengths = recommendations.load_interactions(db_session,
+                                                                        user_ids[start:start + batch_size])
+            neighbours = store.load_neighbours(int(media_id) for media_id in np.unique(items))
+            user_strengths = {}
+            for user_id, media_id, strength in zip(users.tolist(), items.tolist(), strengths.tolist()):
+                user_strengths.setdefault(user_id, {})
+                user_strengths[user_id][media_id] = user_strengths[user_id].get(media_id, 0.0) + strength
+            for user_id, strengths_by_media in user_strengths.items():
+                refreshed[user_id] = recommendations.recommend_one(strengths_by_media, neighbours, top_k)
+    finally:
+        db_session.close()
+    store.save_users(refreshed)
+    redis_client.hset(recommendations.WATERMARK_KEY, mapping=next_watermark)
+    return {"users": len(refreshed)}
+
+
+@celery.task(name="build_vector_index")
+def build_vector_index():
+    """
+    Embed every media from its listeners, genres and artists, index the
+    embeddings for similar media search and publish the index. The
+    recall@10 of the configured `nprobe` is measured and stored with it.
+    """
+    started = time.monotonic()
+    db_session = database.SessionLocal()
+    try:
+        features, media_ids = embeddings.media_features(db_session)
+    finally:
+        db_session.close()
+    with_features = np.diff(features.indptr) > 0
+    vectors = embeddings.embed(features[with_features], conf_settings.VECTOR_INDEX_DIM)
+    if not len(vectors):
+        return {"count": 0}
+    index = vector_index.IVFIndex.build(media_ids[with_features], vectors, nlist=conf_settings.VECTOR_INDEX_NLIST or None)
+    recall, latency = vector_index.recall_at_k(index, vector_index.sample_queries(index, 100), 10,
+                                               conf_settings.VECTOR_INDEX_NPROBE)
+    index.meta.update({"recall_at_10": round(recall, 4), "latency_ms": round(latency, 3)})
+    os.makedirs(conf_settings.VECTOR_INDEX_DIR, exist_ok=True)
+    index.save(conf_settings.VECTOR_INDEX_DIR)
+    return {**index.meta, "seconds": round(time.monotonic() - started, 3)}
+
+
+@celery.task(name="materialize_charts")
+def materialize_charts():
+    """
+    Rank media, genres and artists over the hourly, daily and weekly
+    windows from the bucketed play counters, and store every chart.
+    """
+    db_session = database.SessionLocal()
+    try:
+        # Charts outlive a few missed runs, then charts nobody played expire.
+        return charts.materialize(database.get_redis(), db_session, time.time(), conf_settings.CHARTS_SIZE,
+                                  ttl=int(conf_settings.CHARTS_MATERIALIZE_INTERVAL * 6))
+    finally:
+        db_session.close()
+
+
+@celery.task(name="reconcile_rating_stats")
+def reconcile_rating_stats():
+    """
+    Check the rating aggregates of every media against its ratings and
+    fix any that drifted.
+    """
+    db_session = database.SessionLocal()
+    try:
+        return rating_stats.reconcile(db_session, conf_settings.RATING_STATS_RECONCILE_BATCH_SIZE)
+    finally:
+        db_session.close()
+
+
+@celery.task(name="renumber_playlist")
+def renumber_playlist(playlist_id: int):
+    """
+    Space the entries of a playlist evenly again once inserts at one spot
+    used up the gap there.
+    :param playlist_id: The Playlist ID.
+    """
+    db_session = database.SessionLocal()
+    try:
+        playlist = db_session.query(Playlist).filter(Playlist.playlist_id == playlist_id).with_for_update().first()
+        if playlist is None:
+            return 0
+        count = playlist_order.renumber(db_session, playlist_id)
+        db_session.commit()
+        return count
+    finally:
+        db_session.close()
+
+
+@celery.task(bind=True, name="import_catalog")
+def import_catalog(self, key: str, import_format: str):
+    """
+    Import media with their artists, albums and genres from an uploaded
+    CSV or JSON Lines file, streamed from storage in batches. Progress,
+    including rows per second, is reported under this task's id.
+    :param key: The storage key of the uploaded file.
+    :param import_format: `csv` or `ndjson`.
+    """
+    storage_backend = storage.get_storage()
+    size = storage_backend.stat(key).size
+    db_session = database.SessionLocal()
+
+    def committed(written: catalog_import.WrittenBatch):
+        # Core writes bypass the session hooks, so cached responses, the search
+        # indexes of the API workers and the home feeds are told here.
+        response_cache.get_response_cache().invalidate(written.tags)
+        for media_id in written.released:
+            fan_out_media.delay(media_id)
+
+    try:
+        return catalog_import.run_import(
+            db_session, storage_backend.iter_range(key, 0, size - 1), import_format, size,
+            conf_settings.IMPORT_BATCH_SIZE, report=lambda progress: self.update_state(state="PROGRESS",
+                                                                                        meta=progress),
+            on_commit=committed)
+    finally:
+        db_session.close()
+
+
+@celery.task(name="fan_out_media")
+def fan_out_media(media_id: int):
+    """
+    Deliver a new media to the home feeds of its artists' followers.
+    :param media_id: The Media ID.
+    """
+    db_session = database.SessionLocal()
+    try:
+        return feed.fan_out(db_session, database.get_redis(), media_id, conf_settings.FEED_FANOUT_MAX_FOLLOWERS,
+                            conf_settings.FEED_FANOUT_BATCH_SIZE, conf_settings.FEED_MAX_ITEMS,
+                            conf_settings.FEED_TTL)
+    finally:
+        db_session.close()
+
+
+@celery.task(name="backfill_feed")
+def backfill_feed(user_id: int, artist_id: int):
+    """
+    Add the recent releases of a newly followed artist to the user's feed.
+    :param user_id: The follower's User ID.
+    :param artist_id: The Artist ID.
+    """
+    db_session = database.SessionLocal()
+    try:
+        return feed.backfill(db_session, database.get_redis(), user_id, artist_id, conf_settings.FEED_MAX_ITEMS,
+                             conf_settings.FEED_TTL)
+    finally:
+        db_session.close()
+
+
+@celery.task(name="prune_feed")
+def prune_feed(user_id: int, artist_id: int):
+    """
+    Remove the releases of an unfollowed artist from the user's feed.
+    :param user_id: The former follower's User ID.
+    :param artist_id: The Artist ID.
+    """
+    db_session = database.SessionLocal()
+    try:
+        return feed.prune(db_session, database.get_redis(), user_id, artist_id, conf_settings.FEED_MAX_ITEMS)
+    finally:
+        db_session.close()